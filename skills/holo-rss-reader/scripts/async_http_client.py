@@ -0,0 +1,363 @@
+"""
+Asyncio HTTP client used by the async fetch engine.
+
+Mirrors `http_client.fetch_text` (timeouts, retries, redirects, size limits,
+body decoding) on top of asyncio streams, so thousands of requests can be in
+flight on a single thread. Connections are not pooled and proxies are not
+supported; callers fall back to the threaded engine when a proxy is set.
+"""
+import asyncio
+import contextlib
+import ssl
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+from urllib.request import getproxies
+
+import idna
+from requests.utils import get_encoding_from_headers, requote_uri
+
+import http_client
+
+
+MAX_REDIRECTS = 30
+MAX_HEADER_BYTES = 64 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+BACKOFF_FACTOR = 0.3
+BACKOFF_MAX = 120
+RETRY_STATUSES = {500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_HTTP_WHITESPACE = " \t\r\n"
+
+_NETWORK_ERRORS = (
+    OSError,
+    EOFError,
+    ValueError,
+    asyncio.TimeoutError,
+    asyncio.IncompleteReadError,
+    zlib.error,
+)
+
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+@dataclass
+class _RawResponse:
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+
+class _ResponseTooLarge(Exception):
+    def __init__(self, status_code: int, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.headers = headers
+        super().__init__("response too large")
+
+
+def proxy_configured() -> bool:
+    """Return True when HTTP(S) proxies are configured through the environment."""
+    return any(scheme != "no" for scheme in getproxies())
+
+
+def _get_ssl_context() -> ssl.SSLContext:
+    global _ssl_context
+    if _ssl_context is None:
+        try:
+            import certifi
+
+            cafile = certifi.where()
+        except ImportError:
+            cafile = None
+        _ssl_context = ssl.create_default_context(cafile=cafile)
+    return _ssl_context
+
+
+async def _read_line(reader: asyncio.StreamReader, read_timeout: int) -> bytes:
+    return await asyncio.wait_for(reader.readline(), read_timeout)
+
+
+async def _read_head(reader: asyncio.StreamReader, read_timeout: int) -> Tuple[int, Dict[str, str]]:
+    while True:
+        status_line = await _read_line(reader, read_timeout)
+        parts = status_line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise ConnectionError(f"Malformed status line: {status_line[:80]!r}")
+        status_code = int(parts[1])
+
+        headers: Dict[str, str] = {}
+        total = 0
+        while True:
+            line = await _read_line(reader, read_timeout)
+            total += len(line)
+            if total > MAX_HEADER_BYTES:
+                raise ConnectionError("Response headers too large")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _sep, value = line.decode("latin-1").partition(":")
+            # Strip HTTP whitespace only: str.strip() would also eat bytes
+            # such as 0x85 that belong to raw UTF-8 values.
+            key = name.strip(_HTTP_WHITESPACE).lower()
+            value = value.strip(_HTTP_WHITESPACE)
+            headers[key] = f"{headers[key]}, {value}" if key in headers else value
+
+        # Skip interim 1xx responses (e.g. 100 Continue).
+        if not 100 <= status_code < 200:
+            return status_code, headers
+
+
+async def _read_body(
+    reader: asyncio.StreamReader,
+    status_code: int,
+    headers: Dict[str, str],
+    read_timeout: int,
+    max_bytes: int,
+) -> bytes:
+    chunks = []
+    total = 0
+
+    def _append(chunk: bytes):
+        nonlocal total
+        total += len(chunk)
+        if total > max_bytes:
+            raise _ResponseTooLarge(status_code, headers)
+        chunks.append(chunk)
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await _read_line(reader, read_timeout)
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Drain optional trailers.
+                while (await _read_line(reader, read_timeout)) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            if total + size > max_bytes:
+                raise _ResponseTooLarge(status_code, headers)
+            _append(await asyncio.wait_for(reader.readexactly(size), read_timeout))
+            await asyncio.wait_for(reader.readexactly(2), read_timeout)
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        if remaining > max_bytes:
+            raise _ResponseTooLarge(status_code, headers)
+        while remaining > 0:
+            chunk = await asyncio.wait_for(reader.read(min(READ_CHUNK_SIZE, remaining)), read_timeout)
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"".join(chunks), remaining)
+            remaining -= len(chunk)
+            _append(chunk)
+    else:
+        while True:
+            chunk = await asyncio.wait_for(reader.read(READ_CHUNK_SIZE), read_timeout)
+            if not chunk:
+                break
+            _append(chunk)
+
+    return b"".join(chunks)
+
+
+def _decode_content(body: bytes, status_code: int, headers: Dict[str, str], max_bytes: int) -> bytes:
+    encoding = headers.get("content-encoding", "").strip().lower()
+    if not body or encoding in ("", "identity"):
+        return body
+
+    if encoding in ("gzip", "x-gzip"):
+        candidates = [16 + zlib.MAX_WBITS]
+    elif encoding == "deflate":
+        # Servers disagree on zlib-wrapped vs raw deflate streams.
+        candidates = [zlib.MAX_WBITS, -zlib.MAX_WBITS]
+    else:
+        return body
+
+    for index, wbits in enumerate(candidates):
+        try:
+            data = zlib.decompressobj(wbits).decompress(body, max_bytes + 1)
+        except zlib.error:
+            if index == len(candidates) - 1:
+                raise
+            continue
+        if len(data) > max_bytes:
+            raise _ResponseTooLarge(status_code, headers)
+        return data
+    return body
+
+
+def _ascii_host(host: str) -> str:
+    # IDN hosts go on the wire as punycode, encoded the way requests does.
+    if host.isascii():
+        return host
+    try:
+        return idna.encode(host, uts46=True).decode("ascii")
+    except idna.IDNAError as exc:
+        raise ValueError(f"Invalid host: {host!r}") from exc
+
+
+def _request_target(parts) -> str:
+    # Percent-encode non-ASCII paths and queries; existing escapes are kept.
+    target = parts.path or "/"
+    if parts.query:
+        target += f"?{parts.query}"
+    return requote_uri(target)
+
+
+def _redirect_location(headers: Dict[str, str]) -> str:
+    # Headers are read as latin-1; servers that send raw UTF-8 locations are
+    # decoded again the way requests does.
+    location = headers["location"]
+    try:
+        return location.encode("latin-1").decode("utf-8")
+    except UnicodeError:
+        return location
+
+
+def _should_skip_body(status_code: int, headers: Dict[str, str]) -> bool:
+    if status_code in (204, 304) or status_code >= 400:
+        return True
+    return status_code in REDIRECT_STATUSES and "location" in headers
+
+
+async def _request_once(
+    url: str,
+    headers: Dict[str, str],
+    timeout: Tuple[int, int],
+    max_bytes: int,
+) -> _RawResponse:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url}")
+    host = _ascii_host(parts.hostname)
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = _request_target(parts)
+    host_header = f"[{host}]" if ":" in host else host
+    if parts.port:
+        host_header += f":{parts.port}"
+
+    connect_timeout, read_timeout = timeout
+    ssl_context = _get_ssl_context() if scheme == "https" else None
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=ssl_context, server_hostname=host if ssl_context else None),
+        connect_timeout,
+    )
+    try:
+        lines = [f"GET {target} HTTP/1.1", f"Host: {host_header}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append("Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await asyncio.wait_for(writer.drain(), read_timeout)
+
+        status_code, response_headers = await _read_head(reader, read_timeout)
+        if _should_skip_body(status_code, response_headers):
+            return _RawResponse(status_code=status_code, headers=response_headers)
+
+        body = await _read_body(reader, status_code, response_headers, read_timeout, max_bytes)
+        body = _decode_content(body, status_code, response_headers, max_bytes)
+        return _RawResponse(status_code=status_code, headers=response_headers, body=body)
+    finally:
+        writer.close()
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(writer.wait_closed(), 1)
+
+
+def _to_result(response: _RawResponse) -> http_client.HTTPResult:
+    if response.status_code == 304:
+        return http_client.HTTPResult(ok=True, status_code=304, headers=response.headers)
+
+    if response.status_code >= 400:
+        return http_client.HTTPResult(
+            ok=False,
+            status_code=response.status_code,
+            headers=response.headers,
+            error=f"HTTP {response.status_code}",
+            error_kind="network",
+        )
+
+    return http_client.HTTPResult(
+        ok=True,
+        status_code=response.status_code,
+        text=http_client.decode_body(response.body, get_encoding_from_headers(response.headers)),
+        headers=response.headers,
+    )
+
+
+async def _sleep_backoff(attempt: int):
+    # Same schedule as urllib3's Retry: the first retry is immediate.
+    if attempt <= 1:
+        return
+    await asyncio.sleep(min(BACKOFF_MAX, BACKOFF_FACTOR * (2 ** (attempt - 1))))
+
+
+def _describe(exc: BaseException) -> str:
+    if isinstance(exc, asyncio.TimeoutError):
+        return "timed out"
+    return str(exc) or exc.__class__.__name__
+
+
+async def fetch_text(
+    url: str,
+    *,
+    timeout: Tuple[int, int] = (5, 20),
+    max_bytes: int = 2 * 1024 * 1024,
+    headers: Optional[Dict[str, str]] = None,
+    retries: int = 3,
+) -> http_client.HTTPResult:
+    """
+    Async counterpart of `http_client.fetch_text`.
+
+    Connection errors and 5xx responses are retried up to `retries` times with
+    the same backoff as the requests session; redirects are followed.
+    """
+    req_headers = {
+        "User-Agent": http_client.DEFAULT_USER_AGENT,
+        "Accept-Encoding": "gzip, deflate",
+        "Accept": "*/*",
+    }
+    if headers:
+        req_headers.update(headers)
+
+    current_url = url
+    redirects = 0
+    attempt = 0
+    max_attempts = max(0, int(retries))
+
+    while True:
+        try:
+            response = await _request_once(current_url, req_headers, timeout, max_bytes)
+        except _ResponseTooLarge as exc:
+            return http_client.HTTPResult(
+                ok=False,
+                status_code=exc.status_code,
+                headers=exc.headers,
+                error=f"Response exceeds max size ({max_bytes} bytes)",
+                error_kind="network",
+            )
+        except _NETWORK_ERRORS as exc:
+            if attempt < max_attempts:
+                attempt += 1
+                await _sleep_backoff(attempt)
+                continue
+            return http_client.HTTPResult(ok=False, error=f"Network error: {_describe(exc)}", error_kind="network")
+
+        if response.status_code in RETRY_STATUSES and attempt < max_attempts:
+            attempt += 1
+            await _sleep_backoff(attempt)
+            continue
+
+        if response.status_code in REDIRECT_STATUSES and "location" in response.headers:
+            redirects += 1
+            if redirects > MAX_REDIRECTS:
+                return http_client.HTTPResult(
+                    ok=False,
+                    error=f"Network error: Exceeded {MAX_REDIRECTS} redirects.",
+                    error_kind="network",
+                )
+            next_url = urljoin(current_url, _redirect_location(response.headers))
+            if urlsplit(next_url).hostname != urlsplit(current_url).hostname:
+                # Like requests, never forward credentials to another host.
+                for name in [name for name in req_headers if name.lower() == "authorization"]:
+                    del req_headers[name]
+            current_url = next_url
+            continue
+
+        return _to_result(response)
@@ -0,0 +1,104 @@
+"""
+Per-day compressed store for raw article bodies.
+
+Feed-supplied article HTML (`content:encoded`) is kept out of the digest
+log: each distinct body is zlib-compressed once and appended to
+`bodies.pack`, and the digest records only a small reference (content
+hash, offset, length). `bodies.idx` maps content hashes to their frames so
+a body repeated across fetches or feeds is stored once.
+"""
+import hashlib
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+PACK_NAME = "bodies.pack"
+INDEX_NAME = "bodies.idx"
+
+HASH_BYTES = 16
+# Index entry: content hash, frame offset, frame length.
+_ENTRY_BYTES = HASH_BYTES + 8 + 8
+
+
+class BodyPackError(ValueError):
+    """A reference does not resolve to an intact frame."""
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=HASH_BYTES).hexdigest()
+
+
+class BodyPack:
+    """The pack and hash index of one date directory."""
+
+    def __init__(self, date_dir: Path):
+        self.path = date_dir / PACK_NAME
+        self.index_path = date_dir / INDEX_NAME
+
+    def _load_index(self) -> Dict[str, Tuple[int, int]]:
+        try:
+            buf = self.index_path.read_bytes()
+        except FileNotFoundError:
+            return {}
+        index = {}
+        for pos in range(0, len(buf) - len(buf) % _ENTRY_BYTES, _ENTRY_BYTES):
+            digest = buf[pos:pos + HASH_BYTES].hex()
+            offset = int.from_bytes(buf[pos + HASH_BYTES:pos + HASH_BYTES + 8], "little")
+            length = int.from_bytes(buf[pos + HASH_BYTES + 8:pos + _ENTRY_BYTES], "little")
+            index[digest] = (offset, length)
+        return index
+
+    def put_many(self, bodies: List[str]) -> List[Dict[str, object]]:
+        """Store bodies (deduplicated by content) and return one reference per body."""
+        if not bodies:
+            return []
+        index = self._load_index()
+        refs: List[Dict[str, object]] = []
+        new_entries: List[bytes] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as pack:
+            offset = pack.tell()
+            for body in bodies:
+                digest = content_hash(body)
+                if digest not in index:
+                    frame = zlib.compress(body.encode("utf-8"), 6)
+                    pack.write(frame)
+                    index[digest] = (offset, len(frame))
+                    new_entries.append(
+                        bytes.fromhex(digest) + offset.to_bytes(8, "little") + len(frame).to_bytes(8, "little")
+                    )
+                    offset += len(frame)
+                frame_offset, frame_length = index[digest]
+                refs.append({"sha": digest, "off": frame_offset, "len": frame_length})
+        if new_entries:
+            # Written after the frames: a crash in between only orphans bytes.
+            with open(self.index_path, "ab") as f:
+                torn = f.tell() % _ENTRY_BYTES
+                if torn:
+                    f.truncate(f.tell() - torn)
+                f.write(b"".join(new_entries))
+        return refs
+
+    def get(self, ref: Dict[str, object]) -> str:
+        """Decompress the body a reference points at; raises BodyPackError if it is damaged."""
+        try:
+            offset, length = int(ref["off"]), int(ref["len"])
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                text = zlib.decompress(f.read(length)).decode("utf-8")
+        except (KeyError, TypeError, ValueError, OSError, zlib.error) as exc:
+            raise BodyPackError(f"unreadable article body: {exc}") from exc
+        if content_hash(text) != ref.get("sha"):
+            raise BodyPackError("article body does not match its content hash")
+        return text
+
+
+def read_body(date_dir: Path, ref: Optional[Dict[str, object]]) -> str:
+    """Body for a digest reference, or "" if it is missing or damaged."""
+    if not ref:
+        return ""
+    try:
+        return BodyPack(date_dir).get(ref)
+    except BodyPackError:
+        return ""
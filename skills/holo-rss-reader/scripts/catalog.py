@@ -0,0 +1,66 @@
+"""
+Global article catalog entries.
+
+The catalog maps a normalized article URL to where that article lives:
+the days whose digest lists it (with the record's byte offset in that
+day's digest.ndjson), its feed, and its cached full text. `store` keeps it
+in `catalog/` shards or the `catalog` table of state.db and updates it as
+digests and full articles are written, so lookups never scan date
+directories.
+
+Entry shape::
+
+    {"url": "...", "title": "...", "feed": "...", "feed_url": "...",
+     "days": {"2026-04-19": 1234}, "full": {"date": "...", "path": "..."}}
+"""
+import hashlib
+from typing import Any, Dict, Optional
+
+import url_validator
+
+
+def catalog_key(url: str) -> str:
+    return hashlib.sha256(url_validator.normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def digest_update(date_str: str, offset: int, feed_title: str, feed_url: str, article: Dict[str, Any]) -> Dict:
+    """Partial entry recording that an article was logged in a day's digest."""
+    return {
+        "url": article.get("link", ""),
+        "title": article.get("title", ""),
+        "feed": feed_title,
+        "feed_url": feed_url,
+        "days": {date_str: offset},
+    }
+
+
+def full_update(url: str, date_str: str, path: str) -> Dict:
+    """Partial entry recording a cached full article."""
+    return {"url": url, "full": {"date": date_str, "path": path}}
+
+
+def merge(entry: Optional[Dict[str, Any]], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fold a partial update into an entry.
+
+    Days accumulate (the first offset recorded for a day wins, since a day's
+    log is append-only); other fields take the newest non-empty value.
+    """
+    merged = dict(entry or {})
+    for key, value in update.items():
+        if key == "days":
+            days = dict(merged.get("days") or {})
+            for date_str, offset in value.items():
+                days.setdefault(date_str, offset)
+            merged["days"] = dict(sorted(days.items()))
+        elif value or key not in merged:
+            merged[key] = value
+    return merged
+
+
+def latest_day(entry: Dict[str, Any], prefer: Optional[str] = None) -> Optional[str]:
+    """The day to read an article's digest record from: `prefer` if listed, else the newest."""
+    days = entry.get("days") or {}
+    if prefer and prefer in days:
+        return prefer
+    return max(days) if days else None
@@ -10,6 +10,8 @@ from typing import Any, Dict, Optional
 
 DEFAULT_RSS_DIR = os.path.expanduser("~/data/rss")
 
+FETCH_ENGINES = ("threads", "async")
+
 DEFAULT_CONFIG: Dict[str, Any] = {
     "network": {
         "connect_timeout_sec": 5,
@@ -20,6 +22,37 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     },
     "fetch": {
         "workers": 8,
+        "engine": "threads",
+        "async_concurrency": 256,
+        "per_host_limit": 4,
+        "per_host_interval_ms": 200,
+        "parse_processes": 0,
+    },
+    "schedule": {
+        "enabled": True,
+        "min_interval_min": 15,
+        "max_interval_min": 1440,
+    },
+    "breaker": {
+        "enabled": True,
+        "threshold": 5,
+        "base_cooldown_min": 60,
+        "max_cooldown_min": 10080,
+    },
+    "dedupe": {
+        "enabled": True,
+        "window_days": 7,
+        "max_distance": 6,
+    },
+    "subscriptions": {
+        "ttl_min": 60,
+    },
+    "websub": {
+        "enabled": False,
+        "listen_host": "127.0.0.1",
+        "listen_port": 8765,
+        "callback_url": "",
+        "lease_hours": 24,
     },
     "security": {
         "mode": "loose",
@@ -89,8 +122,118 @@ def normalize_config(config: Dict[str, Any]) -> Dict[str, Any]:
         1,
         64,
     )
+    engine = str(fetch_cfg.get("engine", "threads")).strip().lower()
+    if engine not in FETCH_ENGINES:
+        engine = "threads"
+    fetch_cfg["engine"] = engine
+    fetch_cfg["async_concurrency"] = _clamp_int(
+        fetch_cfg.get("async_concurrency"),
+        DEFAULT_CONFIG["fetch"]["async_concurrency"],
+        1,
+        4096,
+    )
+    fetch_cfg["per_host_limit"] = _clamp_int(
+        fetch_cfg.get("per_host_limit"),
+        DEFAULT_CONFIG["fetch"]["per_host_limit"],
+        1,
+        64,
+    )
+    fetch_cfg["per_host_interval_ms"] = _clamp_int(
+        fetch_cfg.get("per_host_interval_ms"),
+        DEFAULT_CONFIG["fetch"]["per_host_interval_ms"],
+        0,
+        60000,
+    )
+    fetch_cfg["parse_processes"] = _clamp_int(
+        fetch_cfg.get("parse_processes"),
+        DEFAULT_CONFIG["fetch"]["parse_processes"],
+        0,
+        64,
+    )
     normalized["fetch"] = fetch_cfg
 
+    schedule_cfg = normalized.get("schedule", {})
+    schedule_cfg["enabled"] = bool(schedule_cfg.get("enabled", True))
+    schedule_cfg["min_interval_min"] = _clamp_int(
+        schedule_cfg.get("min_interval_min"),
+        DEFAULT_CONFIG["schedule"]["min_interval_min"],
+        1,
+        1440,
+    )
+    schedule_cfg["max_interval_min"] = _clamp_int(
+        schedule_cfg.get("max_interval_min"),
+        DEFAULT_CONFIG["schedule"]["max_interval_min"],
+        schedule_cfg["min_interval_min"],
+        10080,
+    )
+    normalized["schedule"] = schedule_cfg
+
+    breaker_cfg = normalized.get("breaker", {})
+    breaker_cfg["enabled"] = bool(breaker_cfg.get("enabled", True))
+    breaker_cfg["threshold"] = _clamp_int(
+        breaker_cfg.get("threshold"),
+        DEFAULT_CONFIG["breaker"]["threshold"],
+        1,
+        100,
+    )
+    breaker_cfg["base_cooldown_min"] = _clamp_int(
+        breaker_cfg.get("base_cooldown_min"),
+        DEFAULT_CONFIG["breaker"]["base_cooldown_min"],
+        1,
+        1440,
+    )
+    breaker_cfg["max_cooldown_min"] = _clamp_int(
+        breaker_cfg.get("max_cooldown_min"),
+        DEFAULT_CONFIG["breaker"]["max_cooldown_min"],
+        breaker_cfg["base_cooldown_min"],
+        43200,
+    )
+    normalized["breaker"] = breaker_cfg
+
+    dedupe_cfg = normalized.get("dedupe", {})
+    dedupe_cfg["enabled"] = bool(dedupe_cfg.get("enabled", True))
+    dedupe_cfg["window_days"] = _clamp_int(
+        dedupe_cfg.get("window_days"),
+        DEFAULT_CONFIG["dedupe"]["window_days"],
+        1,
+        90,
+    )
+    dedupe_cfg["max_distance"] = _clamp_int(
+        dedupe_cfg.get("max_distance"),
+        DEFAULT_CONFIG["dedupe"]["max_distance"],
+        0,
+        12,
+    )
+    normalized["dedupe"] = dedupe_cfg
+
+    subscriptions_cfg = normalized.get("subscriptions", {})
+    subscriptions_cfg["ttl_min"] = _clamp_int(
+        subscriptions_cfg.get("ttl_min"),
+        DEFAULT_CONFIG["subscriptions"]["ttl_min"],
+        0,
+        10080,
+    )
+    normalized["subscriptions"] = subscriptions_cfg
+
+    websub_cfg = normalized.get("websub", {})
+    websub_cfg["enabled"] = bool(websub_cfg.get("enabled", False))
+    listen_host = str(websub_cfg.get("listen_host") or "").strip()
+    websub_cfg["listen_host"] = listen_host or DEFAULT_CONFIG["websub"]["listen_host"]
+    websub_cfg["listen_port"] = _clamp_int(
+        websub_cfg.get("listen_port"),
+        DEFAULT_CONFIG["websub"]["listen_port"],
+        0,
+        65535,
+    )
+    websub_cfg["callback_url"] = str(websub_cfg.get("callback_url") or "").strip().rstrip("/")
+    websub_cfg["lease_hours"] = _clamp_int(
+        websub_cfg.get("lease_hours"),
+        DEFAULT_CONFIG["websub"]["lease_hours"],
+        1,
+        720,
+    )
+    normalized["websub"] = websub_cfg
+
     security_cfg = normalized.get("security", {})
     mode = str(security_cfg.get("mode", "loose")).strip().lower()
     if mode not in {"loose", "restricted", "allowlist"}:
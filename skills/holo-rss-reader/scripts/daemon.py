@@ -0,0 +1,216 @@
+"""
+Long-running `serve` mode: a Unix-socket JSON API for the CLI.
+
+Every `rss.sh` call otherwise starts a new interpreter, rebuilds the HTTP
+session (and its TLS connections) and reloads config. `Server` keeps one
+process around and runs commands for `call`, the thin client the CLI tries
+first when a daemon is listening.
+
+Protocol: the client connects, sends one JSON line
+`{"argv": [...], "cwd": "..."}` and reads one JSON line back:
+`{"code": int, "stdout": str, "stderr": str, "elapsed_ms": float}`.
+
+Requests run concurrently, each on its own thread. While a server is up,
+`sys.stdout`/`sys.stderr` are replaced by `_ThreadOutput`, which sends what
+a request thread prints to that request's buffers and everything else to
+the original streams. The working directory is never changed; the handler
+gets the client's and resolves relative paths against it.
+"""
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import exit_codes
+
+# How long the client waits for a daemon to accept before running locally.
+CONNECT_TIMEOUT_SEC = 0.5
+
+# Largest request line the server accepts.
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# Exit code reported when a served command raises.
+INTERNAL_ERROR = 1
+
+# Commands the CLI hands to a running daemon. `watch` runs until stopped and
+# installs signal handlers, so it always runs in its own process.
+SERVED_COMMANDS = frozenset({"read", "fetch", "today", "history", "full", "search"})
+
+# Served commands that write feed state or shared indexes; the handler runs
+# them one at a time while the read-only ones keep answering.
+EXCLUSIVE_COMMANDS = frozenset({"fetch", "full"})
+
+_captures = threading.local()
+
+
+class _ThreadOutput:
+    """Stand-in for a standard stream that writes to the current request's buffer."""
+
+    def __init__(self, name: str, fallback):
+        self._name = name
+        self.fallback = fallback
+
+    def _target(self):
+        return getattr(_captures, self._name, None) or self.fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, attr):
+        return getattr(self._target(), attr)
+
+
+@contextlib.contextmanager
+def _captured(stdout: io.StringIO, stderr: io.StringIO):
+    """Route this thread's `sys.stdout`/`sys.stderr` writes to the given buffers."""
+    _captures.stdout, _captures.stderr = stdout, stderr
+    try:
+        yield
+    finally:
+        _captures.stdout = _captures.stderr = None
+
+
+class DaemonError(OSError):
+    """The daemon accepted a request but the reply was lost or malformed."""
+
+
+def supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def call(socket_path: Path, argv: List[str], *, cwd: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Run a command in the daemon listening on `socket_path`.
+
+    Returns the daemon's response, or None when no daemon is listening (no
+    socket, or a stale one left by a daemon that died), so the caller can
+    run the command itself. Raises `DaemonError` if the connection breaks
+    after the request was sent.
+    """
+    if not supported() or not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT_SEC)
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return None
+        # Commands such as `full --from-digest` can take minutes.
+        sock.settimeout(None)
+        request = {"argv": list(argv), "cwd": cwd or os.getcwd()}
+        try:
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+        except OSError as exc:
+            raise DaemonError(f"lost connection to daemon: {exc}") from exc
+    finally:
+        sock.close()
+    try:
+        response = json.loads(line)
+    except ValueError as exc:
+        raise DaemonError("daemon closed the connection without a reply") from exc
+    if not isinstance(response, dict) or not isinstance(response.get("code"), int):
+        raise DaemonError("malformed reply from daemon")
+    return response
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+        try:
+            request = json.loads(line)
+            argv = request["argv"]
+            if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+                raise ValueError("argv must be a list of strings")
+        except (ValueError, KeyError, TypeError) as exc:
+            response = {
+                "code": exit_codes.PARAM_ERROR, "stdout": "", "stderr": f"bad request: {exc}\n", "elapsed_ms": 0.0,
+            }
+        else:
+            response = self.server.run(argv, request.get("cwd"))
+        try:
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        except OSError:
+            # The client went away; nothing left to report to.
+            pass
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serve `handler(argv, cwd) -> exit code` on a Unix socket.
+
+    Each connection runs on its own thread, and so does its `handler` call;
+    `handler` serializes whatever must not overlap.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, handler: Callable[[List[str], Optional[str]], int], *, log=None):
+        self.socket_path = Path(socket_path)
+        self.handler = handler
+        self.log = log or sys.stderr
+        if is_listening(self.socket_path):
+            raise FileExistsError(f"a daemon is already listening on {self.socket_path}")
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # Owner-only: the socket runs commands with this user's data.
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.socket_path), _Handler)
+        finally:
+            os.umask(old_umask)
+        self._streams = (sys.stdout, sys.stderr)
+        sys.stdout = _ThreadOutput("stdout", sys.stdout)
+        sys.stderr = _ThreadOutput("stderr", sys.stderr)
+
+    def run(self, argv: List[str], cwd: Optional[str]) -> Dict[str, Any]:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        start = time.perf_counter()
+        with _captured(stdout, stderr):
+            try:
+                code = self.handler(argv, cwd)
+            except SystemExit as exc:
+                # argparse errors and --help
+                code = exc.code if isinstance(exc.code, int) else exit_codes.PARAM_ERROR
+            except Exception:
+                traceback.print_exc()
+                code = INTERNAL_ERROR
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"{argv[0] if argv else '-'} -> {code} ({elapsed_ms:.1f} ms)", file=self.log, flush=True)
+        return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "elapsed_ms": elapsed_ms}
+
+    def server_close(self):
+        super().server_close()
+        if isinstance(sys.stdout, _ThreadOutput) and sys.stdout.fallback is self._streams[0]:
+            sys.stdout, sys.stderr = self._streams
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+
+def is_listening(socket_path: Path) -> bool:
+    """True if something accepts connections on `socket_path`."""
+    if not supported() or not os.path.exists(socket_path):
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT_SEC)
+        sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
@@ -0,0 +1,293 @@
+"""
+Cross-feed near-duplicate article detection.
+
+The same story reaches the digest through several feeds (aggregators,
+mirrors, one WeChat article through different bridges) under different
+URLs. Each article gets three fingerprints:
+
+- its canonical URL (`url_validator.normalize_url`, then without scheme
+  and a leading `www.`: tracking parameters, http/https, host case, default
+  port and trailing slash do not count);
+- the numbers in its title ("541", "1.2", "GPT-6");
+- a 64-bit SimHash of its title and summary, so reworded, re-formatted and
+  differently truncated copies land within a few bits of each other.
+
+An article is a copy when another feed already delivered the same
+canonical URL, or a SimHash within `max_distance` bits under a title with
+the same numbers. Articles are never compared with their own feed: a
+feed's own history is its seen set. The numbers keep templated series
+("This Week in X 541", "foo v1.2 released") apart across feeds, where the
+rest of the text is nearly identical.
+
+`DedupeIndex` keeps the fingerprints, with the feed that delivered them,
+for a rolling window of days in `dedupe.idx`. SimHashes are split into
+bands and bucketed by band value: two hashes within `max_distance` bits
+must agree exactly on at least one of `max_distance + 1` bands, so a lookup
+only compares against one bucket per band instead of every stored hash.
+"""
+import hashlib
+import os
+import re
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import parser as article_parser
+import search_index
+import url_validator
+from seen_set import fingerprint
+
+
+SIMHASH_BITS = 64
+
+# Titles plus summaries shorter than this many tokens get no SimHash; a
+# handful of words collide too easily. Their canonical URL still counts.
+MIN_FEATURES = 6
+
+# Feeds truncate summaries at different lengths; only this much of the
+# summary goes into the SimHash so copies cut at 200 or 400 chars agree.
+MAX_SUMMARY_CHARS = 200
+
+# File header; files without it hold an older record layout and are rewritten.
+_MAGIC = b"HRDEDUP3"
+
+# Record: canonical-URL fingerprint, SimHash (0 = none), title-numbers
+# fingerprint, feed fingerprint, day ordinal.
+_RECORD_BYTES = 8 + 8 + 8 + 8 + 4
+
+Record = Tuple[int, int, int, int, int]
+
+# Indexes handed out by `DedupeIndex.open`, by path, with their settings and
+# the file's (size, mtime) when they last matched it.
+_OPEN: Dict[Path, Tuple[Tuple, Optional[Tuple[int, int]], "DedupeIndex"]] = {}
+_open_lock = threading.Lock()
+
+
+# SimHash bit counts are kept in one big integer, one LANE_BITS-wide lane
+# per bit, so a feature is added with a few table lookups and one addition
+# instead of a 64-step loop.
+LANE_BITS = 24
+_LANE_MASK = (1 << LANE_BITS) - 1
+_SPREAD = [
+    sum(1 << (bit * LANE_BITS) for bit in range(8) if byte >> bit & 1)
+    for byte in range(256)
+]
+
+
+def _spread(value: bytes) -> int:
+    """Spread 64 feature bits into lanes: bit i becomes 1 at lane i."""
+    lanes = 0
+    for k, byte in enumerate(value):
+        lanes |= _SPREAD[byte] << (k * 8 * LANE_BITS)
+    return lanes
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over the text's words and CJK bigrams; 0 if it is too short."""
+    tokens = search_index.tokenize(text).split()
+    if len(tokens) < MIN_FEATURES:
+        return 0
+    tokens = tokens[:_LANE_MASK]
+    ones = 0
+    for token in tokens:
+        ones += _spread(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest())
+    # A bit is set when more than half the features have it.
+    half = len(tokens) // 2
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        if (ones >> (bit * LANE_BITS) & _LANE_MASK) > half:
+            value |= 1 << bit
+    return value
+
+
+_NUMBER = re.compile(r"\d+")
+
+
+def url_key(link: str) -> str:
+    """Canonical URL without scheme and leading `www.`: mirrors differ in both."""
+    canonical = url_validator.normalize_url(link)
+    parts = urlsplit(canonical)
+    if not parts.scheme or not parts.netloc:
+        return canonical
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    return f"//{host}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def article_fingerprints(article: Dict) -> Tuple[int, int, int]:
+    """
+    `(canonical URL fingerprint, SimHash of title + summary, title-numbers
+    fingerprint)` for a parsed article.
+    """
+    url_fp = fingerprint(url_key(article.get("link", "")))
+    title = article.get("title", "")
+    summary = article_parser.strip_html(article.get("summary", ""))
+    numbers_fp = fingerprint(" ".join(_NUMBER.findall(title)))
+    return url_fp, simhash(f"{title}\n{summary[:MAX_SUMMARY_CHARS]}"), numbers_fp
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _file_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DedupeIndex:
+    """
+    Fingerprints of articles delivered in the last `window_days` days.
+
+    Safe to share between fetch worker threads.
+    """
+
+    def __init__(self, *, window_days: int = 7, max_distance: int = 6, today: Optional[date] = None):
+        self.window_days = window_days
+        self.max_distance = max_distance
+        self.today = (today or date.today()).toordinal()
+        band_count = max_distance + 1
+        width = SIMHASH_BITS // band_count
+        # (shift, mask) per band; the last band takes the leftover bits.
+        self._bands = [
+            (i * width, (1 << (width if i < band_count - 1 else SIMHASH_BITS - i * width)) - 1)
+            for i in range(band_count)
+        ]
+        # Band value -> (SimHash, title-numbers fingerprint, feed fingerprint) per band.
+        self._buckets: List[Dict[int, List[Tuple[int, int, int]]]] = [{} for _ in self._bands]
+        # Canonical-URL fingerprint -> fingerprints of the feeds that delivered it.
+        self._urls: Dict[int, Set[int]] = {}
+        self._records: List[Record] = []
+        self._new: List[Record] = []
+        self._expired = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: Path, *, window_days: int = 7, max_distance: int = 6) -> "DedupeIndex":
+        """
+        `load` for today, reusing the index from an earlier call while the
+        file is unchanged, so `serve` does not re-read it on every fetch.
+        """
+        settings = (window_days, max_distance, date.today())
+        with _open_lock:
+            cached = _OPEN.get(path)
+            if cached is not None and cached[:2] == (settings, _file_key(path)):
+                return cached[2]
+            index = cls.load(path, window_days=window_days, max_distance=max_distance, today=settings[2])
+            _OPEN[path] = (settings, _file_key(path), index)
+            return index
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "DedupeIndex":
+        """Read `dedupe.idx`, dropping records older than the window."""
+        index = cls(**kwargs)
+        try:
+            buf = path.read_bytes()
+        except FileNotFoundError:
+            return index
+        if not buf.startswith(_MAGIC):
+            # Older record layout: start over, rewrite on save.
+            index._expired = bool(buf)
+            return index
+        oldest = index.today - index.window_days
+        body = len(buf) - len(_MAGIC)
+        for pos in range(len(_MAGIC), len(buf) - body % _RECORD_BYTES, _RECORD_BYTES):
+            url_fp, sim, numbers_fp, feed_fp = (
+                int.from_bytes(buf[pos + i:pos + i + 8], "little") for i in range(0, 32, 8)
+            )
+            day = int.from_bytes(buf[pos + 32:pos + 36], "little")
+            if day <= oldest:
+                index._expired = True
+                continue
+            index._insert((url_fp, sim, numbers_fp, feed_fp, day))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _insert(self, record: Record):
+        url_fp, sim, numbers_fp, feed_fp, _day = record
+        self._records.append(record)
+        self._urls.setdefault(url_fp, set()).add(feed_fp)
+        if sim:
+            for (shift, mask), buckets in zip(self._bands, self._buckets):
+                buckets.setdefault(sim >> shift & mask, []).append((sim, numbers_fp, feed_fp))
+
+    def _is_duplicate(self, url_fp: int, sim: int, numbers_fp: int, feed_fp: int) -> bool:
+        delivered_by = self._urls.get(url_fp)
+        if delivered_by and delivered_by != {feed_fp}:
+            return True
+        if not sim:
+            return False
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            for other_sim, other_numbers, other_feed in buckets.get(sim >> shift & mask, ()):
+                if (
+                    other_feed != feed_fp
+                    and other_numbers == numbers_fp
+                    and hamming(sim, other_sim) <= self.max_distance
+                ):
+                    return True
+        return False
+
+    def filter(self, articles: List[Dict], feed_url: str) -> Tuple[List[Dict], int]:
+        """
+        Drop articles another feed already delivered within the window and
+        record the rest for `feed_url`. Returns `(kept, dropped_count)`.
+        """
+        feed_fp = fingerprint(feed_url)
+        fingerprints = [article_fingerprints(article) for article in articles]
+        kept = []
+        with self._lock:
+            for article, (url_fp, sim, numbers_fp) in zip(articles, fingerprints):
+                if self._is_duplicate(url_fp, sim, numbers_fp, feed_fp):
+                    continue
+                record = (url_fp, sim, numbers_fp, feed_fp, self.today)
+                self._insert(record)
+                self._new.append(record)
+                kept.append(article)
+        return kept, len(articles) - len(kept)
+
+    def save(self, path: Path):
+        """Append this run's records; rewrite the file when old records expired."""
+        with self._lock:
+            if not self._new and not self._expired:
+                return
+            if self._expired:
+                records, mode = self._records, "wb"
+            else:
+                records, mode = self._new, "ab"
+            data = b"".join(
+                b"".join(value.to_bytes(8, "little") for value in record[:4]) + record[4].to_bytes(4, "little")
+                for record in records
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if mode == "ab":
+                with open(path, "ab") as f:
+                    if f.tell() < len(_MAGIC):
+                        f.truncate(0)
+                        f.write(_MAGIC)
+                    torn = (f.tell() - len(_MAGIC)) % _RECORD_BYTES
+                    if torn:
+                        f.truncate(f.tell() - torn)
+                    f.write(data)
+            else:
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                try:
+                    with open(tmp_path, "wb") as f:
+                        f.write(_MAGIC + data)
+                    tmp_path.replace(path)
+                except Exception:
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+                    raise
+            self._new = []
+            self._expired = False
+        with _open_lock:
+            cached = _OPEN.get(path)
+            if cached is not None and cached[2] is self:
+                # Our own write; the records in memory already match it.
+                _OPEN[path] = (cached[0], _file_key(path), self)
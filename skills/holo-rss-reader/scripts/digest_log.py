@@ -0,0 +1,117 @@
+"""
+Append-only per-day digest log.
+
+Each day's articles are NDJSON records in `digest.ndjson`, and a sidecar
+`digest.links` holds one 64-bit fingerprint per record for dedupe, so a
+fetch appends only its new articles instead of reloading and rewriting the
+whole day. A torn trailing line from a crash is skipped on read.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from seen_set import FINGERPRINT_BYTES, fingerprint
+
+
+LOG_NAME = "digest.ndjson"
+LINKS_NAME = "digest.links"
+
+
+def record_key(feed_title: str, link: Optional[str]) -> int:
+    """Dedupe key: an article link is unique within its feed's section."""
+    return fingerprint(f"{feed_title}\n{link or ''}")
+
+
+class DigestLog:
+    """The NDJSON digest log and link index of one date directory."""
+
+    def __init__(self, date_dir: Path):
+        self.path = date_dir / LOG_NAME
+        self.links_path = date_dir / LINKS_NAME
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def read_bytes(self) -> bytes:
+        try:
+            return self.path.read_bytes()
+        except FileNotFoundError:
+            return b""
+
+    def records(self, raw: Optional[bytes] = None) -> Iterator[Dict[str, Any]]:
+        """Records in append order; pass `raw` to reuse bytes already read."""
+        for _offset, record in self.entries(raw):
+            yield record
+
+    def entries(self, raw: Optional[bytes] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """`(byte offset, record)` pairs in append order."""
+        offset = 0
+        for line in (self.read_bytes() if raw is None else raw).splitlines(keepends=True):
+            start, offset = offset, offset + len(line)
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if isinstance(record, dict) and isinstance(record.get("article"), dict):
+                yield start, record
+
+    def keys(self) -> Set[int]:
+        """Fingerprints of logged articles; rebuilt from the log if the index is missing."""
+        try:
+            buf = self.links_path.read_bytes()
+        except FileNotFoundError:
+            if not self.exists():
+                return set()
+            keys = [record_key(r.get("feed", ""), r["article"].get("link")) for r in self.records()]
+            self._append_keys(keys)
+            return set(keys)
+        usable = len(buf) - len(buf) % FINGERPRINT_BYTES
+        return {
+            int.from_bytes(buf[offset:offset + FINGERPRINT_BYTES], "little")
+            for offset in range(0, usable, FINGERPRINT_BYTES)
+        }
+
+    def record_at(self, offset: int) -> Optional[Dict[str, Any]]:
+        """The record whose line starts at byte `offset`, or None."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                line = f.readline()
+        except (OSError, ValueError):
+            return None
+        return next(self.records(line), None)
+
+    def append(self, records: List[Dict[str, Any]], keys: List[int]) -> List[int]:
+        """
+        Append records, then their keys; return each record's byte offset.
+
+        The log is written first: a crash in between can only lead to a
+        duplicate record later, which readers drop, never to a lost article.
+        """
+        if not records:
+            return []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [(json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8") for record in records]
+        with open(self.path, "ab+") as f:
+            offset = f.tell()
+            if offset:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    # Start a fresh line after a torn one.
+                    lines[0] = b"\n" + lines[0]
+            f.write(b"".join(lines))
+        offsets = []
+        for line in lines:
+            offsets.append(offset + (1 if line.startswith(b"\n") else 0))
+            offset += len(line)
+        self._append_keys(keys)
+        return offsets
+
+    def _append_keys(self, keys: List[int]):
+        if not keys:
+            return
+        with open(self.links_path, "ab") as f:
+            torn = f.tell() % FINGERPRINT_BYTES
+            if torn:
+                f.truncate(f.tell() - torn)
+            f.write(b"".join(key.to_bytes(FINGERPRINT_BYTES, "little") for key in keys))
@@ -0,0 +1,353 @@
+"""
+Streaming article text extraction.
+
+One pass over the HTML parser's start/end/data events: boilerplate
+subtrees (scripts, navigation, sidebars, comment sections, ...) are dropped
+as they open, text is collected into blocks at block-level tag boundaries,
+and each block's score is credited to its enclosing containers the way
+Readability does. The best-scoring container, plus any strong siblings,
+becomes the article text. No document tree is built.
+
+lxml's C tokenizer drives the pass when it is installed; the stdlib
+`html.parser` is the fallback.
+"""
+import re
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+# HTML is fed to the parser in slices so memory stays flat on huge pages.
+CHUNK_SIZE = 64 * 1024
+
+# Blocks shorter than this do not vote for their container.
+MIN_BLOCK_CHARS = 25
+
+_SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "math", "canvas", "iframe", "object", "embed",
+    "nav", "header", "footer", "aside", "form", "button", "select", "textarea", "dialog", "head",
+}
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+}
+_BLOCK_TAGS = {
+    "address", "article", "blockquote", "body", "br", "dd", "div", "dl", "dt", "figcaption", "figure", "h1", "h2",
+    "h3", "h4", "h5", "h6", "hr", "li", "main", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+# Opening one of these implicitly closes an open sibling of the listed kinds
+# (lxml already does this; html.parser reports tags exactly as written).
+_IMPLIED_END = {
+    "li": ({"li"}, {"ul", "ol"}),
+    "dt": ({"dt", "dd"}, {"dl"}),
+    "dd": ({"dt", "dd"}, {"dl"}),
+    "tr": ({"tr"}, {"table"}),
+    "td": ({"td", "th"}, {"tr", "table"}),
+    "th": ({"td", "th"}, {"tr", "table"}),
+}
+_TAG_WEIGHTS = {
+    "article": 10, "main": 10, "div": 5, "section": 3, "pre": 3, "td": 3, "blockquote": 3,
+    "address": -3, "ol": -3, "ul": -3, "dl": -3, "dd": -3, "dt": -3, "li": -3,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5,
+}
+
+# Subtrees whose class/id look like page furniture are skipped outright...
+_UNLIKELY = re.compile(
+    r"ad-|ads\b|advert|banner|breadcrumb|combx|comment|community|cookie|disqus|extra|foot|header|menu|"
+    r"modal|newsletter|pager|pagination|popup|promo|related|remark|rss|share|shoutbox|sidebar|skyscraper|"
+    r"social|sponsor|subscribe|tags\b|toolbar|widget",
+    re.I,
+)
+# ...unless they also look like they may hold the article.
+_MAYBE = re.compile(r"and|article|body|column|content|main|post|shadow|story|text", re.I)
+_POSITIVE = re.compile(r"article|body|content|entry|hentry|main|page|post|rich_media|story|text|blog", re.I)
+_NEGATIVE = re.compile(r"byline|caption|meta|hidden|outbrain|shopping|taboola|teaser|author|date|widget", re.I)
+
+class _Node:
+    __slots__ = ("tag", "parent", "weight", "score", "chars", "link_chars", "scored", "negative")
+
+    def __init__(self, tag: str, parent: Optional["_Node"], class_weight: int):
+        self.tag = tag
+        self.parent = parent
+        self.weight = _TAG_WEIGHTS.get(tag, 0) + class_weight
+        # Bylines, captions and the like inside the article are left out.
+        self.negative = class_weight < 0 or bool(parent and parent.negative)
+        self.score = 0.0
+        self.chars = 0
+        self.link_chars = 0
+        self.scored = False
+
+
+class _Collector:
+    """Parser target: turns start/end/data events into scored text blocks."""
+
+    def __init__(self):
+        self.title_parts: List[str] = []
+        self.root = _Node("#root", None, 0)
+        self.stack: List[_Node] = [self.root]
+        # Open tags inside the boilerplate subtree being dropped.
+        self.skip_stack: List[str] = []
+        self.in_title = False
+        self.link_depth = 0
+        self.pre_depth = 0
+        self.parts: List[str] = []
+        self.part_links = 0
+        # (text, owning node, is heading)
+        self.blocks: List[Tuple[str, _Node, bool]] = []
+        self.nodes: List[_Node] = []
+
+    # -- parser target interface ------------------------------------------
+
+    def start(self, tag, attrib):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag == "title" and not self.title_parts:
+            self.in_title = True
+            return
+        if tag == "body":
+            # An unclosed <head> must not swallow the page.
+            self.skip_stack = []
+        if self.skip_stack and tag in _IMPLIED_END:
+            # e.g. an unclosed <td class="menu"> ends at the next <td>.
+            siblings, boundaries = _IMPLIED_END[tag]
+            for depth in range(len(self.skip_stack) - 1, -1, -1):
+                if self.skip_stack[depth] in boundaries:
+                    break
+                if self.skip_stack[depth] in siblings:
+                    del self.skip_stack[depth:]
+                    break
+        if self.skip_stack:
+            if tag not in _VOID_TAGS:
+                self.skip_stack.append(tag)
+            return
+        class_weight = None if tag in _SKIP_TAGS else _classify(tag, attrib)
+        if class_weight is None:
+            if tag not in _VOID_TAGS:
+                self.skip_stack.append(tag)
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush()
+            if tag != "br" and self.stack[-1].tag == "p":
+                self._pop()
+        if tag in _IMPLIED_END:
+            self._close_implied(*_IMPLIED_END[tag])
+        if tag in _VOID_TAGS:
+            return
+        if tag == "a":
+            self.link_depth += 1
+        elif tag == "pre":
+            self.pre_depth += 1
+        node = _Node(tag, self.stack[-1], class_weight)
+        self.stack.append(node)
+        self.nodes.append(node)
+
+    def end(self, tag):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag == "title" and self.in_title:
+            self.in_title = False
+            return
+        if self.skip_stack:
+            if tag in self.skip_stack:
+                while self.skip_stack.pop() != tag:
+                    pass
+                return
+            if not any(node.tag == tag for node in self.stack):
+                return
+            # Closes an element that encloses the dropped subtree.
+            self.skip_stack = []
+        if tag in _VOID_TAGS:
+            return
+        # Tolerate stray end tags and ones that close several open elements.
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                break
+        else:
+            return
+        while len(self.stack) > depth:
+            self._pop()
+
+    def data(self, text):
+        if self.in_title:
+            self.title_parts.append(text)
+        elif not self.skip_stack and text:
+            self.parts.append(text)
+            if self.link_depth:
+                self.part_links += len(text.strip())
+
+    def comment(self, _text):
+        pass
+
+    def close(self):
+        while len(self.stack) > 1:
+            self._pop()
+        self._flush()
+        return self
+
+    # -- internals ----------------------------------------------------------
+
+    def _close_implied(self, siblings: set, boundaries: set):
+        for depth in range(len(self.stack) - 1, 0, -1):
+            tag = self.stack[depth].tag
+            if tag in boundaries:
+                return
+            if tag in siblings:
+                while len(self.stack) > depth:
+                    self._pop()
+                return
+
+    def _pop(self):
+        node = self.stack[-1]
+        if node.tag in _BLOCK_TAGS:
+            self._flush()
+        self.stack.pop()
+        if node.tag == "a":
+            self.link_depth = max(0, self.link_depth - 1)
+        elif node.tag == "pre":
+            self.pre_depth = max(0, self.pre_depth - 1)
+        parent = node.parent
+        parent.chars += node.chars
+        parent.link_chars += node.link_chars
+
+    def _flush(self):
+        if not self.parts:
+            return
+        raw = "".join(self.parts)
+        if self.pre_depth:
+            text = raw.strip("\n")
+        else:
+            text = " ".join(raw.split())
+        links = self.part_links
+        self.parts, self.part_links = [], 0
+        if not text:
+            return
+
+        owner = self.stack[-1]
+        owner.chars += len(text)
+        owner.link_chars += min(links, len(text))
+        heading = owner.tag in ("h1", "h2", "h3", "h4", "h5", "h6")
+        self.blocks.append((text, owner, heading))
+
+        if len(text) < MIN_BLOCK_CHARS or links * 2 > len(text):
+            return
+        score = 1 + text.count(",") + text.count("，") + text.count("。") + min(len(text) // 100, 3)
+        parent = owner.parent if owner.tag in ("p", "pre", "td", "blockquote", "li") else owner
+        for share, node in ((1.0, parent), (0.5, parent.parent if parent else None)):
+            if node is None or node is self.root:
+                continue
+            if not node.scored:
+                node.scored = True
+                node.score += node.weight
+            node.score += score * share
+
+
+def _classify(tag: str, attrib) -> Optional[int]:
+    """None if the element is page furniture to drop, else its class/id weight."""
+    if not attrib:
+        return 0
+    marker = f"{attrib.get('class') or ''} {attrib.get('id') or ''}"
+    if "hidden" in attrib or "display:none" in (attrib.get("style") or "").replace(" ", ""):
+        return None
+    if marker == " ":
+        return 0
+    if tag not in ("html", "body", "article", "main") and _UNLIKELY.search(marker) and not _MAYBE.search(marker):
+        return None
+    weight = 0
+    if _NEGATIVE.search(marker):
+        weight -= 25
+    if _POSITIVE.search(marker):
+        weight += 25
+    return weight
+
+
+class _StdlibParser(HTMLParser):
+    def __init__(self, target: _Collector):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+        if tag in _VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+
+def _collect(html: str, use_lxml: bool) -> _Collector:
+    collector = _Collector()
+    chunks = (html[offset:offset + CHUNK_SIZE] for offset in range(0, len(html), CHUNK_SIZE))
+    if use_lxml and etree is not None:
+        parser = etree.HTMLParser(target=collector, remove_comments=True, remove_pis=True, no_network=True)
+        for chunk in chunks:
+            parser.feed(chunk)
+        try:
+            parser.close()
+        except etree.LxmlError:
+            pass  # e.g. an empty document
+    else:
+        parser = _StdlibParser(collector)
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+    # Idempotent: lxml has usually closed the target already.
+    return collector.close()
+
+
+def _final_score(node: _Node) -> float:
+    density = node.link_chars / node.chars if node.chars else 0.0
+    return node.score * (1.0 - density)
+
+
+def _within(node: _Node, chosen: set) -> bool:
+    while node is not None:
+        if id(node) in chosen:
+            return True
+        node = node.parent
+    return False
+
+
+def extract(html: str, fallback_title: str = "", *, use_lxml: bool = True) -> Tuple[str, str]:
+    """
+    Return `(title, text)` for an article page; paragraphs are separated by
+    blank lines. The title comes from `<title>`, else `fallback_title`.
+    """
+    collector = _collect(html or "", use_lxml)
+    title = " ".join("".join(collector.title_parts).split()) or fallback_title
+
+    candidates = [node for node in collector.nodes if node.scored]
+    if not candidates:
+        return title, "\n\n".join(text for text, _node, _heading in collector.blocks)
+
+    best = max(candidates, key=_final_score)
+    best_score = _final_score(best)
+    chosen = {id(best)}
+    threshold = max(10.0, best_score * 0.2)
+    for node in candidates:
+        if node.parent is best.parent and node is not best and _final_score(node) >= threshold:
+            chosen.add(id(node))
+
+    kept: List[str] = []
+    lead: List[str] = []
+    for text, owner, heading in collector.blocks:
+        if owner.negative:
+            continue
+        if _within(owner, chosen):
+            if not kept:
+                kept.extend(lead[-2:])
+            kept.append(text)
+        elif not kept:
+            # Keep the headline (and subtitle) just above the body; bylines in between do not count.
+            if heading:
+                lead.append(text)
+            elif len(text) >= MIN_BLOCK_CHARS:
+                lead = []
+    return title, "\n\n".join(kept)
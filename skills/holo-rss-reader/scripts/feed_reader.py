@@ -0,0 +1,312 @@
+"""
+Fast streaming reader for well-formed RSS 2.0 and Atom feeds.
+
+This is the default parse path for fetched feeds. It extracts only the
+fields `parser.parse_article` reads and skips feedparser's sanitizing and
+normalization machinery, except that script/style blocks are dropped from
+summaries and content. Entries are read incrementally and reading stops as
+soon as `limit` entries are collected or the feed runs into links it has
+already delivered.
+
+Anything unusual (malformed XML, DTDs and HTML entities, RSS 0.9x, RDF,
+xml:base, relative links, xhtml content) raises `UnsupportedFeed`; callers
+then fall back to feedparser.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+from xml.etree.ElementTree import ParseError
+
+from defusedxml.ElementTree import DefusedXMLParser
+from defusedxml.common import DefusedXmlException
+
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+SY_NS = "{http://purl.org/rss/1.0/modules/syndication/}"
+XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+# Text is fed to expat in slices so an early stop skips tokenizing the rest.
+CHUNK_SIZE = 64 * 1024
+
+# Stop after this many consecutive already-seen entries rather than the
+# first one, so a pinned (old) post at the top does not hide new posts.
+SEEN_STREAK_TO_STOP = 3
+
+_RSS_ENTRY_FIELDS = {
+    "title": "title",
+    "link": "link",
+    "guid": "guid",
+    "pubDate": "published",
+    DC_DATE: "updated",
+    "description": "summary",
+    CONTENT_ENCODED: "content",
+}
+_ATOM_ENTRY_FIELDS = {
+    ATOM_NS + "title": "title",
+    ATOM_NS + "id": "id",
+    ATOM_NS + "published": "published",
+    ATOM_NS + "updated": "updated",
+    ATOM_NS + "summary": "summary",
+    ATOM_NS + "content": "content",
+}
+_RSS_FEED_FIELDS = {
+    "title": "title",
+    "link": "link",
+    "description": "description",
+    "language": "language",
+    "ttl": "ttl",
+    SY_NS + "updatePeriod": "sy_updateperiod",
+    SY_NS + "updateFrequency": "sy_updatefrequency",
+}
+_ATOM_FEED_FIELDS = {
+    ATOM_NS + "title": "title",
+    ATOM_NS + "subtitle": "description",
+}
+
+_UNSAFE_BLOCK_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+class UnsupportedFeed(Exception):
+    """The document is not a plain RSS 2.0/Atom feed this reader handles."""
+
+
+class _StopReading(Exception):
+    pass
+
+
+class FeedDict(dict):
+    """dict with attribute access, like feedparser's FeedParserDict."""
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+@dataclass
+class StreamedFeed:
+    """feedparser-compatible subset: `.feed`, `.entries` and `.bozo`."""
+
+    feed: FeedDict = field(default_factory=FeedDict)
+    entries: List[FeedDict] = field(default_factory=list)
+    bozo: bool = False
+    complete: bool = True
+
+
+def _clean_html(value: str) -> str:
+    return _UNSAFE_BLOCK_RE.sub("", value) if "<" in value else value
+
+
+def _absolute_link(value: str) -> str:
+    link = value.strip()
+    if link and not link.lower().startswith(("http://", "https://")):
+        # feedparser resolves relative links against the document base.
+        raise UnsupportedFeed(f"relative link: {link[:80]}")
+    return link
+
+
+class _FeedTarget:
+    """ElementTree parser target that collects only the fields we use."""
+
+    def __init__(self, limit: Optional[int], seen_links: Optional[Set[str]]):
+        self.limit = limit
+        self.seen_links = seen_links or set()
+        self.result = StreamedFeed()
+        self.kind: Optional[str] = None
+        self.depth = 0
+        self.container_depth: Optional[int] = None
+        self.entry: Optional[Dict[str, Any]] = None
+        self.entry_depth: Optional[int] = None
+        self.capture: Optional[str] = None
+        self.capture_depth: Optional[int] = None
+        self.text: List[str] = []
+        self.seen_streak = 0
+
+    def _start_root(self, tag: str, attrib: Dict[str, str]):
+        if tag == "rss":
+            version = attrib.get("version", "").strip()
+            if not version.startswith("2."):
+                raise UnsupportedFeed(f"RSS version {version}")
+            self.kind = "rss"
+        elif tag == ATOM_NS + "feed":
+            self.kind = "atom"
+            self.container_depth = 1
+            if attrib.get(XML_LANG):
+                self.result.feed["language"] = attrib[XML_LANG].strip()
+        else:
+            raise UnsupportedFeed(f"root element {tag}")
+
+    def start(self, tag: str, attrib: Dict[str, str]):
+        self.depth += 1
+        if XML_BASE in attrib:
+            raise UnsupportedFeed("xml:base")
+        if self.depth == 1:
+            self._start_root(tag, attrib)
+            return
+
+        if self.capture is not None:
+            # Markup inside a text field: unescaped RSS HTML or Atom xhtml.
+            raise UnsupportedFeed(f"element {tag} inside {self.capture}")
+
+        if self.kind == "rss" and self.depth == 2 and tag == "channel":
+            self.container_depth = 2
+            return
+        if self.container_depth is None:
+            return
+
+        if self.entry is None:
+            if self.depth != self.container_depth + 1:
+                return
+            if tag == ("item" if self.kind == "rss" else ATOM_NS + "entry"):
+                self.entry = FeedDict()
+                self.entry_depth = self.depth
+            elif tag == ATOM_NS + "link":
+                self._feed_link(attrib)
+            else:
+                fields = _RSS_FEED_FIELDS if self.kind == "rss" else _ATOM_FEED_FIELDS
+                self._begin_capture(fields.get(tag), attrib)
+            return
+
+        if self.depth != self.entry_depth + 1:
+            return
+        if self.kind == "atom" and tag == ATOM_NS + "link":
+            self._atom_link(self.entry, attrib)
+            return
+        fields = _RSS_ENTRY_FIELDS if self.kind == "rss" else _ATOM_ENTRY_FIELDS
+        name = fields.get(tag)
+        if name == "guid":
+            self.entry["guid_is_permalink"] = attrib.get("isPermaLink", "true").strip().lower() != "false"
+        self._begin_capture(name, attrib)
+
+    def _begin_capture(self, name: Optional[str], attrib: Dict[str, str]):
+        if name is None:
+            return
+        if self.kind == "atom" and attrib.get("type", "").strip().lower() == "xhtml":
+            raise UnsupportedFeed("xhtml text construct")
+        self.capture = name
+        self.capture_depth = self.depth
+        self.text = []
+
+    def _feed_link(self, attrib: Dict[str, str]):
+        """Feed-level atom:link; also read inside RSS channels for WebSub hubs."""
+        if self.kind == "atom":
+            self._atom_link(self.result.feed, attrib)
+        rel = attrib.get("rel", "alternate").strip().lower()
+        href = attrib.get("href", "").strip()
+        if rel in ("hub", "self") and href:
+            # Same shape as feedparser's `feed.links`.
+            self.result.feed.setdefault("links", []).append(FeedDict(rel=rel, href=href))
+
+    @staticmethod
+    def _atom_link(target: Dict[str, Any], attrib: Dict[str, str]):
+        rel = attrib.get("rel", "alternate").strip().lower()
+        if rel == "alternate" and "link" not in target:
+            target["link"] = _absolute_link(attrib.get("href", ""))
+
+    def data(self, data: str):
+        if self.capture is not None:
+            self.text.append(data)
+
+    def end(self, tag: str):
+        if self.capture is not None and self.depth == self.capture_depth:
+            self._end_capture()
+        elif self.entry is not None and self.depth == self.entry_depth:
+            self._end_entry()
+        self.depth -= 1
+
+    def _end_capture(self):
+        name, value = self.capture, "".join(self.text).strip()
+        self.capture = None
+        self.text = []
+        target = self.entry if self.entry is not None else self.result.feed
+        if name in target:
+            return
+        if name == "link":
+            value = _absolute_link(value)
+        elif name in ("summary", "content"):
+            value = _clean_html(value)
+        target[name] = value
+
+    def _end_entry(self):
+        entry = self._finish_entry(self.entry)
+        self.entry = None
+        self.entry_depth = None
+        self.result.entries.append(entry)
+
+        if entry.get("link") and entry["link"] in self.seen_links:
+            self.seen_streak += 1
+        else:
+            self.seen_streak = 0
+
+        if self.limit is not None and len(self.result.entries) >= self.limit:
+            raise _StopReading()
+        if self.seen_streak >= SEEN_STREAK_TO_STOP:
+            raise _StopReading()
+
+    def _finish_entry(self, raw: Dict[str, Any]) -> FeedDict:
+        entry = FeedDict()
+        if "title" in raw:
+            entry["title"] = raw["title"]
+
+        guid = raw.get("guid", "")
+        link = raw.get("link", "")
+        if not link and guid and raw.get("guid_is_permalink") and guid.lower().startswith(("http://", "https://")):
+            link = guid
+        entry["link"] = link
+        entry["id"] = raw.get("id") or guid or link
+
+        for key in ("published", "updated"):
+            if raw.get(key):
+                entry[key] = raw[key]
+
+        content = raw.get("content")
+        if content:
+            entry["content"] = [FeedDict(value=content)]
+        summary = raw.get("summary") or content
+        if summary:
+            entry["summary"] = summary
+        return entry
+
+    def close(self):
+        return None
+
+
+def read_feed(
+    text: str,
+    *,
+    limit: Optional[int] = None,
+    seen_links: Optional[Set[str]] = None,
+) -> StreamedFeed:
+    """
+    Read a feed incrementally.
+
+    Stops after `limit` entries, or after a run of entries whose links are in
+    `seen_links`; `complete` is False when reading stopped early.
+
+    Raises:
+        UnsupportedFeed: malformed XML, DTDs/entities, RSS 0.9x or unversioned
+        RSS, RDF or other constructs only feedparser handles.
+    """
+    target = _FeedTarget(limit, seen_links)
+    parser = DefusedXMLParser(target=target)
+    text = text.lstrip("\ufeff \t\r\n")
+
+    try:
+        for start in range(0, len(text), CHUNK_SIZE):
+            parser.feed(text[start:start + CHUNK_SIZE])
+        parser.close()
+    except _StopReading:
+        target.result.complete = False
+        return target.result
+    except (ParseError, DefusedXmlException) as exc:
+        raise UnsupportedFeed(str(exc)) from exc
+
+    if target.kind is None:
+        raise UnsupportedFeed("empty document")
+    if target.container_depth is None:
+        raise UnsupportedFeed("RSS without a channel")
+    return target.result
@@ -4,15 +4,24 @@ Supports: Gist OPML (default) + local feeds.json for custom sources.
 """
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-import gist
+from lazy_import import lazy_import
+
+# Only Gist imports need the network stack; local feed edits should not load it.
+gist = lazy_import("gist")
 
 
 # Local feeds config location (next to state.json)
 DEFAULT_RSS_DIR = os.path.expanduser("~/data/rss")
 
+# Parsed feeds.json by path, keyed by the file's (size, mtime), so `serve`
+# re-reads it only after it was edited.
+_LOCAL_FEEDS: Dict[Path, Tuple[Tuple[int, int], List[Dict]]] = {}
+_local_feeds_lock = threading.Lock()
+
 
 def get_feeds_config_path() -> Path:
     """Get local feeds.json path."""
@@ -25,15 +34,25 @@ def load_local_feeds() -> List[Dict]:
     Load feeds from local feeds.json.
     """
     path = get_feeds_config_path()
-    if not path.exists():
-        return []
-
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data.get("feeds", [])
-    except (json.JSONDecodeError, KeyError):
+        stat = path.stat()
+    except FileNotFoundError:
         return []
+    key = (stat.st_size, stat.st_mtime_ns)
+
+    with _local_feeds_lock:
+        cached = _LOCAL_FEEDS.get(path)
+        if cached is None or cached[0] != key:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                feeds = data.get("feeds", [])
+            except (json.JSONDecodeError, KeyError):
+                feeds = []
+            cached = _LOCAL_FEEDS[path] = (key, feeds)
+    # Callers add and remove entries before saving; the entries themselves
+    # are shared and treated as read-only.
+    return list(cached[1])
 
 
 def save_local_feeds(feeds: List[Dict]):
@@ -98,3 +117,29 @@ def collect_all_feeds(gist_url: str = None) -> List[Dict]:
     """
     feeds, _kind, _message = collect_all_feeds_detailed(gist_url)
     return feeds
+
+
+def feed_tags(feed: Dict) -> List[str]:
+    """Tags of a feed: OPML folders/categories, or `tags` in feeds.json (list or comma string)."""
+    tags = feed.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    return [str(tag).strip() for tag in tags if str(tag).strip()]
+
+
+def matches_filter(feed: Dict, terms: List[str]) -> bool:
+    """
+    True if any term names one of the feed's tags, or appears in its title or URL.
+
+    Matching is case-insensitive; an empty filter matches every feed.
+    """
+    if not terms:
+        return True
+    tags = {tag.lower() for tag in feed_tags(feed)}
+    title = str(feed.get("title", "")).lower()
+    url = str(feed.get("url", "")).lower()
+    for term in terms:
+        term = term.strip().lower()
+        if term and (term in tags or term in title or term in url):
+            return True
+    return False
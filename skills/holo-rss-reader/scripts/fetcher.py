@@ -1,14 +1,25 @@
 """
 RSS/Atom feed fetching functionality.
 """
+import hashlib
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import feedparser
 
+import feed_reader
+import host_scheduler
 import http_client
+import polling
 import url_validator
+from lazy_import import lazy_import
+
+# Only `--engine async` needs it (and asyncio with it).
+async_http_client = lazy_import("async_http_client")
+
+
+FEED_ACCEPT = "application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.8, */*;q=0.5"
 
 
 class FeedFetchError(Exception):
@@ -26,6 +37,10 @@ class FeedFetchMeta:
     etag: str = ""
     last_modified: str = ""
     error_kind: Optional[str] = None
+    retry_after: Optional[float] = None
+    max_age: Optional[int] = None
+    body_digest: str = ""
+    unchanged: bool = False
 
 
 def fetch_feed_detailed(
@@ -39,63 +54,220 @@ def fetch_feed_detailed(
     conditional_headers: Optional[Dict[str, str]] = None,
     security_mode: str = "loose",
     allowlist: Optional[List[str]] = None,
+    previous_digest: Optional[str] = None,
+    limit: Optional[int] = None,
+    seen_links: Optional[Set[str]] = None,
 ) -> Tuple[Any, Optional[str], FeedFetchMeta]:
     """
     Fetch and parse an RSS/Atom feed with metadata for caching/error mapping.
 
+    `limit` and `seen_links` let the streaming reader stop early; see
+    `parse_feed_text`. When the body digest equals `previous_digest` the body
+    is not parsed and `meta.unchanged` is set.
+
+    Returns:
+        (feed, error_message, metadata)
+    """
+    text, error, meta = download_feed_detailed(
+        url,
+        session=session,
+        connect_timeout_sec=connect_timeout_sec,
+        read_timeout_sec=read_timeout_sec,
+        max_bytes=max_bytes,
+        retries=retries,
+        conditional_headers=conditional_headers,
+        security_mode=security_mode,
+        allowlist=allowlist,
+        previous_digest=previous_digest,
+    )
+    return _parse_download(text, error, meta, limit=limit, seen_links=seen_links)
+
+
+async def fetch_feed_detailed_async(
+    url: str,
+    *,
+    connect_timeout_sec: int = 5,
+    read_timeout_sec: int = 20,
+    max_bytes: int = 2 * 1024 * 1024,
+    retries: int = 3,
+    conditional_headers: Optional[Dict[str, str]] = None,
+    security_mode: str = "loose",
+    allowlist: Optional[List[str]] = None,
+    previous_digest: Optional[str] = None,
+    limit: Optional[int] = None,
+    seen_links: Optional[Set[str]] = None,
+) -> Tuple[Any, Optional[str], FeedFetchMeta]:
+    """
+    Asyncio counterpart of `fetch_feed_detailed` with identical semantics.
+
     Returns:
         (feed, error_message, metadata)
     """
+    text, error, meta = await download_feed_detailed_async(
+        url,
+        connect_timeout_sec=connect_timeout_sec,
+        read_timeout_sec=read_timeout_sec,
+        max_bytes=max_bytes,
+        retries=retries,
+        conditional_headers=conditional_headers,
+        security_mode=security_mode,
+        allowlist=allowlist,
+        previous_digest=previous_digest,
+    )
+    return _parse_download(text, error, meta, limit=limit, seen_links=seen_links)
+
+
+def download_feed_detailed(
+    url: str,
+    *,
+    session=None,
+    connect_timeout_sec: int = 5,
+    read_timeout_sec: int = 20,
+    max_bytes: int = 2 * 1024 * 1024,
+    retries: int = 3,
+    conditional_headers: Optional[Dict[str, str]] = None,
+    security_mode: str = "loose",
+    allowlist: Optional[List[str]] = None,
+    previous_digest: Optional[str] = None,
+) -> Tuple[Optional[str], Optional[str], FeedFetchMeta]:
+    """
+    Download a feed body without parsing it.
+
+    Returns:
+        (body_text, error_message, metadata); body_text is None on errors, 304
+        and bodies whose digest equals `previous_digest` (`meta.unchanged`).
+    """
     validation_error = url_validator.validate_url(url, security_mode=security_mode, allowlist=allowlist)
     if validation_error:
-        return (
-            feedparser.parse(""),
-            f"Invalid URL: {validation_error}",
-            FeedFetchMeta(error_kind="validation"),
-        )
+        return None, f"Invalid URL: {validation_error}", FeedFetchMeta(error_kind="validation")
 
     own_session = session is None
     sess = session or http_client.build_session(retries=retries)
 
     try:
-        headers = {
-            "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.8, */*;q=0.5"
-        }
-        if conditional_headers:
-            headers.update(conditional_headers)
-
         result = http_client.fetch_text(
             url,
             session=sess,
             timeout=http_client.make_timeout(connect_timeout_sec, read_timeout_sec),
             max_bytes=max_bytes,
-            headers=headers,
+            headers=_feed_request_headers(conditional_headers),
         )
+        return _download_outcome(result, previous_digest)
+    finally:
+        if own_session:
+            sess.close()
 
-        meta = FeedFetchMeta(
-            status_code=result.status_code,
-            etag=result.headers.get("etag", ""),
-            last_modified=result.headers.get("last-modified", ""),
-            error_kind=result.error_kind,
-        )
 
-        if not result.ok:
-            return (feedparser.parse(""), result.error or "Unknown error", meta)
+async def download_feed_detailed_async(
+    url: str,
+    *,
+    connect_timeout_sec: int = 5,
+    read_timeout_sec: int = 20,
+    max_bytes: int = 2 * 1024 * 1024,
+    retries: int = 3,
+    conditional_headers: Optional[Dict[str, str]] = None,
+    security_mode: str = "loose",
+    allowlist: Optional[List[str]] = None,
+    previous_digest: Optional[str] = None,
+) -> Tuple[Optional[str], Optional[str], FeedFetchMeta]:
+    """Asyncio counterpart of `download_feed_detailed`."""
+    validation_error = url_validator.validate_url(url, security_mode=security_mode, allowlist=allowlist)
+    if validation_error:
+        return None, f"Invalid URL: {validation_error}", FeedFetchMeta(error_kind="validation")
+
+    result = await async_http_client.fetch_text(
+        url,
+        timeout=http_client.make_timeout(connect_timeout_sec, read_timeout_sec),
+        max_bytes=max_bytes,
+        headers=_feed_request_headers(conditional_headers),
+        retries=retries,
+    )
+    return _download_outcome(result, previous_digest)
 
-        if result.status_code == 304:
-            return (feedparser.parse(""), None, meta)
 
-        feed = feedparser.parse(result.text)
-        if getattr(feed, "bozo", False) and not getattr(feed, "entries", []):
-            bozo_exc = getattr(feed, "bozo_exception", None)
-            message = f"Parse error: {bozo_exc}" if bozo_exc else "Parse error: invalid feed content"
-            meta.error_kind = "parse"
-            return (feed, message, meta)
+def parse_feed_text(
+    text: str,
+    *,
+    limit: Optional[int] = None,
+    seen_links: Optional[Set[str]] = None,
+) -> Tuple[Any, Optional[str]]:
+    """
+    Parse a downloaded feed body.
 
-        return (feed, None, meta)
-    finally:
-        if own_session:
-            sess.close()
+    Plain RSS 2.0/Atom feeds are read by the fast streaming `feed_reader`,
+    which also stops after `limit` entries or once it reaches already-seen
+    links; anything it does not handle falls back to feedparser.
+
+    Returns:
+        (feed, error_message); the error is set only when nothing usable was parsed.
+    """
+    try:
+        return feed_reader.read_feed(text, limit=limit, seen_links=seen_links), None
+    except feed_reader.UnsupportedFeed:
+        pass
+
+    feed = feedparser.parse(text)
+    if getattr(feed, "bozo", False) and not getattr(feed, "entries", []):
+        bozo_exc = getattr(feed, "bozo_exception", None)
+        message = f"Parse error: {bozo_exc}" if bozo_exc else "Parse error: invalid feed content"
+        return feed, message
+    return feed, None
+
+
+def _feed_request_headers(conditional_headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    headers = {"Accept": FEED_ACCEPT}
+    if conditional_headers:
+        headers.update(conditional_headers)
+    return headers
+
+
+def content_digest(text: str) -> str:
+    """Short stable digest of a response body or entry-link list."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def _download_outcome(
+    result: http_client.HTTPResult,
+    previous_digest: Optional[str] = None,
+) -> Tuple[Optional[str], Optional[str], FeedFetchMeta]:
+    meta = FeedFetchMeta(
+        status_code=result.status_code,
+        etag=result.headers.get("etag", ""),
+        last_modified=result.headers.get("last-modified", ""),
+        error_kind=result.error_kind,
+        retry_after=host_scheduler.parse_retry_after(result.headers.get("retry-after")),
+        max_age=polling.parse_max_age(result.headers.get("cache-control")),
+    )
+
+    if not result.ok:
+        return None, result.error or "Unknown error", meta
+
+    if result.status_code == 304:
+        return None, None, meta
+
+    meta.body_digest = content_digest(result.text)
+    if previous_digest and meta.body_digest == previous_digest:
+        meta.unchanged = True
+        return None, None, meta
+
+    return result.text, None, meta
+
+
+def _parse_download(
+    text: Optional[str],
+    error: Optional[str],
+    meta: FeedFetchMeta,
+    *,
+    limit: Optional[int] = None,
+    seen_links: Optional[Set[str]] = None,
+) -> Tuple[Any, Optional[str], FeedFetchMeta]:
+    if error or text is None:
+        return feedparser.parse(""), error, meta
+
+    feed, parse_error = parse_feed_text(text, limit=limit, seen_links=seen_links)
+    if parse_error:
+        meta.error_kind = "parse"
+    return feed, parse_error, meta
 
 
 def fetch_feed(url: str, timeout: int = 10) -> Tuple[Any, Optional[str]]:
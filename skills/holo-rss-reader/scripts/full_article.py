@@ -0,0 +1,337 @@
+"""
+Full-article fetching and text extraction.
+
+Used by `full` for a single URL and for batches (`--from-digest`,
+`--urls-file`): batches are fetched on a thread pool through the per-host
+scheduler, HTML extraction optionally runs in a process pool, and the
+full-article index is committed once at the end. `fetch --prefetch-full`
+streams newly found links into a `Prefetcher` while feeds are still being
+fetched.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import extractor
+import host_scheduler
+import http_client
+import parser as article_parser
+import store
+import url_validator
+
+
+# Parse articles in worker processes only for batches at least this large.
+EXTRACT_POOL_MIN_ARTICLES = 16
+
+
+@dataclass
+class FullBatch:
+    """Settings shared by every article of one `full` run."""
+
+    date_str: str
+    net: Dict[str, Any]
+    max_bytes: int
+    security_opts: Dict[str, Any] = field(default_factory=dict)
+    # link -> (raw body, feed_title, article_title); the body is HTML or a
+    # digest `content_ref`. None resolves articles through the catalog and
+    # only loads the day's digest for links it does not know.
+    feed_content: Optional[Dict[str, Tuple[Any, str, str]]] = None
+    extract_pool: Optional[Executor] = None
+
+    def fallback_content(self, url: str) -> Optional[Tuple[str, str, str]]:
+        """`(text, feed_title, article_title)` from the feed's own copy of an article."""
+        date_str = self.date_str
+        found = self.feed_content.get(url) if self.feed_content else None
+        if not found:
+            record = store.find_digest_article(url, self.date_str)
+            if record:
+                article, date_str = record["article"], record["date"]
+                body = article.get("content_ref") or article.get("content", "")
+                found = (body, record.get("feed", ""), article.get("title", store.slugify(url))) if body else None
+            elif self.feed_content is None:
+                # Digests written before the catalog existed.
+                self.feed_content = digest_feed_content(self.date_str)
+                found = self.feed_content.get(url)
+        if not found:
+            return None
+        body, feed_title, title = found
+        if not isinstance(body, str):
+            body = store.load_article_content(date_str, {"content_ref": body})
+        text = article_parser.strip_html(body)
+        return (text, feed_title, title) if text else None
+
+
+def extract_pool_size(setting: int, article_count: int) -> int:
+    """Resolve the extraction process count; <= 1 means extract inline."""
+    if setting > 0:
+        return setting
+    if article_count < EXTRACT_POOL_MIN_ARTICLES:
+        return 1
+    return os.cpu_count() or 1
+
+
+def extract_article(html: str, fallback_title: str) -> Tuple[str, str]:
+    """
+    Return `(title, text)` extracted from an article page.
+
+    Takes and returns plain strings so it can run in extraction workers.
+    """
+    return extractor.extract(html, fallback_title)
+
+
+def digest_feed_content(date_str: str) -> Dict[str, Tuple[Any, str, str]]:
+    """
+    Map article link -> `(body, feed_title, article_title)` for articles
+    whose feed shipped full content (`content:encoded`) in that day's digest.
+
+    `body` is inline HTML from older digests, else a `content_ref` into the
+    day's body pack; nothing is decompressed until a fallback needs it.
+    """
+    found: Dict[str, Tuple[Any, str, str]] = {}
+    for feed_title, feed_data in store.load_digest_data(date_str).items():
+        for article in feed_data.get("articles", []):
+            link = article.get("link")
+            body = article.get("content_ref") or article.get("content", "")
+            if link and body and link not in found:
+                title = article.get("title", store.slugify(link))
+                found[link] = (body, feed_title, title)
+    return found
+
+
+def digest_links(date_str: str) -> List[Dict[str, str]]:
+    """
+    Articles listed in a day's digest as `{"url", "feed_title"}`, in digest
+    order. Links that differ only in tracking parameters or URL spelling are
+    listed once.
+    """
+    items, seen = [], set()
+    for feed_title, feed_data in store.load_digest_data(date_str).items():
+        for article in feed_data.get("articles", []):
+            link = article.get("link")
+            canonical = url_validator.normalize_url(link) if link else ""
+            if link and canonical not in seen:
+                seen.add(canonical)
+                items.append({"url": link, "feed_title": feed_title})
+    return items
+
+
+def read_urls_file(path: str) -> List[Dict[str, str]]:
+    """One URL per line; blank lines and `#` comments are skipped."""
+    items, seen = [], set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            url = line.split("#", 1)[0].strip()
+            if url and url not in seen:
+                seen.add(url)
+                items.append({"url": url, "feed_title": ""})
+    return items
+
+
+def _result(url: str, **fields) -> Dict[str, Any]:
+    return {"url": url, "status": "failed", "path": None, "throttle_sec": 0.0, **fields}
+
+
+def process_article(batch: FullBatch, item: Dict[str, str], session) -> Dict[str, Any]:
+    """
+    Validate, check the cache, then fetch, extract and save one article.
+
+    Returns a result dict with `status` "cached", "saved", "fallback" or
+    "failed" (plus `error`/`error_kind`), and `throttle_sec` for the scheduler.
+    """
+    url = item["url"]
+    validation_error = url_validator.validate_url(url, **batch.security_opts)
+    if validation_error:
+        return _result(url, error=validation_error, error_kind="validation")
+
+    cached = store.lookup_full_article(url, date_str=batch.date_str)
+    if cached:
+        return _result(url, status="cached", path=cached)
+    return fetch_and_save(batch, item, session)
+
+
+def fetch_and_save(batch: FullBatch, item: Dict[str, str], session) -> Dict[str, Any]:
+    """Download and extract one article, falling back to digest content."""
+    url = item["url"]
+    result = _result(url)
+    response = http_client.fetch_text(
+        url,
+        session=session,
+        timeout=http_client.make_timeout(batch.net["connect_timeout_sec"], batch.net["read_timeout_sec"]),
+        max_bytes=batch.max_bytes,
+        headers={"Accept": "text/html,application/xhtml+xml"},
+    )
+    result["throttle_sec"] = host_scheduler.throttle_delay(
+        response.status_code, host_scheduler.parse_retry_after(response.headers.get("Retry-After"))
+    )
+
+    feed_title = item.get("feed_title") or "unknown"
+    if response.ok:
+        fallback_title = store.slugify(url)
+        if batch.extract_pool is not None:
+            title, content = batch.extract_pool.submit(extract_article, response.text, fallback_title).result()
+        else:
+            title, content = extract_article(response.text, fallback_title)
+        status = "saved"
+    else:
+        # WeChat and other anti-scraping sites: use content:encoded from the digest.
+        fallback = batch.fallback_content(url)
+        if not fallback:
+            result.update(error=response.error or "Unknown error", error_kind=response.error_kind or "network")
+            return result
+        content, feed_title, title = fallback
+        status = "fallback"
+
+    article_info = {"title": title, "link": url, "published": batch.date_str}
+    try:
+        path = store.save_full_article(batch.date_str, feed_title, article_info, content)
+    except (OSError, sqlite3.Error) as exc:
+        result.update(error=str(exc), error_kind="storage")
+        return result
+    result.update(status=status, path=path)
+    return result
+
+
+def run_batch(
+    batch: FullBatch,
+    items: List[Dict[str, str]],
+    *,
+    session,
+    workers: int,
+    on_result: Callable[[Dict[str, Any]], None],
+    per_host_limit: int,
+    per_host_interval_sec: float = 0.0,
+):
+    """
+    Process articles concurrently; index updates are committed once at the end.
+
+    `on_result` runs on the calling thread.
+    """
+    with store.full_index_batch():
+        host_scheduler.run_threaded(
+            items,
+            lambda item: process_article(batch, item, session),
+            workers=workers,
+            on_result=on_result,
+            per_host_limit=per_host_limit,
+            per_host_interval_sec=per_host_interval_sec,
+        )
+
+
+class Prefetcher:
+    """
+    Background full-article stage fed while `fetch` is still running.
+
+    `submit` never blocks, so it is safe from the async engine's event loop;
+    a dispatcher thread moves links from the inbox into a `HostScheduler` only
+    while fewer than `max_pending` are queued or in flight, and runs them on
+    `workers` threads. Index updates are committed once by `close`.
+    """
+
+    # Re-check the inbox this often while articles are in flight.
+    POLL_SEC = 0.05
+
+    def __init__(
+        self,
+        batch: FullBatch,
+        *,
+        session,
+        workers: int,
+        per_host_limit: int,
+        per_host_interval_sec: float = 0.0,
+        max_pending: Optional[int] = None,
+    ):
+        self.batch = batch
+        if self.batch.feed_content is None:
+            # The digest is written after the fetch; fall back to what the feeds shipped.
+            self.batch.feed_content = {}
+        self.session = session
+        self.workers = max(1, workers)
+        self.per_host_limit = per_host_limit
+        self.per_host_interval_sec = per_host_interval_sec
+        self.max_pending = max_pending or self.workers * 4
+        self.counts = {"queued": 0, "saved": 0, "fallback": 0, "cached": 0, "failed": 0}
+        self._inbox: "queue.Queue[Optional[Dict[str, str]]]" = queue.Queue()
+        self._seen: set = set()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> "Prefetcher":
+        self._thread = threading.Thread(target=self._run, name="full-prefetch", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, feed_title: str, articles: List[Dict[str, Any]]):
+        """Queue a feed's new articles; their feed content becomes the fallback."""
+        for article in articles:
+            link = article.get("link")
+            if not link or link in self._seen:
+                continue
+            self._seen.add(link)
+            raw_content = article.get("content", "")
+            if raw_content:
+                title = article.get("title", store.slugify(link))
+                self.batch.feed_content[link] = (raw_content, feed_title, title)
+            self.counts["queued"] += 1
+            self._inbox.put({"url": link, "feed_title": feed_title})
+
+    def close(self) -> Dict[str, int]:
+        """Wait for queued articles to finish, commit the index, return status counts."""
+        if self._thread is not None:
+            self._inbox.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise self._error
+        return self.counts
+
+    def _run(self):
+        try:
+            with store.full_index_batch():
+                self._dispatch()
+        except BaseException as exc:
+            self._error = exc
+
+    def _dispatch(self):
+        scheduler = host_scheduler.HostScheduler(
+            [], per_host_limit=self.per_host_limit, min_interval_sec=self.per_host_interval_sec
+        )
+        in_flight: Dict[Any, Dict[str, str]] = {}
+        closing = False
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not closing or scheduler.pending or in_flight:
+                while not closing and scheduler.pending + len(in_flight) < self.max_pending:
+                    idle = not (scheduler.pending or in_flight)
+                    try:
+                        item = self._inbox.get(block=idle)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        closing = True
+                    else:
+                        scheduler.add(item)
+
+                while len(in_flight) < self.workers:
+                    item = scheduler.pop_ready()
+                    if item is None:
+                        break
+                    in_flight[executor.submit(process_article, self.batch, item, self.session)] = item
+
+                delay = scheduler.next_delay() if scheduler.pending else None
+                if not closing:
+                    delay = self.POLL_SEC if delay is None else min(delay, self.POLL_SEC)
+                if not in_flight:
+                    time.sleep(delay or 0.0)
+                    continue
+
+                done, _pending = wait(in_flight, timeout=delay, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    result = future.result()
+                    scheduler.release(item, throttle_sec=result.get("throttle_sec", 0.0))
+                    self.counts[result["status"]] += 1
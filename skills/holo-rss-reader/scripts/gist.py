@@ -1,18 +1,23 @@
 """
 Gist and OPML parsing functionality.
 """
+import json
 import re
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
 from defusedxml import ElementTree as ET
 from defusedxml.common import DefusedXmlException
 
 import http_client
+import subscription_cache
 import url_validator
 
 
 GITHUB_API_BASE = "https://api.github.com"
 
+GITHUB_ACCEPT = "application/vnd.github+json"
+
 
 def extract_gist_id(url: str) -> Optional[str]:
     """
@@ -66,7 +71,7 @@ def fetch_gist_detailed(
             session=sess,
             timeout=http_client.make_timeout(connect_timeout_sec, read_timeout_sec),
             max_bytes=max_bytes,
-            headers={"Accept": "application/vnd.github+json"},
+            headers={"Accept": GITHUB_ACCEPT},
         )
         if not result.ok:
             return None, result.error_kind or "network", result.error or "Unknown error"
@@ -105,23 +110,100 @@ def parse_opml(opml_content: str) -> List[Dict]:
 
     try:
         root = ET.fromstring(opml_content)
-
-        for outline in root.iter("outline"):
-            xml_url = outline.get("xmlUrl")
-            if xml_url:
-                feed = {
-                    "title": outline.get("text") or outline.get("title") or "Untitled",
-                    "url": xml_url,
-                    "html_url": outline.get("htmlUrl", ""),
-                }
-                feeds.append(feed)
-
+        body = root.find("body")
+        _collect_outlines(body if body is not None else root, [], feeds)
     except (ET.ParseError, DefusedXmlException):
         pass
 
     return feeds
 
 
+def _collect_outlines(element, folders: List[str], feeds: List[Dict]):
+    """Walk outlines in document order; enclosing folder outlines become feed tags."""
+    for outline in element.findall("outline"):
+        xml_url = outline.get("xmlUrl")
+        if xml_url:
+            categories = outline.get("category", "").replace("/", ",").split(",")
+            tags = folders + [tag.strip() for tag in categories if tag.strip()]
+            feed = {
+                "title": outline.get("text") or outline.get("title") or "Untitled",
+                "url": xml_url,
+                "html_url": outline.get("htmlUrl", ""),
+            }
+            if tags:
+                feed["tags"] = list(dict.fromkeys(tags))
+            feeds.append(feed)
+            _collect_outlines(outline, folders, feeds)
+        else:
+            folder = outline.get("text") or outline.get("title")
+            _collect_outlines(outline, folders + [folder] if folder else folders, feeds)
+
+
+def _feeds_from_gist_data(gist_data: Dict) -> Tuple[List[Dict], Optional[str], Optional[str]]:
+    opml_file = find_opml_file(gist_data.get("files", {}))
+    if not opml_file:
+        return [], "parse", "No OPML file found in gist"
+
+    opml_content = opml_file.get("content", "")
+    feeds = parse_opml(opml_content)
+    if not feeds:
+        return [], "parse", "No feeds found in OPML"
+    return feeds, None, None
+
+
+def _feeds_from_gist_json(text: str) -> Tuple[List[Dict], Optional[str], Optional[str]]:
+    try:
+        gist_data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        return [], "parse", f"JSON parse error: {exc}"
+    if not isinstance(gist_data, dict):
+        return [], "parse", "Unexpected Gist API response"
+    return _feeds_from_gist_data(gist_data)
+
+
+def _feeds_from_opml(text: str) -> Tuple[List[Dict], Optional[str], Optional[str]]:
+    feeds = parse_opml(text)
+    if not feeds:
+        return [], "parse", "No feeds found in OPML"
+    return feeds, None, None
+
+
+def _retrieve_cached(
+    url: str,
+    parse: Callable[[str], Tuple[List[Dict], Optional[str], Optional[str]]],
+    *,
+    cache_dir: Path,
+    ttl_sec: int,
+    session=None,
+    connect_timeout_sec: int,
+    read_timeout_sec: int,
+    max_bytes: int,
+    retries: int,
+    accept: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str], Optional[str]]:
+    """Fetch a subscription list through its on-disk manifest (see `subscription_cache`)."""
+    own_session = session is None
+    sess = session or http_client.build_session(retries=retries)
+
+    def fetch(conditional_headers: Dict[str, str]) -> http_client.HTTPResult:
+        headers = dict(conditional_headers)
+        if accept:
+            headers["Accept"] = accept
+        return http_client.fetch_text(
+            url,
+            session=sess,
+            timeout=http_client.make_timeout(connect_timeout_sec, read_timeout_sec),
+            max_bytes=max_bytes,
+            headers=headers,
+        )
+
+    try:
+        return subscription_cache.retrieve(url, cache_dir=cache_dir, ttl_sec=ttl_sec, fetch=fetch, parse=parse)
+    finally:
+        if own_session:
+            sess.close()
+
+
 def import_gist_opml_detailed(
     gist_url: str,
     *,
@@ -132,10 +214,15 @@ def import_gist_opml_detailed(
     retries: int = 3,
     security_mode: str = "loose",
     allowlist: Optional[List[str]] = None,
+    cache_dir: Optional[Path] = None,
+    ttl_sec: int = 0,
 ) -> Tuple[List[Dict], Optional[str], Optional[str]]:
     """
     Import feeds from a Gist containing OPML.
 
+    With `cache_dir` the parsed list is kept in a manifest there, reused
+    for `ttl_sec` and then revalidated with a conditional request.
+
     Returns:
         (feeds, error_kind, error_message)
     """
@@ -147,6 +234,20 @@ def import_gist_opml_detailed(
     if not gist_id:
         return [], "validation", "Unable to extract gist id from URL"
 
+    if cache_dir is not None:
+        return _retrieve_cached(
+            build_gist_api_url(gist_id),
+            _feeds_from_gist_json,
+            cache_dir=cache_dir,
+            ttl_sec=ttl_sec,
+            session=session,
+            connect_timeout_sec=connect_timeout_sec,
+            read_timeout_sec=read_timeout_sec,
+            max_bytes=max_bytes,
+            retries=retries,
+            accept=GITHUB_ACCEPT,
+        )
+
     gist_data, error_kind, error_message = fetch_gist_detailed(
         gist_id,
         session=session,
@@ -157,16 +258,7 @@ def import_gist_opml_detailed(
     )
     if not gist_data:
         return [], error_kind or "network", error_message or "Failed to fetch gist"
-
-    opml_file = find_opml_file(gist_data.get("files", {}))
-    if not opml_file:
-        return [], "parse", "No OPML file found in gist"
-
-    opml_content = opml_file.get("content", "")
-    feeds = parse_opml(opml_content)
-    if not feeds:
-        return [], "parse", "No feeds found in OPML"
-    return feeds, None, None
+    return _feeds_from_gist_data(gist_data)
 
 
 def import_gist_opml(gist_url: str) -> List[Dict]:
@@ -187,10 +279,14 @@ def import_opml_from_url_detailed(
     retries: int = 3,
     security_mode: str = "loose",
     allowlist: Optional[List[str]] = None,
+    cache_dir: Optional[Path] = None,
+    ttl_sec: int = 0,
 ) -> Tuple[List[Dict], Optional[str], Optional[str]]:
     """
     Import feeds from direct OPML URL.
 
+    `cache_dir` and `ttl_sec` work as in `import_gist_opml_detailed`.
+
     Returns:
         (feeds, error_kind, error_message)
     """
@@ -198,6 +294,19 @@ def import_opml_from_url_detailed(
     if validation_error:
         return [], "validation", f"Invalid OPML URL: {validation_error}"
 
+    if cache_dir is not None:
+        return _retrieve_cached(
+            opml_url,
+            _feeds_from_opml,
+            cache_dir=cache_dir,
+            ttl_sec=ttl_sec,
+            session=session,
+            connect_timeout_sec=connect_timeout_sec,
+            read_timeout_sec=read_timeout_sec,
+            max_bytes=max_bytes,
+            retries=retries,
+        )
+
     own_session = session is None
     sess = session or http_client.build_session(retries=retries)
     try:
@@ -209,11 +318,7 @@ def import_opml_from_url_detailed(
         )
         if not result.ok:
             return [], result.error_kind or "network", result.error or "Failed to download OPML"
-
-        feeds = parse_opml(result.text)
-        if not feeds:
-            return [], "parse", "No feeds found in OPML"
-        return feeds, None, None
+        return _feeds_from_opml(result.text)
     finally:
         if own_session:
             sess.close()
@@ -0,0 +1,226 @@
+"""
+Per-host politeness scheduling for concurrent fetches.
+
+Feeds are grouped by host; each host gets a concurrency cap and a minimum
+spacing between request starts, while free worker slots are handed to
+whichever other host is ready next.
+"""
+import heapq
+import ipaddress
+import itertools
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# Second-level labels under which registrations happen one level deeper
+# (e.g. example.co.uk); good enough without a public-suffix list.
+_SHARED_SECOND_LEVEL = {"ac", "co", "com", "edu", "gov", "net", "org"}
+
+DEFAULT_THROTTLE_SEC = 30.0
+MAX_THROTTLE_SEC = 300.0
+
+
+def host_key(url: str) -> str:
+    """
+    Return the politeness bucket for a URL.
+
+    Subdomains of the same site (``foo.substack.com``, ``bar.substack.com``)
+    share one bucket because they are served by the same infrastructure.
+    """
+    host = (urlparse(url).hostname or "").lower().strip(".")
+    if not host:
+        return ""
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+
+    labels = host.split(".")
+    if len(labels) <= 2:
+        return host
+    if len(labels[-1]) == 2 and labels[-2] in _SHARED_SECOND_LEVEL:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+def throttle_delay(status_code: Optional[int], retry_after: Optional[float]) -> float:
+    """How long a host should rest after a response, 0 when no backoff is needed."""
+    if status_code == 429 or (status_code == 503 and retry_after is not None):
+        delay = retry_after if retry_after is not None else DEFAULT_THROTTLE_SEC
+        return min(MAX_THROTTLE_SEC, max(0.0, delay))
+    return 0.0
+
+
+class HostScheduler:
+    """
+    Hand out queued items while honoring per-host concurrency and spacing.
+
+    Not thread-safe: call it from the single thread that dispatches work.
+    """
+
+    def __init__(
+        self,
+        items: List[Any],
+        *,
+        per_host_limit: int,
+        min_interval_sec: float = 0.0,
+        key: Optional[Callable[[Any], str]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.min_interval_sec = max(0.0, float(min_interval_sec))
+        self._key = key or (lambda item: host_key(item["url"]))
+        self._clock = clock
+
+        self._pending: Dict[str, Deque[Any]] = {}
+        self._active: Dict[str, int] = {}
+        self._next_start: Dict[str, float] = {}
+        self._ready: Deque[str] = deque()
+        self._waiting: List[Tuple[float, int, str]] = []
+        self._queued = set()
+        self._seq = itertools.count()
+        self._pending_count = 0
+
+        for item in items:
+            self._pending.setdefault(self._key(item), deque()).append(item)
+            self._pending_count += 1
+        for host in self._pending:
+            self._enqueue(host)
+
+    def add(self, item: Any):
+        """Queue one more item after construction."""
+        host = self._key(item)
+        self._pending.setdefault(host, deque()).append(item)
+        self._pending_count += 1
+        self._enqueue(host)
+
+    @property
+    def pending(self) -> int:
+        return self._pending_count
+
+    def _eligible(self, host: str) -> bool:
+        return bool(self._pending.get(host)) and self._active.get(host, 0) < self.per_host_limit
+
+    def _enqueue(self, host: str):
+        if host in self._queued or not self._eligible(host):
+            return
+        self._queued.add(host)
+        start_at = self._next_start.get(host, 0.0)
+        if start_at <= self._clock():
+            self._ready.append(host)
+        else:
+            heapq.heappush(self._waiting, (start_at, next(self._seq), host))
+
+    def _promote_due(self, now: float):
+        while self._waiting and self._waiting[0][0] <= now:
+            _start_at, _seq, host = heapq.heappop(self._waiting)
+            start_at = self._next_start.get(host, 0.0)
+            if start_at > now:
+                # Pushed back by a throttle after it was queued.
+                heapq.heappush(self._waiting, (start_at, next(self._seq), host))
+                continue
+            self._ready.append(host)
+
+    def pop_ready(self) -> Optional[Any]:
+        """Return the next item allowed to start now, or None."""
+        now = self._clock()
+        self._promote_due(now)
+
+        while self._ready:
+            host = self._ready.popleft()
+            self._queued.discard(host)
+            if not self._eligible(host):
+                continue
+            if self._next_start.get(host, 0.0) > now:
+                self._enqueue(host)
+                continue
+
+            item = self._pending[host].popleft()
+            self._pending_count -= 1
+            self._active[host] = self._active.get(host, 0) + 1
+            self._next_start[host] = now + self.min_interval_sec
+            self._enqueue(host)
+            return item
+        return None
+
+    def release(self, item: Any, *, throttle_sec: float = 0.0):
+        """Mark an item finished; `throttle_sec` pauses its host (e.g. after 429)."""
+        host = self._key(item)
+        self._active[host] = max(0, self._active.get(host, 0) - 1)
+        if throttle_sec > 0:
+            self._next_start[host] = max(self._next_start.get(host, 0.0), self._clock() + throttle_sec)
+        self._enqueue(host)
+
+    def next_delay(self) -> Optional[float]:
+        """Seconds until some queued host may start, or None if all are at their cap."""
+        now = self._clock()
+        self._promote_due(now)
+        if self._ready:
+            return 0.0
+        if self._waiting:
+            return max(0.0, self._waiting[0][0] - now)
+        return None
+
+
+def run_threaded(
+    items: List[Any],
+    work: Callable[[Any], Dict],
+    *,
+    workers: int,
+    on_result: Callable[[Dict], None],
+    per_host_limit: int,
+    per_host_interval_sec: float = 0.0,
+    key: Optional[Callable[[Any], str]] = None,
+):
+    """
+    Run `work(item)` on a thread pool, dispatching through a `HostScheduler`.
+
+    `on_result` runs on the calling thread; a result's `throttle_sec` pauses
+    that item's host.
+    """
+    workers = max(1, workers)
+    scheduler = HostScheduler(items, per_host_limit=per_host_limit, min_interval_sec=per_host_interval_sec, key=key)
+    in_flight: Dict[Any, Any] = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while scheduler.pending or in_flight:
+            while len(in_flight) < workers:
+                item = scheduler.pop_ready()
+                if item is None:
+                    break
+                in_flight[executor.submit(work, item)] = item
+
+            delay = scheduler.next_delay() if scheduler.pending else None
+            if not in_flight:
+                time.sleep(delay or 0.0)
+                continue
+
+            done, _pending = wait(in_flight, timeout=delay, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = in_flight.pop(future)
+                result = future.result()
+                scheduler.release(item, throttle_sec=result.get("throttle_sec", 0.0))
+                on_result(result)
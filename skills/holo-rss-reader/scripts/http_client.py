@@ -84,6 +84,12 @@ def _resolve_encoding(response: requests.Response, raw_bytes: bytes) -> str:
     return response.encoding or _detect_encoding_from_body(raw_bytes) or "utf-8"
 
 
+def decode_body(raw_bytes: bytes, header_encoding: Optional[str]) -> str:
+    """Decode a response body the same way `fetch_text` does."""
+    encoding = header_encoding or _detect_encoding_from_body(raw_bytes) or "utf-8"
+    return _decode_body(raw_bytes, encoding)
+
+
 def _env_has_proxy() -> bool:
     for key in ("http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY", "all_proxy", "ALL_PROXY"):
         if os.environ.get(key):
@@ -183,6 +189,29 @@ def fetch_text(
             sess.close()
 
 
+def post_form(
+    url: str,
+    data: Dict[str, str],
+    *,
+    session: Optional[requests.Session] = None,
+    timeout: Tuple[int, int] = (5, 20),
+    max_bytes: int = 64 * 1024,
+) -> HTTPResult:
+    """POST a urlencoded form (no retries: the request is not idempotent)."""
+    own_session = session is None
+    sess = session or build_session(retries=0)
+    try:
+        response = sess.post(
+            url, data=data, stream=True, timeout=timeout, headers={"User-Agent": DEFAULT_USER_AGENT}
+        )
+        return _read_response(response, max_bytes)
+    except requests.RequestException as exc:
+        return HTTPResult(ok=False, error=f"Network error: {exc}", error_kind="network")
+    finally:
+        if own_session:
+            sess.close()
+
+
 def fetch_json(
     url: str,
     *,
@@ -0,0 +1,30 @@
+"""
+Deferred module loading for the CLI entry point.
+
+`requests`, `feedparser`, `asyncio` and friends take most of the CLI's
+start-up time, yet `today`, `history`, `search` and the other local
+commands never touch them. `lazy_import` binds a module object right away
+and runs the module's code on first attribute access, so a command only
+pays for the modules it actually uses. The bound object is the one in
+`sys.modules`, so later plain imports and test monkeypatches see the same
+module.
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return `name`'s module, loading it on first attribute access."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -4,27 +4,51 @@ Holo RSS Reader CLI
 import argparse
 import importlib
 import os
+import re
+import signal
+import sqlite3
 import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
+import catalog
 import config as config_mod
+import daemon
+import dedupe
 import exit_codes
 import feeds as feeds_mod
-import fetcher
-import gist
-import http_client
 import parser as article_parser
+import polling
+import search_index
 import store
 import url_validator
 import wechat
+from lazy_import import lazy_import
+
+# Network-side modules load on first use, so local commands (today,
+# history, search, lookup, wechat list/remove, ...) start without paying
+# for requests, feedparser and asyncio.
+async_http_client = lazy_import("async_http_client")
+fetcher = lazy_import("fetcher")
+full_article = lazy_import("full_article")
+gist = lazy_import("gist")
+http_client = lazy_import("http_client")
+pipeline = lazy_import("pipeline")
+watch = lazy_import("watch")
+websub = lazy_import("websub")
+
+# Commands that talk to the network and get a shared HTTP session.
+NETWORK_COMMANDS = {"import", "read", "list", "fetch", "watch", "full", "doctor"}
 
 
 DEFAULT_GIST_URL = "https://gist.github.com/emschwartz/e6d2bf860ccc367fe37ff953ba6de66b"
 
+# `watch` writes state.json and dedupe.idx back at most this often.
+WATCH_CHECKPOINT_SEC = 60
+
 
 def _network_options(cfg: Dict, overrides: Optional[Dict] = None) -> Dict:
     options = {
@@ -58,19 +82,16 @@ def cmd_import_gist(gist_url: str, limit: int, cfg: Dict, session) -> int:
     print()
 
     net_opts = _network_options(cfg)
+    # An explicit import always revalidates the list (one 304 when unchanged).
     feeds, error_kind, error_message = gist.import_gist_opml_detailed(
-        gist_url,
-        session=session,
-        connect_timeout_sec=net_opts["connect_timeout_sec"],
-        read_timeout_sec=net_opts["read_timeout_sec"],
-        max_bytes=net_opts["max_bytes"],
-        retries=net_opts["retries"],
-        **_security_options(cfg),
+        gist_url, **_gist_options(cfg, net_opts, session, ttl_min=0)
     )
 
-    if error_message:
+    if error_message and not feeds:
         _print_actionable_error("Import failed", error_message)
         return exit_codes.from_error_kind(error_kind or "network")
+    if error_message:
+        print(f"⚠️  {error_message}")
 
     if not feeds:
         print("❌ No feeds found in Gist")
@@ -93,6 +114,7 @@ def cmd_import_gist(gist_url: str, limit: int, cfg: Dict, session) -> int:
             read_timeout_sec=net_opts["read_timeout_sec"],
             max_bytes=net_opts["max_bytes"],
             retries=net_opts["retries"],
+            limit=limit,
             **_security_options(cfg),
         )
 
@@ -129,6 +151,7 @@ def cmd_read_feed(url: str, limit: int, cfg: Dict, session) -> int:
         read_timeout_sec=net_opts["read_timeout_sec"],
         max_bytes=net_opts["max_bytes"],
         retries=net_opts["retries"],
+        limit=limit,
         **_security_options(cfg),
     )
 
@@ -158,19 +181,13 @@ def cmd_list_feeds(gist_url: str, cfg: Dict, session) -> int:
     print()
 
     net_opts = _network_options(cfg)
-    feeds, error_kind, error_message = gist.import_gist_opml_detailed(
-        gist_url,
-        session=session,
-        connect_timeout_sec=net_opts["connect_timeout_sec"],
-        read_timeout_sec=net_opts["read_timeout_sec"],
-        max_bytes=net_opts["max_bytes"],
-        retries=net_opts["retries"],
-        **_security_options(cfg),
-    )
+    feeds, error_kind, error_message = gist.import_gist_opml_detailed(gist_url, **_gist_options(cfg, net_opts, session))
 
-    if error_message:
+    if error_message and not feeds:
         _print_actionable_error("List failed", error_message)
         return exit_codes.from_error_kind(error_kind or "network")
+    if error_message:
+        print(f"⚠️  {error_message}")
 
     if not feeds:
         print("❌ No feeds found")
@@ -188,6 +205,64 @@ def cmd_list_feeds(gist_url: str, cfg: Dict, session) -> int:
     return exit_codes.OK
 
 
+def _politeness(
+    cfg: Dict, per_host_limit: Optional[int] = None, per_host_interval_ms: Optional[int] = None
+) -> Dict[str, float]:
+    fetch_cfg = cfg["fetch"]
+    return {
+        "per_host_limit": per_host_limit if per_host_limit is not None else fetch_cfg.get("per_host_limit", 4),
+        "per_host_interval_sec": (
+            per_host_interval_ms if per_host_interval_ms is not None else fetch_cfg.get("per_host_interval_ms", 200)
+        ) / 1000.0,
+    }
+
+
+def _gist_options(cfg: Dict, net_opts: Dict, session, ttl_min: Optional[int] = None) -> Dict:
+    """Import options for the subscription list, cached for `subscriptions.ttl_min` unless overridden."""
+    if ttl_min is None:
+        ttl_min = cfg.get("subscriptions", {}).get("ttl_min", 60)
+    return {
+        "session": session,
+        "connect_timeout_sec": net_opts["connect_timeout_sec"],
+        "read_timeout_sec": net_opts["read_timeout_sec"],
+        "max_bytes": net_opts["max_bytes"],
+        "retries": net_opts["retries"],
+        "cache_dir": store.get_subscriptions_cache_dir(),
+        "ttl_sec": ttl_min * 60,
+        **_security_options(cfg),
+    }
+
+
+def _load_dedupe_index(cfg: Dict) -> Optional["dedupe.DedupeIndex"]:
+    """The cross-feed dedupe index for a run, or None when `dedupe.enabled` is off."""
+    dedupe_cfg = cfg.get("dedupe", {})
+    if not dedupe_cfg.get("enabled", True):
+        return None
+    return dedupe.DedupeIndex.open(
+        store.get_dedupe_index_path(),
+        window_days=dedupe_cfg.get("window_days", 7),
+        max_distance=dedupe_cfg.get("max_distance", 6),
+    )
+
+
+def _print_feed_result(result: Dict, prefix: str = "  "):
+    """Progress line(s) for one polled feed, shared by `fetch` and `watch`."""
+    duplicates = f" ({result['dup_count']} 篇与其他源重复)" if result.get("dup_count") else ""
+    if result["status"] == "error":
+        print(f"{prefix}📡 {result['title']}... ❌ {result['error']}")
+        if result.get("quarantined_until"):
+            until = result["quarantined_until"].astimezone().strftime("%Y-%m-%d %H:%M")
+            print(f"{prefix}   🚧 quarantined until {until}")
+    elif result["status"] == "not_modified":
+        print(f"{prefix}📡 {result['title']}... 🧊 304 Not Modified")
+    elif result["status"] == "unchanged":
+        print(f"{prefix}📡 {result['title']}... 🧊 unchanged (same content)")
+    elif result["new_count"] > 0:
+        print(f"{prefix}📡 {result['title']}... ✅ {result['new_count']} 篇新文章{duplicates}")
+    else:
+        print(f"{prefix}📡 {result['title']}... ⏭️  无新文章 ({result['skip_count']} 篇已读){duplicates}")
+
+
 def cmd_fetch(
     gist_url: str,
     limit: int,
@@ -198,10 +273,50 @@ def cmd_fetch(
     connect_timeout: Optional[int] = None,
     read_timeout: Optional[int] = None,
     max_feed_bytes: Optional[int] = None,
+    engine: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    per_host_limit: Optional[int] = None,
+    per_host_interval_ms: Optional[int] = None,
+    force: bool = False,
+    parse_processes: Optional[int] = None,
+    prefetch_full: bool = False,
+    prefetch_filter: Optional[List[str]] = None,
+    no_dedupe: bool = False,
 ) -> int:
     """
     Fetch new articles from all feeds and save daily digest.
+
+    `engine` selects the thread-pool ("threads") or asyncio ("async") fetch
+    engine; both share the same per-feed pipeline and metrics. Both dispatch
+    feeds through a per-host scheduler (`per_host_limit` concurrent requests
+    and `per_host_interval_ms` spacing per host).
+
+    Feeds whose adaptive next-due time has not arrived, and feeds quarantined
+    by the failure breaker, are skipped unless `force` is set. Feeds whose
+    quarantine has expired are fetched once as a cheap probe (no retries,
+    short timeouts).
+
+    Feed bodies are parsed in a process pool of `parse_processes` workers
+    (0 = one per core for large runs, 1 = inline) so parsing scales past the
+    GIL while threads or the event loop keep downloading.
+
+    With `prefetch_full`, new article links from feeds matching
+    `prefetch_filter` (tags, title or URL) are fetched and saved as full
+    articles on a background stage that shares the session, parse pool and
+    per-host limits, so the run ends with a fully cached digest.
+
+    New articles that another feed already delivered within
+    `dedupe.window_days` (same canonical URL, or the same title with a
+    near-identical summary) are left out of the digest and the prefetch
+    queue unless `no_dedupe` is set.
     """
+    fetch_cfg = cfg["fetch"]
+    engine = engine or fetch_cfg.get("engine", "threads")
+    if concurrency is None:
+        concurrency = fetch_cfg.get("async_concurrency", 256)
+    if parse_processes is None:
+        parse_processes = fetch_cfg.get("parse_processes", 0)
+    politeness = _politeness(cfg, per_host_limit, per_host_interval_ms)
     net_opts = _network_options(
         cfg,
         {
@@ -218,21 +333,20 @@ def cmd_fetch(
         command_session = http_client.build_session(retries=net_opts["retries"])
         own_session = True
 
+    if engine == "async" and async_http_client.proxy_configured():
+        print("⚠️  async engine does not support HTTP proxies, falling back to threads")
+        engine = "threads"
+
     try:
-        print(f"📥 Fetching new articles (workers={workers})...")
+        if engine == "async":
+            print(f"📥 Fetching new articles (engine=async, concurrency={concurrency})...")
+        else:
+            print(f"📥 Fetching new articles (workers={workers})...")
         print("   Sources: Gist OPML + local feeds.json")
         print()
 
         all_feeds, gist_error_kind, gist_error_message = feeds_mod.collect_all_feeds_detailed(
-            gist_url,
-            gist_options={
-                "session": command_session,
-                "connect_timeout_sec": net_opts["connect_timeout_sec"],
-                "read_timeout_sec": net_opts["read_timeout_sec"],
-                "max_bytes": net_opts["max_bytes"],
-                "retries": net_opts["retries"],
-                **_security_options(cfg),
-            },
+            gist_url, gist_options=_gist_options(cfg, net_opts, command_session)
         )
 
         if gist_error_message:
@@ -253,172 +367,181 @@ def cmd_fetch(
             _print_actionable_error("Storage error", str(exc))
             return exit_codes.STORAGE_ERROR
 
-        state_lock = threading.Lock()
-        results_lock = threading.Lock()
+        schedule = polling.schedule_settings(cfg)
+        breaker = polling.breaker_settings(cfg)
+        due_feeds = []
+        probe_urls = set()
+        total_not_due = 0
+        total_quarantined = 0
+        for feed_info in all_feeds:
+            if force:
+                due_feeds.append(feed_info)
+                continue
+            breaker_state = store.feed_breaker_state(state, feed_info["url"]) if breaker else "closed"
+            if breaker_state == "open":
+                total_quarantined += 1
+            elif breaker_state == "half_open":
+                probe_urls.add(feed_info["url"])
+                due_feeds.append(feed_info)
+            elif schedule and not store.is_feed_due(state, feed_info["url"]):
+                total_not_due += 1
+            else:
+                due_feeds.append(feed_info)
+        if total_not_due:
+            print(f"   ⏳ {total_not_due} feeds not due yet (use --force to fetch all)")
+        if total_quarantined:
+            print(f"   🚧 {total_quarantined} feeds quarantined after repeated failures (see: feeds health)")
+        if probe_urls:
+            print(f"   🩺 probing {len(probe_urls)} feeds whose quarantine has expired")
+        if total_not_due or total_quarantined or probe_urls:
+            print()
+
+        run = pipeline.FetchRun(
+            state=state,
+            limit=limit,
+            net_opts=net_opts,
+            security_opts=_security_options(cfg),
+            schedule=schedule,
+            breaker=breaker,
+            probe_urls=probe_urls,
+        )
+        # Loaded before the probe session, parse pool and prefetcher start, so
+        # this early return leaves nothing running.
+        if not no_dedupe:
+            try:
+                run.dedupe_index = _load_dedupe_index(cfg)
+            except OSError as exc:
+                _print_actionable_error("Storage error", f"dedupe index: {exc}")
+                return exit_codes.STORAGE_ERROR
+
+        if probe_urls and engine != "async":
+            run.probe_session = http_client.build_session(retries=0)
+        parse_pool_size = pipeline.parse_pool_size(parse_processes, len(due_feeds))
+        run.parse_pool = pipeline.start_parse_pool(parse_pool_size)
+        if run.parse_pool is not None:
+            print(f"   🧮 Parsing feeds in {parse_pool_size} processes")
+            print()
 
         today = datetime.now().strftime("%Y-%m-%d")
-        articles_by_feed = {}
+
+        prefetcher = None
+        prefetch_feeds = set()
+        prefetch_counts = None
+        if prefetch_full:
+            terms = prefetch_filter or []
+            prefetch_feeds = {f["url"] for f in due_feeds if feeds_mod.matches_filter(f, terms)}
+            batch = _full_batch(today, cfg, None)
+            batch.extract_pool = run.parse_pool
+            prefetcher = full_article.Prefetcher(batch, session=command_session, workers=workers, **politeness)
+            prefetcher.start()
+            print(f"   📄 Prefetching full articles from {len(prefetch_feeds)} feeds")
+            print()
 
         total_new = 0
         total_skipped = 0
+        total_duplicates = 0
         total_304 = 0
+        total_unchanged = 0
         total_errors = 0
 
         start_ts = time.perf_counter()
 
-        def process_feed(feed_info):
-            feed_title = feed_info["title"]
-            feed_url = feed_info["url"]
-            custom_headers = feed_info.get("headers") or {}
-
-            with state_lock:
-                conditional_headers = store.get_feed_conditional_headers(state, feed_url)
-
-            merged_headers = {**custom_headers, **conditional_headers}
-
-            feed, error, meta = fetcher.fetch_feed_detailed(
-                feed_url,
-                session=command_session,
-                connect_timeout_sec=net_opts["connect_timeout_sec"],
-                read_timeout_sec=net_opts["read_timeout_sec"],
-                max_bytes=net_opts["max_bytes"],
-                retries=net_opts["retries"],
-                conditional_headers=merged_headers,
-                **_security_options(cfg),
-            )
-
-            if error:
-                with state_lock:
-                    store.update_feed_fetch_meta(
-                        state,
-                        feed_url,
-                        status="error",
-                        etag=meta.etag or None,
-                        last_modified=meta.last_modified or None,
-                        is_error=True,
-                    )
-                return {
-                    "title": feed_title,
-                    "status": "error",
-                    "error": error,
-                    "error_kind": meta.error_kind or "network",
-                }
-
-            if meta.status_code == 304:
-                with state_lock:
-                    store.update_feed_fetch_meta(
-                        state,
-                        feed_url,
-                        status="not_modified",
-                        etag=meta.etag or None,
-                        last_modified=meta.last_modified or None,
-                        is_error=False,
-                    )
-                return {
-                    "title": feed_title,
-                    "status": "not_modified",
-                    "new_count": 0,
-                    "skip_count": 0,
-                }
-
-            articles = article_parser.parse_articles(feed.entries, limit=limit)
-
-            with state_lock:
-                seen = store.get_seen_urls(state, feed_url)
-
-            new_articles = [a for a in articles if a.get("link") and a["link"] not in seen]
-
-            with state_lock:
-                store.update_feed_fetch_meta(
-                    state,
-                    feed_url,
-                    status="ok",
-                    etag=meta.etag or None,
-                    last_modified=meta.last_modified or None,
-                    is_error=False,
-                )
-                if new_articles:
-                    store.mark_seen(state, feed_url, [a["link"] for a in new_articles if a.get("link")])
-
-            if new_articles:
-                with results_lock:
-                    articles_by_feed[feed_title] = {
-                        "feed_url": feed_url,
-                        "articles": new_articles,
-                    }
-                return {
-                    "title": feed_title,
-                    "status": "ok",
-                    "new_count": len(new_articles),
-                    "skip_count": 0,
-                }
-
-            return {
-                "title": feed_title,
-                "status": "ok",
-                "new_count": 0,
-                "skip_count": len(articles),
-            }
-
         completed = 0
         checkpoint_interval = 20
 
+        def on_result(result):
+            nonlocal completed, total_new, total_skipped, total_duplicates, total_304, total_unchanged, total_errors
+            completed += 1
+            total_duplicates += result.get("dup_count", 0)
+            _print_feed_result(result)
+
+            if result["status"] == "error":
+                total_errors += 1
+            elif result["status"] == "not_modified":
+                total_304 += 1
+            elif result["status"] == "unchanged":
+                total_unchanged += 1
+            elif result["new_count"] > 0:
+                total_new += result["new_count"]
+                if prefetcher is not None and result.get("feed_url") in prefetch_feeds:
+                    prefetcher.submit(result["title"], result.get("articles", []))
+            else:
+                total_skipped += result["skip_count"]
+
+            if completed % checkpoint_interval == 0:
+                with run.state_lock:
+                    store.checkpoint_state(state)
+
         try:
-            with ThreadPoolExecutor(max_workers=workers) as executor:
-                futures = [executor.submit(process_feed, feed_info) for feed_info in all_feeds]
-
-                for future in as_completed(futures):
-                    result = future.result()
-                    completed += 1
-
-                    if result["status"] == "error":
-                        total_errors += 1
-                        print(f"  📡 {result['title']}... ❌ {result['error']}")
-                    elif result["status"] == "not_modified":
-                        total_304 += 1
-                        print(f"  📡 {result['title']}... 🧊 304 Not Modified")
-                    elif result["new_count"] > 0:
-                        total_new += result["new_count"]
-                        print(f"  📡 {result['title']}... ✅ {result['new_count']} 篇新文章")
-                    else:
-                        total_skipped += result["skip_count"]
-                        print(f"  📡 {result['title']}... ⏭️  无新文章 ({result['skip_count']} 篇已读)")
-
-                    if completed % checkpoint_interval == 0:
-                        with state_lock:
-                            store.save_state(state)
+            if engine == "async":
+                pipeline.run_async(
+                    run,
+                    due_feeds,
+                    concurrency=concurrency,
+                    on_result=on_result,
+                    **politeness,
+                )
+            else:
+                pipeline.run_threaded(
+                    run,
+                    due_feeds,
+                    workers=workers,
+                    session=command_session,
+                    on_result=on_result,
+                    **politeness,
+                )
         except OSError as exc:
             _print_actionable_error("Storage error", str(exc))
             return exit_codes.STORAGE_ERROR
+        finally:
+            if prefetcher is not None:
+                try:
+                    prefetch_counts = prefetcher.close()
+                except (OSError, sqlite3.Error) as exc:
+                    _print_actionable_error("Storage error", f"full-article prefetch: {exc}")
+            if run.probe_session is not None:
+                run.probe_session.close()
+            if run.parse_pool is not None:
+                run.parse_pool.shutdown(cancel_futures=True)
 
         elapsed = time.perf_counter() - start_ts
 
         try:
             store.save_state(state)
-            if articles_by_feed:
-                digest_path = store.save_digest(today, articles_by_feed)
+            if run.dedupe_index is not None:
+                run.dedupe_index.save(store.get_dedupe_index_path())
+            if run.articles_by_feed:
+                digest_path = store.save_digest(today, run.articles_by_feed)
                 print()
                 print(f"✅ 日报已保存: {digest_path}")
             else:
                 print()
                 print("ℹ️  今日无新文章")
-        except OSError as exc:
+        except (OSError, sqlite3.Error) as exc:
             _print_actionable_error("Storage error", str(exc))
             return exit_codes.STORAGE_ERROR
 
-        success_feeds = len(all_feeds) - total_errors
-        success_ratio = (success_feeds / len(all_feeds) * 100) if all_feeds else 0.0
-        error_ratio = (total_errors / len(all_feeds) * 100) if all_feeds else 0.0
+        fetched_feeds = len(due_feeds)
+        success_feeds = fetched_feeds - total_errors
+        success_ratio = (success_feeds / fetched_feeds * 100) if fetched_feeds else 0.0
+        error_ratio = (total_errors / fetched_feeds * 100) if fetched_feeds else 0.0
 
         print(
-            f"📊 metrics: feeds_total={len(all_feeds)} new={total_new} "
-            f"not_modified={total_304} skipped={total_skipped} errors={total_errors} "
+            f"📊 metrics: feeds_total={len(all_feeds)} new={total_new} duplicates={total_duplicates} "
+            f"not_modified={total_304} unchanged={total_unchanged} skipped={total_skipped} "
+            f"not_due={total_not_due} quarantined={total_quarantined} errors={total_errors} "
             f"elapsed_sec={elapsed:.2f}"
         )
         print(
-            f"📈 feed_success={success_feeds}/{len(all_feeds)} ({success_ratio:.1f}%) | "
-            f"feed_error={total_errors}/{len(all_feeds)} ({error_ratio:.1f}%)"
+            f"📈 feed_success={success_feeds}/{fetched_feeds} ({success_ratio:.1f}%) | "
+            f"feed_error={total_errors}/{fetched_feeds} ({error_ratio:.1f}%)"
         )
+        if prefetch_counts is not None:
+            print(
+                f"📄 prefetch: queued={prefetch_counts['queued']} saved={prefetch_counts['saved']} "
+                f"fallback={prefetch_counts['fallback']} cached={prefetch_counts['cached']} "
+                f"failed={prefetch_counts['failed']}"
+            )
 
         return exit_codes.OK
     finally:
@@ -426,6 +549,243 @@ def cmd_fetch(
             command_session.close()
 
 
+def _start_websub(
+    websub_cfg: Dict, net_opts: Dict, security_opts: Dict, session, deliver: Callable[[str, str], None]
+) -> Tuple["websub.Subscriber", "websub.CallbackServer"]:
+    """Start the WebSub callback endpoint on a background thread."""
+    host, port = websub_cfg["listen_host"], websub_cfg["listen_port"]
+    subscriber = websub.Subscriber(
+        websub_cfg["callback_url"],
+        deliver=deliver,
+        session=session,
+        lease_sec=websub_cfg["lease_hours"] * 3600,
+        timeout=http_client.make_timeout(net_opts["connect_timeout_sec"], net_opts["read_timeout_sec"]),
+        max_push_bytes=net_opts["max_bytes"],
+        security_opts=security_opts,
+    )
+    server = websub.CallbackServer((host, port), subscriber)
+    if not subscriber.callback_url:
+        subscriber.callback_url = f"http://{host}:{server.server_port}/websub"
+    threading.Thread(target=server.serve_forever, name="websub-callback", daemon=True).start()
+    return subscriber, server
+
+
+def cmd_watch(
+    gist_url: str,
+    limit: int,
+    workers: int,
+    cfg: Dict,
+    session,
+    *,
+    spread_min: float = 5.0,
+    refresh_min: float = 60.0,
+    duration_min: Optional[float] = None,
+    no_dedupe: bool = False,
+    no_websub: bool = False,
+) -> int:
+    """
+    Poll feeds continuously instead of in one cron burst.
+
+    Every feed is fetched when its adaptive next-due time (or quarantine
+    end) arrives, through the same per-feed pipeline, per-host limits and
+    breaker as `fetch`, on at most `workers` threads. Feeds already due at
+    start-up are staggered over `spread_min` minutes. New articles are
+    appended to the day's digest as each feed reports them. The feed list
+    is re-collected every `refresh_min` minutes. Runs until interrupted,
+    or for `duration_min` minutes.
+
+    With `websub.enabled`, feeds that advertise a WebSub hub are subscribed
+    to and stop being polled while the hub's lease lasts; what the hub
+    pushes goes through the same parse, dedupe and digest path.
+    """
+    net_opts = _network_options(cfg)
+    politeness = _politeness(cfg)
+    gist_options = _gist_options(cfg, net_opts, session)
+
+    print(f"👀 Watching feeds (workers={workers}, spread={spread_min:g} min)... Ctrl+C to stop")
+    print("   Sources: Gist OPML + local feeds.json")
+    print()
+
+    all_feeds, gist_error_kind, gist_error_message = feeds_mod.collect_all_feeds_detailed(
+        gist_url, gist_options=gist_options
+    )
+    if gist_error_message:
+        print(f"⚠️  Gist source unavailable: {gist_error_message}")
+    if not all_feeds:
+        print("❌ No feeds found")
+        if gist_error_kind:
+            return exit_codes.from_error_kind(gist_error_kind)
+        return exit_codes.PARSE_ERROR
+
+    try:
+        state = store.load_state()
+        dedupe_index = None if no_dedupe else _load_dedupe_index(cfg)
+    except OSError as exc:
+        _print_actionable_error("Storage error", str(exc))
+        return exit_codes.STORAGE_ERROR
+
+    schedule = polling.schedule_settings(cfg)
+    run = pipeline.FetchRun(
+        state=state,
+        limit=limit,
+        net_opts=net_opts,
+        security_opts=_security_options(cfg),
+        schedule=schedule,
+        breaker=polling.breaker_settings(cfg),
+        dedupe_index=dedupe_index,
+    )
+    run.probe_session = http_client.build_session(retries=0)
+
+    totals = {"new": 0, "duplicates": 0, "errors": 0}
+    storage_errors: List[str] = []
+
+    def on_result(result):
+        pushed = "⚡ " if result.get("pushed") else ""
+        _print_feed_result(result, prefix=f"  {datetime.now():%H:%M:%S} {pushed}")
+        totals["duplicates"] += result.get("dup_count", 0)
+        if result["status"] == "error":
+            totals["errors"] += 1
+        if result["status"] != "ok" or not result["new_count"]:
+            return
+        totals["new"] += result["new_count"]
+        with run.results_lock:
+            run.articles_by_feed.pop(result["title"], None)
+        try:
+            store.save_digest(
+                datetime.now().strftime("%Y-%m-%d"),
+                {result["title"]: {"feed_url": result["feed_url"], "articles": result["articles"]}},
+            )
+        except (OSError, sqlite3.Error) as exc:
+            storage_errors.append(str(exc))
+            watcher.stop()
+
+    subscriber = callback_server = None
+    websub_cfg = cfg.get("websub", {})
+    if websub_cfg.get("enabled") and not no_websub:
+        try:
+            subscriber, callback_server = _start_websub(
+                websub_cfg,
+                net_opts,
+                _security_options(cfg),
+                session,
+                lambda feed_url, text: watcher.deliver(feed_url, text),
+            )
+            print(f"   WebSub callback: {subscriber.callback_url}")
+        except OSError as exc:
+            print(f"⚠️  WebSub callback unavailable, polling every feed: {exc}")
+
+    watcher = watch.Watcher(
+        run,
+        workers=workers,
+        session=session,
+        on_result=on_result,
+        retry_interval_sec=schedule["min_interval_sec"] if schedule else 15 * 60,
+        push_until=subscriber.push_until if subscriber is not None else None,
+        **politeness,
+    )
+    watcher.set_feeds(all_feeds, spread_sec=spread_min * 60)
+    print(f"   Found {len(all_feeds)} feeds total")
+    print()
+
+    watched_urls = [feed["url"] for feed in all_feeds]
+
+    def track_hubs():
+        """Subscribe to every watched feed whose last poll advertised a hub."""
+        with run.state_lock:
+            hubs = {feed_url: store.get_feed_hub(state, feed_url) for feed_url in watched_urls}
+        for feed_url, hub in hubs.items():
+            if hub is not None:
+                subscriber.track(feed_url, *hub)
+
+    start_ts = time.time()
+    marks = {
+        "checkpoint": start_ts,
+        "refresh": start_ts,
+        "polls": 0,
+        "hub_polls": -1,
+        "day": datetime.now().strftime("%Y-%m-%d"),
+    }
+
+    def between_steps():
+        now = time.time()
+        if subscriber is not None:
+            if watcher.polls != marks["hub_polls"]:
+                marks["hub_polls"] = watcher.polls
+                track_hubs()
+            # Also renews leases of feeds that are only pushed, never polled.
+            subscriber.maintain()
+        try:
+            if now - marks["checkpoint"] >= WATCH_CHECKPOINT_SEC and watcher.polls != marks["polls"]:
+                with run.state_lock:
+                    store.checkpoint_state(state)
+                if run.dedupe_index is not None:
+                    run.dedupe_index.save(store.get_dedupe_index_path())
+                marks["checkpoint"], marks["polls"] = now, watcher.polls
+            day = datetime.now().strftime("%Y-%m-%d")
+            if day != marks["day"] and run.dedupe_index is not None:
+                # The index dates new records with the day it was loaded on.
+                run.dedupe_index.save(store.get_dedupe_index_path())
+                run.dedupe_index = _load_dedupe_index(cfg)
+            marks["day"] = day
+        except (OSError, sqlite3.Error) as exc:
+            storage_errors.append(str(exc))
+            watcher.stop()
+        if now - marks["refresh"] >= refresh_min * 60:
+            marks["refresh"] = now
+            feeds, _kind, message = feeds_mod.collect_all_feeds_detailed(gist_url, gist_options=gist_options)
+            if message:
+                print(f"⚠️  Gist source unavailable: {message}")
+            if feeds:
+                watcher.set_feeds(feeds, spread_sec=spread_min * 60)
+                current = {feed["url"] for feed in feeds}
+                if subscriber is not None:
+                    for feed_url in set(watched_urls) - current:
+                        subscriber.forget(feed_url)
+                watched_urls[:] = list(current)
+
+    def stop_watching(_signum, _frame):
+        watcher.stop()
+
+    timer = threading.Timer(duration_min * 60, watcher.stop) if duration_min is not None else None
+    previous_handlers = {sig: signal.signal(sig, stop_watching) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        if timer is not None:
+            timer.daemon = True
+            timer.start()
+        watcher.run_until_stopped(between_steps=between_steps)
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+        if timer is not None:
+            timer.cancel()
+        watcher.close()
+        run.probe_session.close()
+        if callback_server is not None:
+            callback_server.shutdown()
+            callback_server.server_close()
+
+    try:
+        store.save_state(state)
+        if run.dedupe_index is not None:
+            run.dedupe_index.save(store.get_dedupe_index_path())
+    except (OSError, sqlite3.Error) as exc:
+        storage_errors.append(str(exc))
+    if storage_errors:
+        _print_actionable_error("Storage error", storage_errors[0])
+        return exit_codes.STORAGE_ERROR
+
+    lags = sorted(watcher.start_lags)
+    lag_p50 = lags[len(lags) // 2] if lags else 0.0
+    lag_max = lags[-1] if lags else 0.0
+    print()
+    print(
+        f"📊 watch: polls={watcher.polls} new={totals['new']} duplicates={totals['duplicates']} "
+        f"errors={totals['errors']} pushed={watcher.pushes} peak_in_flight={watcher.peak_in_flight} "
+        f"lag_p50_sec={lag_p50:.2f} lag_max_sec={lag_max:.2f} elapsed_sec={time.time() - start_ts:.1f}"
+    )
+    return exit_codes.OK
+
+
 def cmd_today() -> int:
     """Show today's digest."""
     content = store.read_digest()
@@ -438,8 +798,25 @@ def cmd_today() -> int:
     return exit_codes.OK
 
 
-def cmd_history(date_str: str) -> int:
-    """Show digest for a specific date."""
+def _is_date(value: str) -> bool:
+    return re.fullmatch(r"\d{4}-\d{2}-\d{2}", value) is not None
+
+
+def cmd_history(target: str) -> int:
+    """Show the digest for a date, or for the newest day listing an article URL."""
+    date_str = target
+    if not _is_date(target):
+        try:
+            entry = store.lookup_article(target)
+        except (OSError, sqlite3.Error) as exc:
+            _print_actionable_error("Storage error", str(exc))
+            return exit_codes.STORAGE_ERROR
+        date_str = catalog.latest_day(entry) if entry else None
+        if not date_str:
+            print(f"ℹ️  没有找到收录该文章的日报: {target}")
+            return exit_codes.OK
+        print(f"📍 {entry.get('title') or target} — 收录于 {', '.join(entry['days'])}\n")
+
     content = store.read_digest(date_str)
     if content:
         print(content)
@@ -449,21 +826,79 @@ def cmd_history(date_str: str) -> int:
     return exit_codes.OK
 
 
-def _lookup_feed_content(article_url: str, date_str: str):
-    """Look up cached article content from digest.json.
+def cmd_search(
+    query: str,
+    *,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    feed: Optional[str] = None,
+    limit: int = 20,
+) -> int:
+    """Full-text search over digests and cached full articles."""
+    for value in (since, until):
+        if value and not _is_date(value):
+            _print_actionable_error("Invalid date", f"{value} (expected YYYY-MM-DD)")
+            return exit_codes.PARAM_ERROR
 
-    Returns (content, feed_title, article_title) or (None, None, None).
-    """
-    digest_data = store.load_digest_data(date_str)
-    for feed_title, feed_data in digest_data.items():
-        for article in feed_data.get("articles", []):
-            if article.get("link") == article_url:
-                raw_content = article.get("content", "")
-                if raw_content:
-                    content = article_parser.strip_html(raw_content)
-                    title = article.get("title", store.slugify(article_url))
-                    return content, feed_title, title
-    return None, None, None
+    start_ts = time.perf_counter()
+    try:
+        results = store.search_articles(query, since=since, until=until, feed=feed, limit=limit)
+        full_paths = [store.find_full_article(result["url"]) for result in results]
+    except search_index.SearchUnavailable as exc:
+        _print_actionable_error("Search unavailable", str(exc))
+        return exit_codes.STORAGE_ERROR
+    except (OSError, sqlite3.Error) as exc:
+        _print_actionable_error("Storage error", str(exc))
+        return exit_codes.STORAGE_ERROR
+    elapsed_ms = (time.perf_counter() - start_ts) * 1000
+
+    if not results:
+        print(f"ℹ️  没有找到匹配「{query}」的文章。")
+        return exit_codes.OK
+
+    print(f"🔎 「{query}」: {len(results)} 条结果 ({elapsed_ms:.1f} ms)\n")
+    for i, (result, full_path) in enumerate(zip(results, full_paths), 1):
+        print(f"{i}. **{result['title'] or result['url']}**")
+        print(f"   📅 {result['date']} | {result['feed']} | 🔗 {result['url']}")
+        if result["snippet"]:
+            print(f"   > {result['snippet']}")
+        if full_path:
+            print(f"   📄 {full_path}")
+        print()
+    return exit_codes.OK
+
+
+def cmd_lookup(article_url: str) -> int:
+    """Show where an article is stored: digest days, feed and cached full text."""
+    try:
+        entry = store.lookup_article(article_url)
+        full_path = store.find_full_article(article_url)
+    except (OSError, sqlite3.Error) as exc:
+        _print_actionable_error("Storage error", str(exc))
+        return exit_codes.STORAGE_ERROR
+    if not entry and not full_path:
+        print(f"ℹ️  本地没有该文章的记录: {article_url}")
+        return exit_codes.OK
+
+    entry = entry or {}
+    print(f"📰 {entry.get('title') or article_url}")
+    if entry.get("feed"):
+        print(f"   来源: {entry['feed']}" + (f" ({entry['feed_url']})" if entry.get("feed_url") else ""))
+    print(f"   链接: {entry.get('url') or article_url}")
+    for date_str, offset in (entry.get("days") or {}).items():
+        print(f"   日报: {date_str}  {store.get_rss_dir() / date_str / 'digest.ndjson'} @ {offset}")
+    print(f"   全文: {full_path}" if full_path else "   全文: 未缓存")
+    return exit_codes.OK
+
+
+def _full_batch(date_str: str, cfg: Dict, max_article_bytes: Optional[int]) -> "full_article.FullBatch":
+    net = cfg["network"]
+    return full_article.FullBatch(
+        date_str=date_str,
+        net=net,
+        max_bytes=max_article_bytes if max_article_bytes is not None else net["max_article_bytes"],
+        security_opts=_security_options(cfg),
+    )
 
 
 def cmd_full(
@@ -479,82 +914,103 @@ def cmd_full(
         _print_actionable_error("Invalid article URL", validation_error)
         return exit_codes.PARAM_ERROR
 
-    try:
-        from bs4 import BeautifulSoup
-
-        has_bs4 = True
-    except ImportError:
-        has_bs4 = False
-
-    if not date_str:
-        date_str = datetime.now().strftime("%Y-%m-%d")
-
-    cached = store.lookup_full_article(article_url, date_str=date_str)
+    # Without --date, a copy cached on any day counts.
+    cached = store.find_full_article(article_url, date_str=date_str)
     if cached:
         print(f"✅ 全文已缓存: {cached}")
         return exit_codes.OK
 
-    print(f"📄 抓取全文: {article_url}")
+    if not date_str:
+        date_str = datetime.now().strftime("%Y-%m-%d")
 
-    net = cfg["network"]
-    max_bytes = max_article_bytes if max_article_bytes is not None else net["max_article_bytes"]
+    print(f"📄 抓取全文: {article_url}")
+    result = full_article.fetch_and_save(_full_batch(date_str, cfg, max_article_bytes), {"url": article_url}, session)
 
-    result = http_client.fetch_text(
-        article_url,
-        session=session,
-        timeout=http_client.make_timeout(net["connect_timeout_sec"], net["read_timeout_sec"]),
-        max_bytes=max_bytes,
-        headers={"Accept": "text/html,application/xhtml+xml"},
-    )
-
-    content = None
-    feed_title = "unknown"
-    article_title = store.slugify(article_url)
-
-    if result.ok:
-        if has_bs4:
-            soup = BeautifulSoup(result.text, "lxml")
-            title_tag = soup.find("title")
-            if title_tag:
-                article_title = title_tag.get_text(strip=True)
-
-            main = soup.find("article") or soup.find("main") or soup.find("body")
-            if main:
-                for tag in main.find_all(["script", "style", "nav", "header", "footer", "aside"]):
-                    tag.decompose()
-                content = main.get_text(separator="\n\n", strip=True)
-            else:
-                content = soup.get_text(separator="\n\n", strip=True)
+    if result["status"] == "fallback":
+        print("   ℹ️  直接抓取失败，使用 feed 缓存的全文")
+    if result["status"] == "failed":
+        if result["error_kind"] == "storage":
+            _print_actionable_error("Storage error", result["error"])
         else:
-            import re
+            _print_actionable_error("Fetch failed", result["error"])
+        return exit_codes.from_error_kind(result["error_kind"])
 
-            content = re.sub(r"<[^>]+>", "", result.text)
-            content = re.sub(r"\s+", "\n", content).strip()
-    else:
-        # Fallback: look up content:encoded cached in digest.json
-        fallback_content, fallback_feed, fallback_title = _lookup_feed_content(article_url, date_str)
-        if fallback_content:
-            content = fallback_content
-            feed_title = fallback_feed
-            article_title = fallback_title
-            print("   ℹ️  直接抓取失败，使用 feed 缓存的全文")
-        else:
-            _print_actionable_error("Fetch failed", result.error or "Unknown error")
-            return exit_codes.from_error_kind(result.error_kind or "network")
+    print(f"✅ 全文已保存: {result['path']}")
+    return exit_codes.OK
 
-    article_info = {
-        "title": article_title,
-        "link": article_url,
-        "published": date_str,
-    }
 
+def cmd_full_batch(
+    items: List[Dict[str, str]],
+    date_str: Optional[str],
+    cfg: Dict,
+    session,
+    *,
+    max_article_bytes: Optional[int] = None,
+    workers: Optional[int] = None,
+    per_host_limit: Optional[int] = None,
+    extract_processes: Optional[int] = None,
+) -> int:
+    """
+    Fetch full articles for many URLs (`full --from-digest` / `--urls-file`).
+
+    Articles are fetched concurrently under the same per-host limits as
+    `fetch`, extracted in a process pool for larger batches, and the
+    full-article index is committed once at the end.
+    """
+    if not date_str:
+        date_str = datetime.now().strftime("%Y-%m-%d")
+    if not items:
+        print("ℹ️  没有需要抓取全文的文章。")
+        return exit_codes.OK
+
+    fetch_cfg = cfg["fetch"]
+    workers = max(1, workers if workers is not None else fetch_cfg["workers"])
+    batch = _full_batch(date_str, cfg, max_article_bytes)
+    processes = full_article.extract_pool_size(
+        extract_processes if extract_processes is not None else fetch_cfg["parse_processes"], len(items)
+    )
+
+    counts = {"saved": 0, "fallback": 0, "cached": 0, "failed": 0}
+    error_kinds: Dict[str, str] = {}
+    icons = {"saved": "✅", "fallback": "📰", "cached": "💾"}
+
+    def on_result(result: Dict) -> None:
+        counts[result["status"]] += 1
+        if result["status"] == "failed":
+            error_kinds[result["url"]] = result["error_kind"]
+            print(f"  ❌ {result['url']}: {result['error']}")
+        else:
+            print(f"  {icons[result['status']]} {result['path']}")
+
+    print(f"📄 Fetching {len(items)} full articles (workers={workers})...")
+    started = time.monotonic()
+    batch.extract_pool = pipeline.start_parse_pool(processes)
+    if batch.extract_pool is not None:
+        print(f"🧮 Extracting articles in {processes} processes")
     try:
-        path = store.save_full_article(date_str, feed_title, article_info, content)
-    except OSError as exc:
+        full_article.run_batch(
+            batch,
+            items,
+            session=session,
+            workers=workers,
+            on_result=on_result,
+            per_host_limit=per_host_limit if per_host_limit is not None else fetch_cfg["per_host_limit"],
+            per_host_interval_sec=fetch_cfg["per_host_interval_ms"] / 1000.0,
+        )
+    except (OSError, sqlite3.Error) as exc:
         _print_actionable_error("Storage error", str(exc))
         return exit_codes.STORAGE_ERROR
+    finally:
+        if batch.extract_pool is not None:
+            batch.extract_pool.shutdown()
 
-    print(f"✅ 全文已保存: {path}")
+    print(
+        f"📊 full: total={len(items)} saved={counts['saved']} fallback={counts['fallback']} "
+        f"cached={counts['cached']} failed={counts['failed']} elapsed_sec={time.monotonic() - started:.2f}"
+    )
+    if len(error_kinds) == len(items):
+        # Nothing succeeded: report the first listed article's error.
+        return exit_codes.from_error_kind(error_kinds[items[0]["url"]])
     return exit_codes.OK
 
 
@@ -727,6 +1183,182 @@ def cmd_wechat_remove(identifier: str) -> int:
     return exit_codes.OK
 
 
+def cmd_feeds_health(show_all: bool = False) -> int:
+    """Report failing and quarantined feeds from state.json (local only)."""
+    try:
+        state = store.load_state()
+    except OSError as exc:
+        _print_actionable_error("Storage error", str(exc))
+        return exit_codes.STORAGE_ERROR
+
+    titles = {f.get("url"): f.get("title") for f in feeds_mod.load_local_feeds()}
+    counts = {"closed": 0, "open": 0, "half_open": 0}
+    failing = []
+    for feed_url, feed_state in sorted(state.get("feeds", {}).items()):
+        breaker_state = store.feed_breaker_state(state, feed_url)
+        counts[breaker_state] += 1
+        failures = int(feed_state.get("consecutive_failures", 0))
+        if show_all or failures or breaker_state != "closed":
+            failing.append((feed_url, feed_state, breaker_state, failures))
+
+    print(
+        f"🩺 Feed health: tracked={sum(counts.values())} healthy={counts['closed']} "
+        f"quarantined={counts['open']} probe_pending={counts['half_open']}"
+    )
+    if not failing:
+        print("✅ No failing feeds")
+        return exit_codes.OK
+
+    labels = {"closed": "✅ ok", "open": "🚧 quarantined", "half_open": "🩺 probe pending"}
+    print()
+    for feed_url, feed_state, breaker_state, failures in failing:
+        if breaker_state == "closed" and failures:
+            label = "⚠️  failing"
+        else:
+            label = labels[breaker_state]
+        print(f"{label}  {titles.get(feed_url) or feed_url}")
+        print(f"   🔗 {feed_url}")
+        print(
+            f"   failures={failures} last_status={feed_state.get('last_status', 'never')} "
+            f"last_fetch={feed_state.get('last_fetch') or '-'}"
+        )
+        if feed_state.get("quarantine_until"):
+            print(f"   quarantine_until={feed_state['quarantine_until']}")
+    return exit_codes.OK
+
+
+def cmd_storage_migrate() -> int:
+    """Move state.json, its journal and full_index.json into state.db (one-shot)."""
+    try:
+        counts = store.migrate_to_sqlite()
+    except FileExistsError as exc:
+        _print_actionable_error("Storage error", f"{exc} already exists; storage is already on SQLite")
+        return exit_codes.STORAGE_ERROR
+    except (OSError, sqlite3.Error) as exc:
+        _print_actionable_error("Storage error", str(exc))
+        return exit_codes.STORAGE_ERROR
+
+    print(f"✅ Migrated {counts['feeds']} feeds and {counts['articles']} indexed articles to {store.get_state_db_path()}")
+    print("   Old JSON files were kept as *.migrated")
+    return exit_codes.OK
+
+
+def cmd_storage_reindex() -> int:
+    """Rebuild the article catalog and search index from every day's digest and the full-article index."""
+    try:
+        counts = store.rebuild_catalog()
+        print(f"✅ Catalog rebuilt: {counts['articles']} articles from {counts['days']} days")
+        if not search_index.fts5_available():
+            print("⚠️  SQLite FTS5 is not available; search index skipped")
+            return exit_codes.OK
+        search_counts = store.rebuild_search_index()
+    except (OSError, sqlite3.Error) as exc:
+        _print_actionable_error("Storage error", str(exc))
+        return exit_codes.STORAGE_ERROR
+
+    print(f"✅ Search index rebuilt: {search_counts['documents']} documents")
+    return exit_codes.OK
+
+
+def cmd_gc() -> int:
+    """Drop full-article index entries whose cached files were deleted."""
+    try:
+        result = store.gc_full_index()
+    except (OSError, sqlite3.Error) as exc:
+        _print_actionable_error("Storage error", str(exc))
+        return exit_codes.STORAGE_ERROR
+
+    print(f"🧹 Full-article index: checked={result['checked']} removed={result['removed']}")
+    return exit_codes.OK
+
+
+def _stop_serving(_signum, _frame):
+    raise KeyboardInterrupt
+
+
+def _serve_handler(session) -> Callable[[List[str], Optional[str]], int]:
+    """
+    Run one forwarded command line against the daemon's shared session.
+
+    Calls run concurrently except `daemon.EXCLUSIVE_COMMANDS`, which write
+    feed state or shared indexes. Config stays loaded until its file changes.
+    """
+    parser_cli = build_parser()
+    exclusive = threading.Lock()
+    configs: Dict[Path, Tuple[Optional[int], Dict]] = {}
+
+    def load_config(path: Path) -> Dict:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        cached = configs.get(path)
+        if cached is not None and mtime is not None and cached[0] == mtime:
+            return cached[1]
+        cfg = config_mod.load_config(str(path))
+        configs[path] = (mtime, cfg)
+        return cfg
+
+    def handle(argv: List[str], cwd: Optional[str] = None) -> int:
+        args = parser_cli.parse_args(argv)
+        if args.command not in daemon.SERVED_COMMANDS:
+            _print_actionable_error("Param error", f"'{args.command}' is not served by the daemon")
+            return exit_codes.PARAM_ERROR
+        # The daemon's working directory is shared; paths are the client's.
+        base = Path(cwd or os.getcwd())
+        for name in ("config", "urls_file"):
+            if getattr(args, name, None):
+                setattr(args, name, str(base / Path(getattr(args, name)).expanduser()))
+        try:
+            cfg = load_config(config_mod.resolve_config_path(args.config))
+        except OSError as exc:
+            _print_actionable_error("Storage error", f"Cannot load config: {exc}")
+            return exit_codes.STORAGE_ERROR
+        if args.command in daemon.EXCLUSIVE_COMMANDS:
+            with exclusive:
+                return _dispatch(parser_cli, args, cfg, session)
+        return _dispatch(parser_cli, args, cfg, session)
+
+    return handle
+
+
+def cmd_serve(cfg: Dict) -> int:
+    """
+    Keep one process with a warm HTTP session and loaded modules, and run
+    `daemon.SERVED_COMMANDS` for CLI calls arriving on the Unix socket
+    until interrupted. Config, the feed list (feeds.json and cached
+    subscription lists), the dedupe index, catalog and full-index shards and
+    rendered digests stay in memory and are reloaded when their files
+    change, so edits and commands run outside the daemon show up without a
+    restart. `state.json` is still read once per fetch.
+    """
+    if not daemon.supported():
+        _print_actionable_error("Serve unavailable", "this platform has no Unix domain sockets")
+        return exit_codes.PARAM_ERROR
+
+    socket_path = store.get_serve_socket_path()
+    session = http_client.build_session(retries=cfg["network"]["retries"])
+    try:
+        server = daemon.Server(socket_path, _serve_handler(session))
+    except OSError as exc:
+        session.close()
+        _print_actionable_error("Storage error", f"Cannot listen on {socket_path}: {exc}")
+        return exit_codes.STORAGE_ERROR
+
+    signal.signal(signal.SIGTERM, _stop_serving)
+    print(f"🛰️  Serving {', '.join(sorted(daemon.SERVED_COMMANDS))} on {socket_path}", flush=True)
+    print("   Other rss.sh calls now run here; Ctrl+C to stop.", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        session.close()
+    print("👋 Daemon stopped")
+    return exit_codes.OK
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser_cli = argparse.ArgumentParser(description="Holo RSS Reader - CLI for reading RSS/Atom feeds")
     parser_cli.add_argument(
@@ -756,19 +1388,143 @@ def build_parser() -> argparse.ArgumentParser:
     fetch_parser.add_argument("--connect-timeout", type=int, default=None, help="Connect timeout seconds")
     fetch_parser.add_argument("--read-timeout", type=int, default=None, help="Read timeout seconds")
     fetch_parser.add_argument("--max-feed-bytes", type=int, default=None, help="Max bytes per feed response")
+    fetch_parser.add_argument(
+        "--engine",
+        choices=config_mod.FETCH_ENGINES,
+        default=None,
+        help="Fetch engine: thread pool or asyncio (default: config fetch.engine)",
+    )
+    fetch_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Max in-flight requests for the async engine",
+    )
+    fetch_parser.add_argument("--per-host-limit", type=int, default=None, help="Max concurrent requests per host")
+    fetch_parser.add_argument(
+        "--per-host-interval-ms",
+        type=int,
+        default=None,
+        help="Min spacing between request starts to one host",
+    )
+    fetch_parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=None,
+        help="Feed parsing processes (0 = auto, 1 = parse inline)",
+    )
+    fetch_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Fetch every feed, ignoring the adaptive polling schedule and quarantine",
+    )
+    fetch_parser.add_argument(
+        "--prefetch-full",
+        action="store_true",
+        help="Also fetch and save full text of new articles while feeds are fetched",
+    )
+    fetch_parser.add_argument(
+        "--prefetch-filter",
+        action="append",
+        default=None,
+        metavar="TAG_OR_FEED",
+        help="With --prefetch-full: only feeds with this tag, or whose title/URL contains it (repeatable)",
+    )
+    fetch_parser.add_argument(
+        "--no-dedupe",
+        action="store_true",
+        help="Keep articles that other feeds already delivered recently",
+    )
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Poll each feed when it comes due and append new articles to the digest as they arrive"
+    )
+    watch_parser.add_argument("--gist", "-g", default=DEFAULT_GIST_URL, help="Gist URL")
+    watch_parser.add_argument("--limit", "-l", type=int, default=10, help="Max articles per feed")
+    watch_parser.add_argument("--workers", "-w", type=int, default=None, help="Concurrent workers")
+    watch_parser.add_argument(
+        "--spread-min",
+        type=float,
+        default=5.0,
+        help="Stagger feeds already due at start-up over this many minutes (default: 5)",
+    )
+    watch_parser.add_argument(
+        "--refresh-min",
+        type=float,
+        default=60.0,
+        help="Re-read the Gist and feeds.json this often (default: 60)",
+    )
+    watch_parser.add_argument("--duration-min", type=float, default=None, help="Stop after this many minutes")
+    watch_parser.add_argument(
+        "--no-dedupe",
+        action="store_true",
+        help="Keep articles that other feeds already delivered recently",
+    )
+    watch_parser.add_argument(
+        "--no-websub",
+        action="store_true",
+        help="Poll every feed even when websub.enabled is set",
+    )
 
     subparsers.add_parser("today", help="Show today's digest")
 
     history_parser = subparsers.add_parser("history", help="Show digest for a specific date")
-    history_parser.add_argument("date", help="Date in YYYY-MM-DD format")
+    history_parser.add_argument("date", help="Date in YYYY-MM-DD format, or an article URL")
+
+    search_parser = subparsers.add_parser("search", help="Full-text search over digests and cached full articles")
+    search_parser.add_argument("query", nargs="+", help="Words to search for (all must match; word* for a prefix)")
+    search_parser.add_argument("--since", default=None, help="Earliest date, YYYY-MM-DD")
+    search_parser.add_argument("--until", default=None, help="Latest date, YYYY-MM-DD")
+    search_parser.add_argument("--feed", default=None, help="Only feeds whose title contains this")
+    search_parser.add_argument("--limit", "-l", type=int, default=20, help="Max results")
+
+    lookup_parser = subparsers.add_parser("lookup", help="Show where an article is stored locally")
+    lookup_parser.add_argument("url", help="Article URL")
 
     full_parser = subparsers.add_parser("full", help="Fetch and save full article content")
-    full_parser.add_argument("url", help="Article URL")
-    full_parser.add_argument("--date", "-d", default=None, help="Date folder (default: today)")
+    full_parser.add_argument("url", nargs="?", default=None, help="Article URL")
+    full_parser.add_argument(
+        "--date",
+        "-d",
+        default=None,
+        help="Date folder (default: today; a copy cached on any day is reused)",
+    )
     full_parser.add_argument("--max-article-bytes", type=int, default=None, help="Max bytes for full article")
+    full_parser.add_argument(
+        "--from-digest",
+        metavar="YYYY-MM-DD",
+        default=None,
+        help="Fetch every article listed in that day's digest",
+    )
+    full_parser.add_argument("--urls-file", default=None, help="Fetch every URL in a file (one per line)")
+    full_parser.add_argument("--workers", "-w", type=int, default=None, help="Concurrent article fetches (batch)")
+    full_parser.add_argument("--per-host-limit", type=int, default=None, help="Max concurrent requests per host")
+    full_parser.add_argument(
+        "--extract-processes",
+        type=int,
+        default=None,
+        help="Article extraction processes (0 = auto, 1 = inline)",
+    )
 
     subparsers.add_parser("doctor", help="Run environment and connectivity diagnostics")
 
+    subparsers.add_parser("gc", help="Remove stale full-article index entries")
+
+    subparsers.add_parser(
+        "serve",
+        help="Run a daemon that answers read/fetch/today/history/full/search calls over a Unix socket",
+    )
+
+    feeds_parser = subparsers.add_parser("feeds", help="Inspect feed state")
+    feeds_sub = feeds_parser.add_subparsers(dest="feeds_command", help="Feed commands")
+    feeds_health = feeds_sub.add_parser("health", help="List failing and quarantined feeds")
+    feeds_health.add_argument("--all", action="store_true", help="Include healthy feeds")
+
+    storage_parser = subparsers.add_parser("storage", help="Manage the storage backend")
+    storage_sub = storage_parser.add_subparsers(dest="storage_command", help="Storage commands")
+    storage_sub.add_parser("migrate", help="Migrate JSON state and full-article index to SQLite")
+    storage_sub.add_parser("reindex", help="Rebuild the article catalog and search index from all stored data")
+
     wechat_parser = subparsers.add_parser("wechat", help="Manage WeChat public account feeds")
     wechat_sub = wechat_parser.add_subparsers(dest="wechat_command", help="WeChat commands")
 
@@ -786,63 +1542,167 @@ def build_parser() -> argparse.ArgumentParser:
     return parser_cli
 
 
+def _dispatch_full(parser_cli: argparse.ArgumentParser, args: argparse.Namespace, cfg: Dict, session) -> int:
+    modes = [mode for mode in (args.url, args.from_digest, args.urls_file) if mode]
+    if len(modes) != 1:
+        parser_cli.parse_args(["full", "--help"])
+        return exit_codes.PARAM_ERROR
+    if args.url:
+        return cmd_full(args.url, args.date, cfg, session, max_article_bytes=args.max_article_bytes)
+
+    try:
+        if args.from_digest:
+            items, date_str = full_article.digest_links(args.from_digest), args.from_digest
+        else:
+            items, date_str = full_article.read_urls_file(args.urls_file), args.date
+    except OSError as exc:
+        _print_actionable_error("Storage error", str(exc))
+        return exit_codes.STORAGE_ERROR
+    return cmd_full_batch(
+        items,
+        date_str,
+        cfg,
+        session,
+        max_article_bytes=args.max_article_bytes,
+        workers=args.workers,
+        per_host_limit=args.per_host_limit,
+        extract_processes=args.extract_processes,
+    )
+
+
+def _uses_network(args: argparse.Namespace) -> bool:
+    if args.command == "wechat":
+        return args.wechat_command == "add"
+    return args.command in NETWORK_COMMANDS
+
+
+def _dispatch(parser_cli: argparse.ArgumentParser, args: argparse.Namespace, cfg: Dict, session) -> int:
+    if args.command == "import":
+        return cmd_import_gist(args.gist, args.limit, cfg, session)
+    if args.command == "read":
+        return cmd_read_feed(args.url, args.limit, cfg, session)
+    if args.command == "list":
+        return cmd_list_feeds(args.gist, cfg, session)
+    if args.command == "fetch":
+        workers = max(1, args.workers if args.workers is not None else cfg["fetch"]["workers"])
+        return cmd_fetch(
+            args.gist,
+            args.limit,
+            workers,
+            cfg,
+            session,
+            retries=args.retries,
+            connect_timeout=args.connect_timeout,
+            read_timeout=args.read_timeout,
+            max_feed_bytes=args.max_feed_bytes,
+            engine=args.engine,
+            concurrency=args.concurrency,
+            per_host_limit=args.per_host_limit,
+            per_host_interval_ms=args.per_host_interval_ms,
+            force=args.force,
+            parse_processes=args.parse_processes,
+            prefetch_full=args.prefetch_full,
+            prefetch_filter=args.prefetch_filter,
+            no_dedupe=args.no_dedupe,
+        )
+    if args.command == "watch":
+        return cmd_watch(
+            args.gist,
+            args.limit,
+            max(1, args.workers if args.workers is not None else cfg["fetch"]["workers"]),
+            cfg,
+            session,
+            spread_min=max(0.0, args.spread_min),
+            refresh_min=max(1.0, args.refresh_min),
+            duration_min=args.duration_min,
+            no_dedupe=args.no_dedupe,
+            no_websub=args.no_websub,
+        )
+    if args.command == "today":
+        return cmd_today()
+    if args.command == "history":
+        return cmd_history(args.date)
+    if args.command == "search":
+        return cmd_search(
+            " ".join(args.query), since=args.since, until=args.until, feed=args.feed, limit=args.limit
+        )
+    if args.command == "lookup":
+        return cmd_lookup(args.url)
+    if args.command == "full":
+        return _dispatch_full(parser_cli, args, cfg, session)
+    if args.command == "doctor":
+        return cmd_doctor(cfg, session)
+    if args.command == "gc":
+        return cmd_gc()
+    if args.command == "feeds":
+        if args.feeds_command == "health":
+            return cmd_feeds_health(show_all=args.all)
+        parser_cli.parse_args(["feeds", "--help"])
+        return exit_codes.PARAM_ERROR
+    if args.command == "storage":
+        if args.storage_command == "migrate":
+            return cmd_storage_migrate()
+        if args.storage_command == "reindex":
+            return cmd_storage_reindex()
+        parser_cli.parse_args(["storage", "--help"])
+        return exit_codes.PARAM_ERROR
+    if args.command == "wechat":
+        if args.wechat_command == "add":
+            return cmd_wechat_add(
+                args.account_id, args.title, args.base_url, args.token, cfg, session
+            )
+        if args.wechat_command == "list":
+            return cmd_wechat_list()
+        if args.wechat_command == "remove":
+            return cmd_wechat_remove(args.identifier)
+        parser_cli.parse_args(["wechat", "--help"])
+        return exit_codes.PARAM_ERROR
+
+    parser_cli.print_help()
+    return exit_codes.PARAM_ERROR
+
+
+def _forward_to_daemon(argv: List[str]) -> Optional[int]:
+    """Run the command in a listening `serve` daemon; None if there is none."""
+    try:
+        response = daemon.call(store.get_serve_socket_path(), argv)
+    except daemon.DaemonError as exc:
+        _print_actionable_error("Daemon error", str(exc))
+        return exit_codes.STORAGE_ERROR
+    if response is None:
+        return None
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return response["code"]
+
+
 def main() -> int:
     parser_cli = build_parser()
     args = parser_cli.parse_args()
 
+    if args.command in daemon.SERVED_COMMANDS and not os.environ.get("RSS_NO_DAEMON"):
+        code = _forward_to_daemon(sys.argv[1:])
+        if code is not None:
+            return code
+
     try:
         cfg = config_mod.load_config(args.config)
     except OSError as exc:
         _print_actionable_error("Storage error", f"Cannot load config: {exc}")
         return exit_codes.STORAGE_ERROR
 
-    retries = cfg["network"]["retries"]
-    session = http_client.build_session(retries=retries)
+    if args.command == "serve":
+        return cmd_serve(cfg)
 
-    try:
-        if args.command == "import":
-            return cmd_import_gist(args.gist, args.limit, cfg, session)
-        if args.command == "read":
-            return cmd_read_feed(args.url, args.limit, cfg, session)
-        if args.command == "list":
-            return cmd_list_feeds(args.gist, cfg, session)
-        if args.command == "fetch":
-            workers = args.workers if args.workers is not None else cfg["fetch"]["workers"]
-            return cmd_fetch(
-                args.gist,
-                args.limit,
-                workers,
-                cfg,
-                session,
-                retries=args.retries,
-                connect_timeout=args.connect_timeout,
-                read_timeout=args.read_timeout,
-                max_feed_bytes=args.max_feed_bytes,
-            )
-        if args.command == "today":
-            return cmd_today()
-        if args.command == "history":
-            return cmd_history(args.date)
-        if args.command == "full":
-            return cmd_full(args.url, args.date, cfg, session, max_article_bytes=args.max_article_bytes)
-        if args.command == "doctor":
-            return cmd_doctor(cfg, session)
-        if args.command == "wechat":
-            if args.wechat_command == "add":
-                return cmd_wechat_add(
-                    args.account_id, args.title, args.base_url, args.token, cfg, session
-                )
-            if args.wechat_command == "list":
-                return cmd_wechat_list()
-            if args.wechat_command == "remove":
-                return cmd_wechat_remove(args.identifier)
-            parser_cli.parse_args(["wechat", "--help"])
-            return exit_codes.PARAM_ERROR
+    session = None
+    if _uses_network(args):
+        session = http_client.build_session(retries=cfg["network"]["retries"])
 
-        parser_cli.print_help()
-        return exit_codes.PARAM_ERROR
+    try:
+        return _dispatch(parser_cli, args, cfg, session)
     finally:
-        session.close()
+        if session is not None:
+            session.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,463 @@
+"""
+Per-feed fetch pipeline shared by the threaded and asyncio fetch engines.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import dedupe
+import fetcher
+import host_scheduler
+import parser as article_parser
+import polling
+import store
+import websub
+from lazy_import import lazy_import
+
+# Loaded by the asyncio engine only; the threaded engine and `watch` never need it.
+asyncio = lazy_import("asyncio")
+
+
+# With `fetch.parse_processes` = 0 (auto), runs below this many feeds parse
+# inline; pool start-up would cost more than it saves.
+PARSE_POOL_MIN_FEEDS = 64
+
+
+@dataclass
+class FetchRun:
+    """Mutable state shared by every feed processed in one `fetch` run."""
+
+    state: Dict
+    limit: int
+    net_opts: Dict
+    security_opts: Dict
+    schedule: Optional[Dict[str, int]] = None
+    breaker: Optional[Dict[str, int]] = None
+    probe_urls: Set[str] = field(default_factory=set)
+    probe_session: Any = None
+    parse_pool: Optional[ProcessPoolExecutor] = None
+    # Cross-feed near-duplicate filter; None keeps every new link.
+    dedupe_index: Optional[dedupe.DedupeIndex] = None
+    articles_by_feed: Dict[str, Dict] = field(default_factory=dict)
+    state_lock: threading.Lock = field(default_factory=threading.Lock)
+    results_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def fetch_options(self, conditional_headers: Dict[str, str], *, probe: bool = False) -> Dict[str, Any]:
+        options = {
+            "connect_timeout_sec": self.net_opts["connect_timeout_sec"],
+            "read_timeout_sec": self.net_opts["read_timeout_sec"],
+            "max_bytes": self.net_opts["max_bytes"],
+            "retries": self.net_opts["retries"],
+            "conditional_headers": conditional_headers,
+            **self.security_opts,
+        }
+        if probe:
+            options["retries"] = 0
+            options["connect_timeout_sec"] = min(options["connect_timeout_sec"], polling.PROBE_CONNECT_TIMEOUT_SEC)
+            options["read_timeout_sec"] = min(options["read_timeout_sec"], polling.PROBE_READ_TIMEOUT_SEC)
+        return options
+
+
+def request_headers(run: FetchRun, feed_info: Dict) -> Dict[str, str]:
+    """Merge per-feed custom headers with persisted conditional headers."""
+    custom_headers = feed_info.get("headers") or {}
+    with run.state_lock:
+        conditional_headers = store.get_feed_conditional_headers(run.state, feed_info["url"])
+    return {**custom_headers, **conditional_headers}
+
+
+def parse_pool_size(setting: int, feed_count: int) -> int:
+    """
+    Resolve `fetch.parse_processes` into a worker count; <= 1 means parse inline.
+
+    0 (auto) uses one process per core, but only for runs large enough to
+    benefit.
+    """
+    if setting > 0:
+        return setting
+    if feed_count < PARSE_POOL_MIN_FEEDS:
+        return 1
+    return os.cpu_count() or 1
+
+
+def start_parse_pool(processes: int) -> Optional[ProcessPoolExecutor]:
+    """Start the parse-stage process pool, or return None to parse inline."""
+    if processes <= 1:
+        return None
+    # Fetch worker threads are already running when the pool forks, so avoid
+    # plain fork where a safer start method exists.
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=processes, mp_context=context)
+
+
+def parse_feed_body(text: str, limit: int, seen_links: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """
+    Parse a downloaded feed body into compact, picklable results.
+
+    Runs inside parse-pool worker processes, so it returns extracted articles
+    and the publisher's refresh hint and WebSub hub rather than the
+    feedparser tree.
+    """
+    feed, error = fetcher.parse_feed_text(text, limit=limit, seen_links=seen_links)
+    if error:
+        return {"error": error}
+    return {
+        "articles": article_parser.parse_articles(feed.entries, limit=limit),
+        "complete": getattr(feed, "complete", True),
+        "hint_sec": polling.hint_seconds(getattr(feed, "feed", None)),
+        "hub": websub.discover(getattr(feed, "feed", None)),
+    }
+
+
+def _dedupe_context(run: FetchRun, feed_info: Dict) -> Tuple[Set[str], str]:
+    """
+    Return the feed's already-delivered links (the streaming reader stops on
+    them) and the digest of the last parsed body.
+    """
+    with run.state_lock:
+        seen_links = store.get_seen_urls(run.state, feed_info["url"])
+        body_digest = store.get_feed_digests(run.state, feed_info["url"])["body_digest"]
+    return seen_links, body_digest
+
+
+def _schedule_next_fetch(run: FetchRun, feed_url: str, new_count: int, hint_sec: Optional[int]):
+    """Record the feed's next-due time; the caller holds `run.state_lock`."""
+    if not run.schedule:
+        return
+    store.schedule_next_fetch(run.state, feed_url, new_count=new_count, hint_sec=hint_sec, **run.schedule)
+
+
+def apply_fetch_outcome(run: FetchRun, feed_info: Dict, feed: Any, error: Optional[str], meta: Any) -> Dict:
+    """
+    Update state and collected articles from one fetch outcome.
+
+    Returns a result dict consumed by the `fetch` progress/metrics reporter.
+    """
+    if error or meta.status_code == 304 or getattr(meta, "unchanged", False):
+        return _apply_outcome(run, feed_info, None, None, error, meta)
+
+    articles = article_parser.parse_articles(feed.entries, limit=run.limit)
+    hint_sec = polling.hint_seconds(getattr(feed, "feed", None), getattr(meta, "max_age", None))
+    hub = websub.discover(getattr(feed, "feed", None))
+    return _apply_outcome(
+        run, feed_info, articles, hint_sec, None, meta, hub=hub, complete=getattr(feed, "complete", True)
+    )
+
+
+def apply_parsed_outcome(
+    run: FetchRun,
+    feed_info: Dict,
+    parsed: Optional[Dict[str, Any]],
+    error: Optional[str],
+    meta: Any,
+) -> Dict:
+    """Like `apply_fetch_outcome`, for results produced by `parse_feed_body`."""
+    if error or parsed is None:
+        return _apply_outcome(run, feed_info, None, None, error, meta)
+    if parsed.get("error"):
+        meta.error_kind = "parse"
+        return _apply_outcome(run, feed_info, None, None, parsed["error"], meta)
+
+    hint_sec = max(parsed["hint_sec"], getattr(meta, "max_age", None) or 0)
+    return _apply_outcome(
+        run, feed_info, parsed["articles"], hint_sec, None, meta, hub=parsed.get("hub"),
+        complete=parsed.get("complete", True),
+    )
+
+
+def _apply_outcome(
+    run: FetchRun,
+    feed_info: Dict,
+    articles: Optional[List[Dict]],
+    hint_sec: Optional[int],
+    error: Optional[str],
+    meta: Any,
+    *,
+    hub: Optional[Tuple[str, str]] = None,
+    complete: bool = True,
+) -> Dict:
+    feed_title = feed_info["title"]
+    feed_url = feed_info["url"]
+
+    if error:
+        quarantined_until = None
+        with run.state_lock:
+            store.update_feed_fetch_meta(
+                run.state,
+                feed_url,
+                status="error",
+                etag=meta.etag or None,
+                last_modified=meta.last_modified or None,
+                is_error=True,
+            )
+            if run.breaker:
+                quarantined_until = store.trip_feed_breaker(run.state, feed_url, **run.breaker)
+        return {
+            "title": feed_title,
+            "status": "error",
+            "error": error,
+            "error_kind": meta.error_kind or "network",
+            "quarantined_until": quarantined_until,
+            "throttle_sec": host_scheduler.throttle_delay(
+                meta.status_code,
+                getattr(meta, "retry_after", None),
+            ),
+        }
+
+    if meta.status_code == 304:
+        return _record_unchanged(run, feed_info, meta, "not_modified")
+    if getattr(meta, "unchanged", False):
+        return _record_unchanged(run, feed_info, meta, "unchanged")
+
+    # The hub is fed to a POST later; one that fails the security checks is not kept.
+    if hub is not None and not websub.validate_hub(*hub, **run.security_opts):
+        with run.state_lock:
+            store.update_feed_hub(run.state, feed_url, *hub)
+
+    # Only a full entry list can show the entries did not change: a list the
+    # streaming reader cut short (at `limit`, or after a run of seen links)
+    # is the same prefix on every quiet run.
+    links_digest = None
+    if complete:
+        links_digest = fetcher.content_digest("\n".join(a.get("link", "") for a in articles))
+        with run.state_lock:
+            previous_links_digest = store.get_feed_digests(run.state, feed_url)["links_digest"]
+            if links_digest == previous_links_digest:
+                # Body changed (timestamps, rotating tokens) but the entries did not.
+                store.update_feed_digests(run.state, feed_url, body_digest=getattr(meta, "body_digest", None) or None)
+        if links_digest == previous_links_digest:
+            return _record_unchanged(run, feed_info, meta, "unchanged")
+
+    with run.state_lock:
+        seen = store.get_seen_urls(run.state, feed_url)
+
+    unseen = [a for a in articles if a.get("link") and a["link"] not in seen]
+
+    # Copies of stories another feed already delivered are kept out of the
+    # digest but still marked seen for this feed: the dedupe index forgets
+    # them after its window, and unmarked links would break the reader's
+    # run of seen links on every fetch.
+    new_articles, dup_count = unseen, 0
+    if run.dedupe_index is not None and unseen:
+        new_articles, dup_count = run.dedupe_index.filter(unseen, feed_url)
+
+    with run.state_lock:
+        store.update_feed_fetch_meta(
+            run.state,
+            feed_url,
+            status="ok",
+            etag=meta.etag or None,
+            last_modified=meta.last_modified or None,
+            is_error=False,
+        )
+        store.update_feed_digests(
+            run.state,
+            feed_url,
+            body_digest=getattr(meta, "body_digest", None) or None,
+            links_digest=links_digest,
+        )
+        if unseen:
+            store.mark_seen(run.state, feed_url, [a["link"] for a in unseen])
+        _schedule_next_fetch(run, feed_url, len(new_articles), hint_sec)
+
+    if new_articles:
+        with run.results_lock:
+            run.articles_by_feed[feed_title] = {
+                "feed_url": feed_url,
+                "articles": new_articles,
+            }
+        return {
+            "title": feed_title,
+            "status": "ok",
+            "new_count": len(new_articles),
+            "skip_count": 0,
+            "dup_count": dup_count,
+            "feed_url": feed_url,
+            "articles": new_articles,
+        }
+
+    return {
+        "title": feed_title,
+        "status": "ok",
+        "new_count": 0,
+        "skip_count": len(articles) - dup_count,
+        "dup_count": dup_count,
+    }
+
+
+def _record_unchanged(run: FetchRun, feed_info: Dict, meta: Any, status: str) -> Dict:
+    """Record a 304 or an unchanged body without parsing or deduplicating."""
+    with run.state_lock:
+        store.update_feed_fetch_meta(
+            run.state,
+            feed_info["url"],
+            status=status,
+            etag=meta.etag or None,
+            last_modified=meta.last_modified or None,
+            is_error=False,
+        )
+        # No fresh feed-level hints were parsed; keep the last known ones.
+        _schedule_next_fetch(run, feed_info["url"], 0, getattr(meta, "max_age", None))
+    return {
+        "title": feed_info["title"],
+        "status": status,
+        "new_count": 0,
+        "skip_count": 0,
+    }
+
+
+def process_feed(run: FetchRun, feed_info: Dict, session) -> Dict:
+    """
+    Fetch and process one feed on the calling thread.
+
+    With a parse pool the thread only downloads; parsing happens in a worker
+    process while this thread waits without holding the GIL.
+    """
+    probe = feed_info["url"] in run.probe_urls
+    options = run.fetch_options(request_headers(run, feed_info), probe=probe)
+    session = run.probe_session if probe and run.probe_session is not None else session
+    seen_links, previous_digest = _dedupe_context(run, feed_info)
+
+    if run.parse_pool is None:
+        feed, error, meta = fetcher.fetch_feed_detailed(
+            feed_info["url"],
+            session=session,
+            limit=run.limit,
+            seen_links=seen_links,
+            previous_digest=previous_digest,
+            **options,
+        )
+        return apply_fetch_outcome(run, feed_info, feed, error, meta)
+
+    text, error, meta = fetcher.download_feed_detailed(
+        feed_info["url"], session=session, previous_digest=previous_digest, **options
+    )
+    parsed = None
+    if text is not None:
+        parsed = run.parse_pool.submit(parse_feed_body, text, run.limit, seen_links).result()
+    return apply_parsed_outcome(run, feed_info, parsed, error, meta)
+
+
+def apply_pushed_content(run: FetchRun, feed_info: Dict, text: str) -> Dict:
+    """
+    Process a feed body a WebSub hub pushed, like a polled 200 response.
+
+    A body that does not parse is reported but, unlike a failed poll, does
+    not count towards the feed's breaker.
+    """
+    with run.state_lock:
+        seen_links = store.get_seen_urls(run.state, feed_info["url"])
+    feed, error = fetcher.parse_feed_text(text, limit=run.limit, seen_links=seen_links)
+    if error:
+        return {"title": feed_info["title"], "status": "error", "error": error, "error_kind": "parse"}
+    return apply_fetch_outcome(run, feed_info, feed, None, fetcher.FeedFetchMeta(status_code=200))
+
+
+async def process_feed_async(run: FetchRun, feed_info: Dict) -> Dict:
+    """Fetch and process one feed on the running event loop."""
+    options = run.fetch_options(request_headers(run, feed_info), probe=feed_info["url"] in run.probe_urls)
+    seen_links, previous_digest = _dedupe_context(run, feed_info)
+
+    if run.parse_pool is None:
+        feed, error, meta = await fetcher.fetch_feed_detailed_async(
+            feed_info["url"],
+            limit=run.limit,
+            seen_links=seen_links,
+            previous_digest=previous_digest,
+            **options,
+        )
+        return apply_fetch_outcome(run, feed_info, feed, error, meta)
+
+    text, error, meta = await fetcher.download_feed_detailed_async(
+        feed_info["url"], previous_digest=previous_digest, **options
+    )
+    parsed = None
+    if text is not None:
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(run.parse_pool, parse_feed_body, text, run.limit, seen_links)
+    return apply_parsed_outcome(run, feed_info, parsed, error, meta)
+
+
+def run_threaded(
+    run: FetchRun,
+    feeds: List[Dict],
+    *,
+    workers: int,
+    session,
+    on_result: Callable[[Dict], None],
+    per_host_limit: int = 64,
+    per_host_interval_sec: float = 0.0,
+):
+    """
+    Process feeds on a thread pool; `on_result` runs on the calling thread.
+
+    Feeds are dispatched through a `HostScheduler`, so a busy host never holds
+    more than `per_host_limit` workers while other hosts wait.
+    """
+    host_scheduler.run_threaded(
+        feeds,
+        lambda feed_info: process_feed(run, feed_info, session),
+        workers=workers,
+        on_result=on_result,
+        per_host_limit=per_host_limit,
+        per_host_interval_sec=per_host_interval_sec,
+    )
+
+
+def run_async(
+    run: FetchRun,
+    feeds: List[Dict],
+    *,
+    concurrency: int,
+    on_result: Callable[[Dict], None],
+    per_host_limit: int = 64,
+    per_host_interval_sec: float = 0.0,
+):
+    """Process feeds on a single asyncio event loop with bounded concurrency."""
+    asyncio.run(
+        _run_async(
+            run,
+            max(1, concurrency),
+            on_result,
+            host_scheduler.HostScheduler(
+                feeds,
+                per_host_limit=per_host_limit,
+                min_interval_sec=per_host_interval_sec,
+            ),
+        )
+    )
+
+
+async def _run_async(
+    run: FetchRun,
+    concurrency: int,
+    on_result: Callable[[Dict], None],
+    scheduler: host_scheduler.HostScheduler,
+):
+    in_flight: Dict[asyncio.Task, Dict] = {}
+    try:
+        while scheduler.pending or in_flight:
+            while len(in_flight) < concurrency:
+                feed_info = scheduler.pop_ready()
+                if feed_info is None:
+                    break
+                in_flight[asyncio.create_task(process_feed_async(run, feed_info))] = feed_info
+
+            delay = scheduler.next_delay() if scheduler.pending else None
+            if not in_flight:
+                await asyncio.sleep(delay or 0.0)
+                continue
+
+            done, _pending = await asyncio.wait(in_flight, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                feed_info = in_flight.pop(task)
+                result = task.result()
+                scheduler.release(feed_info, throttle_sec=result.get("throttle_sec", 0.0))
+                on_result(result)
+    finally:
+        for task in in_flight:
+            task.cancel()
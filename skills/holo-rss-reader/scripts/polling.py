@@ -0,0 +1,144 @@
+"""
+Adaptive polling schedule and failure quarantine for feeds.
+
+Each feed's polling interval is learned from how often new entries actually
+show up, bounded below by the publisher's own hints (`<ttl>`,
+`sy:updatePeriod`/`sy:updateFrequency`, `Cache-Control: max-age`). Feeds that
+keep failing are quarantined with an exponentially growing cooldown.
+"""
+import re
+from typing import Any, Dict, Mapping, Optional
+
+
+SY_PERIOD_SECONDS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 7 * 86400,
+    "monthly": 30 * 86400,
+    "yearly": 365 * 86400,
+}
+
+# Weight of the newest observation in the update-gap moving average.
+EMA_ALPHA = 0.3
+# Poll at twice the observed update rate.
+RATE_FACTOR = 0.5
+# Growth factor applied while a feed keeps returning nothing new.
+QUIET_BACKOFF = 1.5
+
+# Probes of quarantined feeds get no retries and short timeouts.
+PROBE_CONNECT_TIMEOUT_SEC = 3
+PROBE_READ_TIMEOUT_SEC = 5
+
+
+def parse_max_age(cache_control: Optional[str]) -> Optional[int]:
+    """Extract `max-age` seconds from a Cache-Control header."""
+    if not cache_control:
+        return None
+    lowered = cache_control.lower()
+    if "no-cache" in lowered or "no-store" in lowered:
+        return None
+    match = re.search(r"(?:^|[,\s])max-age\s*=\s*\"?(\d+)", lowered)
+    return int(match.group(1)) if match else None
+
+
+def _positive_int(value: Any) -> Optional[int]:
+    try:
+        parsed = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed > 0 else None
+
+
+def hint_seconds(feed_meta: Optional[Mapping], max_age: Optional[int] = None) -> int:
+    """
+    Return the publisher-advertised minimum refresh interval in seconds (0 = none).
+    """
+    hints = []
+    feed_meta = feed_meta or {}
+
+    ttl_minutes = _positive_int(feed_meta.get("ttl"))
+    if ttl_minutes:
+        hints.append(ttl_minutes * 60)
+
+    period = str(feed_meta.get("sy_updateperiod") or "").strip().lower()
+    if period in SY_PERIOD_SECONDS:
+        frequency = _positive_int(feed_meta.get("sy_updatefrequency")) or 1
+        hints.append(SY_PERIOD_SECONDS[period] // frequency)
+
+    if max_age:
+        hints.append(int(max_age))
+
+    return max(hints) if hints else 0
+
+
+def update_gap_ema(
+    previous_ema: Optional[float],
+    seconds_since_last_new: Optional[float],
+    new_count: int,
+) -> Optional[float]:
+    """Fold one observation of `new_count` entries over a gap into the EMA."""
+    if new_count <= 0 or not seconds_since_last_new or seconds_since_last_new <= 0:
+        return previous_ema
+    gap = seconds_since_last_new / new_count
+    if previous_ema is None:
+        return gap
+    return EMA_ALPHA * gap + (1 - EMA_ALPHA) * previous_ema
+
+
+def next_interval(
+    *,
+    previous_interval: Optional[float],
+    gap_ema: Optional[float],
+    new_count: int,
+    hint_sec: int,
+    min_interval_sec: int,
+    max_interval_sec: int,
+) -> int:
+    """Compute the seconds until the next poll of a feed."""
+    interval = gap_ema * RATE_FACTOR if gap_ema else float(min_interval_sec)
+    if new_count <= 0 and previous_interval:
+        interval = max(interval, previous_interval * QUIET_BACKOFF)
+
+    interval = max(interval, hint_sec)
+    return int(max(min_interval_sec, min(max_interval_sec, interval)))
+
+
+def breaker_cooldown(
+    consecutive_failures: int,
+    *,
+    threshold: int,
+    base_cooldown_sec: int,
+    max_cooldown_sec: int,
+) -> int:
+    """Quarantine seconds for a failure count; 0 while below the threshold."""
+    if threshold <= 0 or consecutive_failures < threshold:
+        return 0
+    exponent = min(consecutive_failures - threshold, 32)
+    return int(min(max_cooldown_sec, base_cooldown_sec * (2 ** exponent)))
+
+
+def breaker_settings(cfg: Dict) -> Optional[Dict[str, int]]:
+    """Read circuit-breaker settings from config, None when disabled."""
+    breaker_cfg = cfg.get("breaker") or {}
+    if not breaker_cfg.get("enabled", True):
+        return None
+    base_minutes = int(breaker_cfg.get("base_cooldown_min", 60))
+    max_minutes = int(breaker_cfg.get("max_cooldown_min", 10080))
+    return {
+        "threshold": int(breaker_cfg.get("threshold", 5)),
+        "base_cooldown_sec": base_minutes * 60,
+        "max_cooldown_sec": max(base_minutes, max_minutes) * 60,
+    }
+
+
+def schedule_settings(cfg: Dict) -> Optional[Dict[str, int]]:
+    """Read adaptive-schedule settings from config, None when disabled."""
+    schedule_cfg = cfg.get("schedule") or {}
+    if not schedule_cfg.get("enabled", True):
+        return None
+    min_minutes = int(schedule_cfg.get("min_interval_min", 15))
+    max_minutes = int(schedule_cfg.get("max_interval_min", 1440))
+    return {
+        "min_interval_sec": min_minutes * 60,
+        "max_interval_sec": max(min_minutes, max_minutes) * 60,
+    }
@@ -76,7 +76,15 @@ case "$CMD" in
         GIST_URL="${1:-$DEFAULT_GIST}"
         LIMIT="${2:-10}"
         WORKERS="${3:-8}"
-        run_main fetch --gist "$GIST_URL" --limit "$LIMIT" --workers "$WORKERS"
+        if [[ $# -gt 3 ]]; then shift 3; else set --; fi
+        run_main fetch --gist "$GIST_URL" --limit "$LIMIT" --workers "$WORKERS" "$@"
+        ;;
+    watch)
+        GIST_URL="${1:-$DEFAULT_GIST}"
+        LIMIT="${2:-10}"
+        WORKERS="${3:-4}"
+        if [[ $# -gt 3 ]]; then shift 3; else set --; fi
+        run_main watch --gist "$GIST_URL" --limit "$LIMIT" --workers "$WORKERS" "$@"
         ;;
     today)
         run_main today
@@ -84,18 +92,38 @@ case "$CMD" in
     history)
         DATE="${1:-}"
         if [[ -z "$DATE" ]]; then
-            echo "用法: bash rss.sh history <YYYY-MM-DD>" >&2
+            echo "用法: bash rss.sh history <YYYY-MM-DD|article-url>" >&2
             exit 2
         fi
         run_main history "$DATE"
         ;;
+    search)
+        if [[ $# -eq 0 ]]; then
+            echo "用法: bash rss.sh search <words...> [--since YYYY-MM-DD] [--until YYYY-MM-DD] [--feed F]" >&2
+            exit 2
+        fi
+        run_main search "$@"
+        ;;
+    lookup)
+        ARTICLE_URL="${1:-}"
+        if [[ -z "$ARTICLE_URL" ]]; then
+            echo "用法: bash rss.sh lookup <article-url>" >&2
+            exit 2
+        fi
+        run_main lookup "$ARTICLE_URL"
+        ;;
     full)
         ARTICLE_URL="${1:-}"
         DATE="${2:-}"
         if [[ -z "$ARTICLE_URL" ]]; then
             echo "用法: bash rss.sh full <article-url> [YYYY-MM-DD]" >&2
+            echo "      bash rss.sh full --from-digest <YYYY-MM-DD> | --urls-file <path> [options]" >&2
             exit 2
         fi
+        if [[ "$ARTICLE_URL" == --* ]]; then
+            run_main full "$@"
+            exit $?
+        fi
         if [[ -n "$DATE" ]]; then
             run_main full "$ARTICLE_URL" --date "$DATE"
         else
@@ -105,9 +133,21 @@ case "$CMD" in
     doctor)
         run_main doctor
         ;;
+    gc)
+        run_main gc
+        ;;
+    feeds)
+        run_main feeds "$@"
+        ;;
+    storage)
+        run_main storage "$@"
+        ;;
     wechat)
         run_main wechat "$@"
         ;;
+    serve)
+        run_main serve
+        ;;
     *)
         echo "Holo RSS Reader"
         echo ""
@@ -117,14 +157,24 @@ case "$CMD" in
         echo "  list [gist-url]                列出订阅源"
         echo "  read <feed-url> [limit]        读取文章"
         echo "  import [gist-url] [limit]      导入并显示文章"
-        echo "  fetch [gist-url] [limit] [workers]  抓取新文章，保存日报"
+        echo "  fetch [gist-url] [limit] [workers] [options]  抓取新文章，保存日报"
+        echo "  watch [gist-url] [limit] [workers] [options]  常驻监听，各源到期即抓，新文章随到随存"
         echo "  today                          查看今日日报"
-        echo "  history <YYYY-MM-DD>           查看指定日期日报"
+        echo "  history <YYYY-MM-DD|url>       查看指定日期（或收录该文章那天）的日报"
+        echo "  search <words...> [options]    全文检索日报和已缓存全文"
+        echo "  lookup <article-url>           查询文章的收录日期、来源和全文缓存位置"
         echo "  full <article-url> [date]      抓取并保存全文"
+        echo "  full --from-digest <date>      批量抓取某天日报中全部文章的全文"
+        echo "  full --urls-file <path>        批量抓取文件中列出的文章全文"
         echo "  doctor                         诊断运行环境和网络连通"
+        echo "  gc                             清理已失效的全文索引条目"
+        echo "  feeds health [--all]           查看失败/隔离中的订阅源"
+        echo "  storage migrate                把 JSON 状态迁移到 SQLite"
+        echo "  storage reindex                从全部日报重建文章目录和检索索引"
         echo "  wechat add <id> [--title T]    添加微信公众号订阅"
         echo "  wechat list                    列出微信订阅源"
         echo "  wechat remove <id|url>         移除微信订阅源"
+        echo "  serve                          常驻进程：之后的 read/fetch/today/history/full/search 自动交给它执行"
         echo ""
         echo "默认 Gist: $DEFAULT_GIST"
         echo "存储位置: $RSS_DATA_DIR"
@@ -0,0 +1,239 @@
+"""
+Full-text search index over digests and cached full articles.
+
+Documents live in `search.db`, an SQLite FTS5 table ranked with BM25
+(title hits weigh more than body hits). FTS5's own tokenizer treats a run
+of Han characters as one token, so text is pre-tokenized here: CJK runs
+become overlapping bigrams plus the run's last character, other words
+pass through. Queries get the same treatment, so a Chinese word matches as
+a phrase of its bigrams and a single character matches as a bigram prefix.
+
+`store` feeds the index as digests and full articles are written.
+"""
+import re
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Writers wait this long for a competing writer instead of failing.
+BUSY_TIMEOUT_MS = 5000
+
+# BM25 column weights: title, body.
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+# Plain text kept per document for result snippets.
+EXCERPT_CHARS = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    date TEXT NOT NULL,
+    feed TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    excerpt TEXT NOT NULL DEFAULT '',
+    UNIQUE (kind, key)
+);
+CREATE INDEX IF NOT EXISTS docs_date ON docs (date);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(title, body, tokenize = 'unicode61 remove_diacritics 2');
+"""
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN = re.compile(rf"[{_CJK}]+|[^\W{_CJK}]+")
+_CJK_RUN = re.compile(rf"[{_CJK}]+")
+
+
+class SearchUnavailable(RuntimeError):
+    """This Python's SQLite was built without FTS5."""
+
+
+@lru_cache(maxsize=1)
+def fts5_available() -> bool:
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def _cjk_tokens(run: str) -> List[str]:
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)] + [run[-1]]
+
+
+def tokenize(text: str) -> str:
+    """Index form of a text: space-separated words and CJK bigrams."""
+    tokens: List[str] = []
+    for match in _TOKEN.finditer(text or ""):
+        token = match.group()
+        if _CJK_RUN.fullmatch(token):
+            tokens.extend(_cjk_tokens(token))
+        else:
+            tokens.append(token.lower())
+    return " ".join(tokens)
+
+
+def _quote(token: str) -> str:
+    return '"' + token.replace('"', '""') + '"'
+
+
+def build_match(query: str) -> str:
+    """
+    FTS5 MATCH expression for a user query; "" if it has no searchable terms.
+
+    Whitespace-separated terms must all match (AND). A term ending in `*`
+    is a prefix search. Terms are quoted, so FTS5 operators typed by the
+    user are searched for literally.
+    """
+    clauses = []
+    for term in (query or "").split():
+        prefix = term.endswith("*")
+        for match in _TOKEN.finditer(term):
+            token = match.group()
+            if not _CJK_RUN.fullmatch(token):
+                clauses.append(_quote(token.lower()) + ("*" if prefix else ""))
+            elif len(token) == 1:
+                clauses.append(_quote(token) + "*")
+            else:
+                bigrams = [token[i:i + 2] for i in range(len(token) - 1)]
+                clauses.append(_quote(" ".join(bigrams)))
+    return " AND ".join(clauses)
+
+
+def doc(kind: str, key: str, *, date: str, feed: str, title: str, url: str, text: str) -> Dict[str, str]:
+    """A document to index; `kind` is "digest" or "full", `key` the article's catalog key."""
+    return {
+        "kind": kind, "key": key, "date": date, "feed": feed or "", "title": title or "", "url": url or "",
+        "text": text or "",
+    }
+
+
+class SearchIndex:
+    """One connection to search.db."""
+
+    def __init__(self, path: Path):
+        if not fts5_available():
+            raise SearchUnavailable("SQLite FTS5 is not available in this Python build")
+        self.path = path
+        self.conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add(self, docs: Iterable[Dict[str, str]]) -> int:
+        """
+        Index documents in one transaction; returns how many were written.
+
+        A digest document is kept from the first day an article was logged;
+        a full-article document replaces the previous copy.
+        """
+        written = 0
+        with self.conn:
+            for item in docs:
+                row = self.conn.execute(
+                    "SELECT id FROM docs WHERE kind = ? AND key = ?", (item["kind"], item["key"])
+                ).fetchone()
+                if row is not None:
+                    if item["kind"] == "digest":
+                        continue
+                    self.conn.execute("DELETE FROM docs WHERE id = ?", row)
+                    self.conn.execute("DELETE FROM docs_fts WHERE rowid = ?", row)
+                doc_id = self.conn.execute(
+                    "INSERT INTO docs (kind, key, date, feed, title, url, excerpt) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        item["kind"], item["key"], item["date"], item["feed"], item["title"], item["url"],
+                        " ".join(item["text"].split())[:EXCERPT_CHARS],
+                    ),
+                ).lastrowid
+                self.conn.execute(
+                    "INSERT INTO docs_fts (rowid, title, body) VALUES (?, ?, ?)",
+                    (doc_id, tokenize(item["title"]), tokenize(item["text"])),
+                )
+                written += 1
+        return written
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM docs")
+            self.conn.execute("DELETE FROM docs_fts")
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def search(
+        self,
+        query: str,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        feed: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        Best-ranked articles for a query, one result per article.
+
+        `since`/`until` bound the date (YYYY-MM-DD, inclusive); `feed` is a
+        case-insensitive substring of the feed title. Results carry the
+        article's `key`, url, title, feed, date, `snippet` and `score`
+        (lower is better).
+        """
+        match = build_match(query)
+        if not match or limit <= 0:
+            return []
+        sql = [
+            "SELECT d.key, d.date, d.feed, d.title, d.url, d.excerpt,",
+            f"bm25(docs_fts, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score",
+            "FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid WHERE docs_fts MATCH ?",
+        ]
+        params: List[Any] = [match]
+        if since:
+            sql.append("AND d.date >= ?")
+            params.append(since)
+        if until:
+            sql.append("AND d.date <= ?")
+            params.append(until)
+        if feed:
+            sql.append("AND d.feed LIKE ? ESCAPE '\\'")
+            params.append("%" + re.sub(r"([\\%_])", r"\\\1", feed) + "%")
+        sql.append("ORDER BY score")
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for key, date, feed_title, title, url, excerpt, score in self.conn.execute(" ".join(sql), params):
+            # Rows arrive best-first; an article's digest and full copies collapse into one result.
+            if key in results:
+                continue
+            if len(results) >= limit:
+                break
+            results[key] = {
+                "key": key, "url": url, "title": title, "feed": feed_title, "date": date,
+                "snippet": snippet(excerpt, query), "score": score,
+            }
+        return list(results.values())
+
+
+def snippet(text: str, query: str, width: int = 120) -> str:
+    """A window of `text` around the first query term found in it."""
+    if not text:
+        return ""
+    lowered = text.lower()
+    start = 0
+    for term in (query or "").split():
+        term = term.rstrip("*").lower()
+        pos = lowered.find(term) if term else -1
+        if pos >= 0:
+            start = max(0, pos - width // 3)
+            break
+    window = text[start:start + width]
+    return ("…" if start else "") + window + ("…" if start + width < len(text) else "")
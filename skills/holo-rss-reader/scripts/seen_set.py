@@ -0,0 +1,111 @@
+"""
+Compact per-feed record of already-delivered article URLs.
+
+URLs are kept as 64-bit blake2b fingerprints, oldest first, in one bytes
+buffer: 8 bytes per URL instead of a full string object, and a membership
+check is an aligned substring search over that buffer rather than a set
+rebuilt on every call. On disk the buffer is base64 text (state.json) or a
+BLOB (state.db).
+"""
+import base64
+import binascii
+import hashlib
+from typing import Iterable, Iterator, List, Optional
+
+
+FINGERPRINT_BYTES = 8
+
+
+def fingerprint(url: str) -> int:
+    """64-bit fingerprint of a URL."""
+    return int.from_bytes(_key(url), "little")
+
+
+def _key(url: str) -> bytes:
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=FINGERPRINT_BYTES).digest()
+
+
+class SeenSet:
+    """
+    Insertion-ordered set of URL fingerprints.
+
+    `url in seen` works with URL strings (and raw fingerprints); iterating
+    yields fingerprints. Instances pickle, so they can be handed to the parse
+    pool as-is.
+    """
+
+    __slots__ = ("_buf",)
+
+    def __init__(self, data: bytes = b""):
+        usable = len(data) - len(data) % FINGERPRINT_BYTES
+        self._buf = bytearray(data[:usable])
+
+    @classmethod
+    def from_urls(cls, urls: Iterable[str], *, limit: Optional[int] = None) -> "SeenSet":
+        seen = cls()
+        seen.add(urls, limit=limit)
+        return seen
+
+    @classmethod
+    def from_b64(cls, text: str) -> "SeenSet":
+        """Decode the state.json form; garbage yields an empty set."""
+        try:
+            return cls(base64.b64decode(text, validate=True))
+        except (binascii.Error, ValueError):
+            return cls()
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._buf)
+
+    def to_b64(self) -> str:
+        return base64.b64encode(self._buf).decode("ascii")
+
+    def _has(self, key: bytes) -> bool:
+        pos = self._buf.find(key)
+        while pos != -1:
+            if pos % FINGERPRINT_BYTES == 0:
+                return True
+            pos = self._buf.find(key, pos + 1)
+        return False
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, str):
+            return self._has(_key(item))
+        if isinstance(item, int) and 0 <= item < 1 << 64:
+            return self._has(item.to_bytes(FINGERPRINT_BYTES, "little"))
+        return False
+
+    def __len__(self) -> int:
+        return len(self._buf) // FINGERPRINT_BYTES
+
+    def __iter__(self) -> Iterator[int]:
+        for pos in range(0, len(self._buf), FINGERPRINT_BYTES):
+            yield int.from_bytes(self._buf[pos:pos + FINGERPRINT_BYTES], "little")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SeenSet):
+            return NotImplemented
+        return self._buf == other._buf
+
+    def __repr__(self) -> str:
+        return f"SeenSet(<{len(self)} fingerprints>)"
+
+    def add(self, urls: Iterable[str], *, limit: Optional[int] = None) -> List[int]:
+        """Append unseen URLs in order; return the fingerprints actually added."""
+        return self.add_fingerprints((fingerprint(url) for url in urls if url), limit=limit)
+
+    def add_fingerprints(self, fingerprints: Iterable[int], *, limit: Optional[int] = None) -> List[int]:
+        """
+        Append unseen fingerprints in order and keep only the newest `limit`.
+
+        Returns the fingerprints actually added.
+        """
+        added = []
+        for value in fingerprints:
+            key = value.to_bytes(FINGERPRINT_BYTES, "little")
+            if not self._has(key):
+                self._buf += key
+                added.append(value)
+        if limit is not None and len(self) > limit:
+            del self._buf[:(len(self) - limit) * FINGERPRINT_BYTES]
+        return added
@@ -0,0 +1,103 @@
+"""
+Hash-prefix sharded JSON index.
+
+Keys (hex digests) are split over `<prefix>.json` files, so a lookup reads
+one small shard and an update rewrites only the shards it touches instead
+of the whole index. Loaded shards are cached per process and re-read when
+their file changes on disk.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+
+class ShardedIndex:
+    """Map of hex key -> JSON object, stored as one file per key prefix."""
+
+    def __init__(self, root: Path, *, prefix_len: int = 2):
+        self.root = root
+        self.prefix_len = prefix_len
+        self._cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    def _shard_of(self, key: str) -> str:
+        return key[:self.prefix_len].lower()
+
+    def _shard_path(self, shard: str) -> Path:
+        return self.root / f"{shard}.json"
+
+    def _load(self, shard: str) -> Dict[str, Any]:
+        path = self._shard_path(shard)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            self._cache.pop(shard, None)
+            return {}
+        cached = self._cache.get(shard)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        self._cache[shard] = (mtime, data)
+        return data
+
+    def _write(self, shard: str, data: Dict[str, Any]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._shard_path(shard)
+        if not data:
+            if path.exists():
+                path.unlink()
+            self._cache.pop(shard, None)
+            return
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            tmp_path.replace(path)
+        except Exception:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+        self._cache[shard] = (path.stat().st_mtime_ns, data)
+
+    def get(self, key: str) -> Any:
+        return self._load(self._shard_of(key)).get(key)
+
+    def update(self, entries: Dict[str, Any]):
+        """Upsert entries; each affected shard is rewritten once."""
+        by_shard: Dict[str, Dict[str, Any]] = {}
+        for key, value in entries.items():
+            by_shard.setdefault(self._shard_of(key), {})[key] = value
+        for shard, changes in by_shard.items():
+            data = dict(self._load(shard))
+            data.update(changes)
+            self._write(shard, data)
+
+    def delete(self, keys: Iterable[str]) -> int:
+        """Remove keys; returns how many existed. Each affected shard is rewritten once."""
+        by_shard: Dict[str, set] = {}
+        for key in keys:
+            by_shard.setdefault(self._shard_of(key), set()).add(key)
+        removed = 0
+        for shard, doomed in by_shard.items():
+            data = self._load(shard)
+            kept = {key: value for key, value in data.items() if key not in doomed}
+            if len(kept) != len(data):
+                removed += len(data) - len(kept)
+                self._write(shard, kept)
+        return removed
+
+    def shards(self) -> Iterator[str]:
+        if not self.root.is_dir():
+            return
+        for path in sorted(self.root.glob("*.json")):
+            yield path.stem
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for shard in self.shards():
+            yield from list(self._load(shard).items())
@@ -0,0 +1,148 @@
+"""
+SQLite storage backend for feed state, seen URLs, the full-article index
+and the article catalog.
+
+One `state.db` replaces state.json/state.journal and the full_index/ and
+catalog/ shards. Every point read or write goes through a primary-key
+B-tree, so the cost no longer grows with the number of tracked feeds or
+cached articles. The database runs in WAL mode: `feeds health`, `full`
+and other readers can open it while `fetch` is writing.
+"""
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Writers wait this long for a competing writer instead of failing.
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    meta TEXT NOT NULL,
+    seen BLOB NOT NULL DEFAULT x''
+);
+CREATE TABLE IF NOT EXISTS full_index (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    date TEXT NOT NULL,
+    path TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS catalog (
+    key TEXT PRIMARY KEY,
+    entry TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open (and create if needed) a state database in WAL mode."""
+    conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class StateDB:
+    """
+    Thin wrapper over one connection.
+
+    The connection may be shared across fetch worker threads; callers
+    serialize access the same way they already do for the in-memory state.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn = connect(path)
+
+    def close(self):
+        self.conn.close()
+
+    # Feed state
+
+    def feed_urls(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT url FROM feeds ORDER BY url")]
+
+    def has_feed(self, feed_url: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM feeds WHERE url = ?", (feed_url,)).fetchone() is not None
+
+    def get_feed(self, feed_url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Return the feed's metadata and its seen-fingerprint blob, or None."""
+        row = self.conn.execute("SELECT meta, seen FROM feeds WHERE url = ?", (feed_url,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), bytes(row[1])
+
+    def delete_feed(self, feed_url: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM feeds WHERE url = ?", (feed_url,))
+
+    def write_feeds(self, changes: Iterable[Tuple[str, Dict[str, Any], bytes]]):
+        """Upsert `(feed_url, meta, seen_blob)` rows in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO feeds (url, meta, seen) VALUES (?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET meta = excluded.meta, seen = excluded.seen",
+                [(feed_url, json.dumps(meta, ensure_ascii=False), seen) for feed_url, meta, seen in changes],
+            )
+
+    # Full-article index
+
+    def lookup_full_article(self, url_hash: str) -> Optional[Dict[str, str]]:
+        row = self.conn.execute(
+            "SELECT url, date, path, updated_at FROM full_index WHERE url_hash = ?", (url_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("url", "date", "path", "updated_at"), row))
+
+    def index_full_articles(self, entries: Dict[str, Dict[str, str]]):
+        """Upsert `{url_hash: {url, date, path, updated_at}}` in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO full_index (url_hash, url, date, path, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (url_hash, e.get("url", ""), e.get("date", ""), e.get("path", ""), e.get("updated_at", ""))
+                    for url_hash, e in entries.items()
+                ],
+            )
+
+    def full_index_paths(self) -> Iterator[Tuple[str, str]]:
+        yield from self.conn.execute("SELECT url_hash, path FROM full_index")
+
+    def delete_full_articles(self, url_hashes: Iterable[str]):
+        with self.conn:
+            self.conn.executemany("DELETE FROM full_index WHERE url_hash = ?", [(h,) for h in url_hashes])
+
+    def full_articles(self) -> Iterator[Dict[str, str]]:
+        for row in self.conn.execute("SELECT url, date, path, updated_at FROM full_index"):
+            yield dict(zip(("url", "date", "path", "updated_at"), row))
+
+    # Article catalog
+
+    def get_catalog(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        found = {}
+        for key in keys:
+            row = self.conn.execute("SELECT entry FROM catalog WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                found[key] = json.loads(row[0])
+        return found
+
+    def put_catalog(self, entries: Dict[str, Dict[str, Any]]):
+        """Upsert `{key: entry}` in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO catalog (key, entry) VALUES (?, ?)",
+                [(key, json.dumps(entry, ensure_ascii=False)) for key, entry in entries.items()],
+            )
+
+    def catalog_entries(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for key, entry in self.conn.execute("SELECT key, entry FROM catalog"):
+            yield key, json.loads(entry)
+
+    def clear_catalog(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM catalog")
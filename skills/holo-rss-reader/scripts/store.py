@@ -1,28 +1,157 @@
 """
 Local storage and state management for RSS articles.
 Handles: digest saving, full article caching, dedup via state.json.
+
+Feed state, the full-article index and the article catalog (see
+`catalog`) live either in JSON files (default) or in an SQLite database
+(`state.db`, see `sqlite_store`). The backend is
+picked by `RSS_STORAGE_BACKEND`, or by the presence of state.db after
+`storage migrate`; callers use the same functions either way. The
+full-text search index (`search.db`, see `search_index`) is SQLite under
+both backends.
 """
 import hashlib
 import json
 import os
 import re
-from datetime import datetime, timezone
+import threading
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import body_pack
+import catalog
+import digest_log
+import polling
+import search_index
+import sqlite_store
+from body_pack import BodyPack
+from digest_log import DigestLog
+from seen_set import SeenSet, fingerprint
+from sharded_index import ShardedIndex
 
 
 # Default storage root
 DEFAULT_RSS_DIR = os.path.expanduser("~/data/rss")
 
 DEFAULT_FEED_STATE = {
-    "seen_urls": [],
+    # SeenSet of delivered article URLs; base64 fingerprints in state.json.
+    "seen": None,
     "last_fetch": None,
     "etag": "",
     "last_modified": "",
     "last_status": "never",
     "consecutive_failures": 0,
+    "next_due": None,
+    "poll_interval_sec": 0,
+    "poll_hint_sec": 0,
+    "update_gap_ema": None,
+    "last_new_at": None,
+    "quarantine_until": None,
+    "body_digest": "",
+    "links_digest": "",
+    # WebSub hub advertised by the feed, and the topic URL it knows the feed by.
+    "websub_hub": "",
+    "websub_topic": "",
 }
 
+# Feeds due within this window count as due, so cron jitter does not skip them.
+DUE_SLACK_SEC = 120
+
+# Per-feed seen-set cap.
+MAX_SEEN_URLS = 500
+
+# Checkpoints fold the journal into state.json once it grows past this size.
+JOURNAL_COMPACT_BYTES = 16 * 1024 * 1024
+
+STORAGE_BACKENDS = ("json", "sqlite")
+
+# Open JSON full indexes and catalogs by directory, so their shard caches survive across calls.
+_FULL_INDEXES: Dict[Path, ShardedIndex] = {}
+_CATALOGS: Dict[Path, ShardedIndex] = {}
+
+# Rendered digests by log path, keyed by the log's (size, mtime), so a
+# long-running process re-renders a day only after it was appended to.
+_DIGEST_RENDERS: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+
+# Entries written inside `full_index_batch()`, committed when it exits.
+_full_index_pending: Optional[Dict[str, Dict[str, str]]] = None
+_search_pending: Optional[List[Dict[str, str]]] = None
+_full_index_lock = threading.Lock()
+
+
+class JournaledState(dict):
+    """
+    State dict returned by `load_state`.
+
+    Mutators record which feeds changed (and which URLs became seen) since the
+    last checkpoint, so `checkpoint_state` can append only those deltas.
+    `pending` maps feed URL to the seen fingerprints added since then.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pending: Dict[str, List[int]] = {}
+
+
+class _SQLiteFeeds(MutableMapping):
+    """
+    `state["feeds"]` for the SQLite backend.
+
+    A feed's row (metadata plus seen URLs) is read on first access and then
+    cached, so a fetch touches only the feeds it processes.
+    """
+
+    def __init__(self, db: sqlite_store.StateDB):
+        self.db = db
+        self.cache: Dict[str, Dict] = {}
+
+    def __getitem__(self, feed_url: str) -> Dict:
+        if feed_url not in self.cache:
+            row = self.db.get_feed(feed_url)
+            if row is None:
+                raise KeyError(feed_url)
+            feed_state, seen = row
+            feed_state["seen"] = SeenSet(seen)
+            self.cache[feed_url] = feed_state
+        return self.cache[feed_url]
+
+    def __setitem__(self, feed_url: str, feed_state: Dict):
+        self.cache[feed_url] = feed_state
+
+    def __delitem__(self, feed_url: str):
+        if feed_url not in self:
+            raise KeyError(feed_url)
+        self.cache.pop(feed_url, None)
+        self.db.delete_feed(feed_url)
+
+    def __contains__(self, feed_url: object) -> bool:
+        return feed_url in self.cache or (isinstance(feed_url, str) and self.db.has_feed(feed_url))
+
+    def __iter__(self) -> Iterator[str]:
+        stored = self.db.feed_urls()
+        yield from stored
+        stored_set = set(stored)
+        yield from (url for url in list(self.cache) if url not in stored_set)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class SQLiteState(JournaledState):
+    """
+    State returned by `load_state` on the SQLite backend.
+
+    `checkpoint_state` and `save_state` write the pending feeds in a single
+    transaction instead of appending to a journal.
+    """
+
+    def __init__(self, db: sqlite_store.StateDB):
+        super().__init__(feeds=_SQLiteFeeds(db))
+        self.db = db
+
 
 def get_rss_dir() -> Path:
     """Get RSS storage root, create if needed."""
@@ -35,10 +164,65 @@ def get_state_path() -> Path:
     return get_rss_dir() / "state.json"
 
 
+def get_state_journal_path() -> Path:
+    return get_rss_dir() / "state.journal"
+
+
 def get_full_index_path() -> Path:
+    """Pre-sharding single-file index; imported into full_index/ on first use."""
     return get_rss_dir() / "full_index.json"
 
 
+def get_full_index_dir() -> Path:
+    return get_rss_dir() / "full_index"
+
+
+def get_catalog_dir() -> Path:
+    return get_rss_dir() / "catalog"
+
+
+def get_state_db_path() -> Path:
+    return get_rss_dir() / "state.db"
+
+
+def get_search_db_path() -> Path:
+    return get_rss_dir() / "search.db"
+
+
+def get_dedupe_index_path() -> Path:
+    return get_rss_dir() / "dedupe.idx"
+
+
+def get_subscriptions_cache_dir() -> Path:
+    """Manifests of the Gist/OPML subscription lists (see `subscription_cache`)."""
+    return get_rss_dir() / "subscriptions"
+
+
+def get_serve_socket_path() -> Path:
+    """Unix socket of the `serve` daemon; `RSS_SERVE_SOCKET` overrides it."""
+    override = os.environ.get("RSS_SERVE_SOCKET")
+    if override:
+        return Path(override).expanduser()
+    return get_rss_dir() / "serve.sock"
+
+
+def get_storage_backend() -> str:
+    """
+    Return "sqlite" or "json".
+
+    `RSS_STORAGE_BACKEND` wins when set; otherwise an existing state.db
+    selects SQLite.
+    """
+    backend = os.environ.get("RSS_STORAGE_BACKEND", "").strip().lower()
+    if backend in STORAGE_BACKENDS:
+        return backend
+    return "sqlite" if get_state_db_path().exists() else "json"
+
+
+def open_state_db() -> sqlite_store.StateDB:
+    return sqlite_store.StateDB(get_state_db_path())
+
+
 def _ensure_feed_state(state: Dict, feed_url: str) -> Dict:
     if "feeds" not in state:
         state["feeds"] = {}
@@ -53,86 +237,275 @@ def _ensure_feed_state(state: Dict, feed_url: str) -> Dict:
         if key not in feed_state:
             feed_state[key] = default_value if not isinstance(default_value, list) else list(default_value)
 
-    if not isinstance(feed_state.get("seen_urls"), list):
-        feed_state["seen_urls"] = []
+    if not isinstance(feed_state["seen"], SeenSet):
+        feed_state["seen"] = _load_seen(feed_state)
     return feed_state
 
 
+def _load_seen(feed_state: Dict) -> SeenSet:
+    """Decode the stored seen set, converting a legacy `seen_urls` list."""
+    legacy = feed_state.pop("seen_urls", None)
+    if isinstance(feed_state.get("seen"), str):
+        return SeenSet.from_b64(feed_state["seen"])
+    if isinstance(legacy, list):
+        return SeenSet.from_urls((url for url in legacy if isinstance(url, str)), limit=MAX_SEEN_URLS)
+    return SeenSet()
+
+
+def _changed_feed_state(state: Dict, feed_url: str) -> Dict:
+    """Like `_ensure_feed_state`, and record the feed for the next checkpoint."""
+    feed_state = _ensure_feed_state(state, feed_url)
+    if isinstance(state, JournaledState):
+        state.pending.setdefault(feed_url, [])
+    return feed_state
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, SeenSet):
+        return value.to_b64()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def load_state() -> Dict:
-    """Load state.json, return empty state if not exists."""
+    """
+    Load feed state from the active backend.
+
+    JSON: load state.json and replay state.journal over it; returns an empty
+    state if neither exists. SQLite: open state.db; feeds load on access.
+    """
+    if get_storage_backend() == "sqlite":
+        return SQLiteState(open_state_db())
+    return load_json_state()
+
+
+def load_json_state() -> JournaledState:
+    """Load the JSON layout (state.json plus journal), whatever the backend."""
     path = get_state_path()
+    state = JournaledState(feeds={})
     if path.exists():
         try:
             with open(path, "r", encoding="utf-8") as f:
-                state = json.load(f)
-            if not isinstance(state, dict):
+                data = json.load(f)
+            if not isinstance(data, dict):
                 raise json.JSONDecodeError("invalid root", "", 0)
+            state = JournaledState(data)
             state.setdefault("feeds", {})
             if isinstance(state["feeds"], dict):
                 for feed_url in list(state["feeds"].keys()):
                     _ensure_feed_state(state, feed_url)
             else:
                 state["feeds"] = {}
-            return state
         except (json.JSONDecodeError, OSError):
             backup_path = path.with_suffix(".json.corrupt")
             path.rename(backup_path)
-            return {"feeds": {}}
-    return {"feeds": {}}
+            state = JournaledState(feeds={})
+
+    _replay_journal(state)
+    return state
+
+
+def _replay_journal(state: Dict):
+    """Apply journal records; a torn trailing line from a crash is ignored."""
+    journal_path = get_state_journal_path()
+    if not journal_path.exists():
+        return
+    with open(journal_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                feed_url = record["feed"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+            feed_state = _ensure_feed_state(state, feed_url)
+            feed_state.update(record.get("meta") or {})
+            # Older journals recorded URLs rather than fingerprints.
+            added = [
+                value if isinstance(value, int) else fingerprint(str(value)) for value in record.get("seen_add") or []
+            ]
+            feed_state["seen"].add_fingerprints(added, limit=MAX_SEEN_URLS)
+
+
+def _db_row(feed_state: Dict):
+    meta = {key: value for key, value in feed_state.items() if key != "seen"}
+    return meta, feed_state["seen"].to_bytes()
+
+
+def _write_pending_to_db(state: SQLiteState):
+    state.db.write_feeds((feed_url, *_db_row(state["feeds"][feed_url])) for feed_url in state.pending)
+    state.pending.clear()
 
 
 def save_state(state: Dict):
-    """Save state.json atomically using temp file + replace."""
+    """
+    Save state.json atomically using temp file + replace.
+
+    This is also the journal compaction step: once the snapshot is in place the
+    journal is truncated. Replaying a stale journal over it is harmless.
+    An `SQLiteState` commits its changed feeds to state.db instead.
+    """
+    if isinstance(state, SQLiteState):
+        _write_pending_to_db(state)
+        return
+
     path = get_state_path()
     tmp_path = path.with_suffix(".json.tmp")
     try:
         with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
+            json.dump(state, f, ensure_ascii=False, indent=2, default=_json_default)
         tmp_path.replace(path)
     except Exception:
         if tmp_path.exists():
             tmp_path.unlink()
         raise
 
+    journal_path = get_state_journal_path()
+    if journal_path.exists():
+        journal_path.unlink()
+    if isinstance(state, JournaledState):
+        state.pending.clear()
 
-def load_full_index() -> Dict[str, Any]:
-    """Load full article index metadata."""
+
+def checkpoint_state(state: Dict):
+    """
+    Persist changes since the last checkpoint.
+
+    For a `JournaledState` only the changed feeds are appended to
+    state.journal (fetch metadata plus newly seen URLs), so the cost tracks
+    the deltas rather than the total state size. Other dicts, and journals
+    past JOURNAL_COMPACT_BYTES, are written out in full via `save_state`.
+    An `SQLiteState` commits the changed feeds in one transaction.
+    """
+    if isinstance(state, SQLiteState):
+        _write_pending_to_db(state)
+        return
+    if not isinstance(state, JournaledState):
+        save_state(state)
+        return
+    if not state.pending:
+        return
+
+    journal_path = get_state_journal_path()
+    if journal_path.exists() and journal_path.stat().st_size > JOURNAL_COMPACT_BYTES:
+        save_state(state)
+        return
+
+    lines = []
+    for feed_url, seen_add in state.pending.items():
+        feed_state = state["feeds"][feed_url]
+        meta = {key: value for key, value in feed_state.items() if key != "seen"}
+        lines.append(json.dumps({"feed": feed_url, "meta": meta, "seen_add": seen_add}, ensure_ascii=False))
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    state.pending.clear()
+
+
+def _load_legacy_full_index() -> Dict[str, Any]:
     path = get_full_index_path()
     if path.exists():
         try:
             with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
             if isinstance(data, dict) and isinstance(data.get("articles", {}), dict):
-                return data
+                return data.get("articles", {})
         except (json.JSONDecodeError, OSError):
             pass
-    return {"articles": {}}
+    return {}
 
 
-def save_full_index(index: Dict[str, Any]):
-    """Save full article index atomically."""
-    path = get_full_index_path()
-    tmp_path = path.with_suffix(".json.tmp")
-    try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
-        tmp_path.replace(path)
-    except Exception:
-        if tmp_path.exists():
-            tmp_path.unlink()
-        raise
+def _full_index() -> ShardedIndex:
+    """
+    The JSON-backend full-article index (sharded under full_index/).
+
+    A pre-sharding full_index.json is imported once and renamed to
+    full_index.json.migrated.
+    """
+    root = get_full_index_dir()
+    index = _FULL_INDEXES.get(root)
+    if index is None:
+        index = _FULL_INDEXES[root] = ShardedIndex(root)
+    legacy_path = get_full_index_path()
+    if legacy_path.exists():
+        index.update(_load_legacy_full_index())
+        legacy_path.rename(legacy_path.with_name(legacy_path.name + ".migrated"))
+    return index
+
+
+def load_full_index() -> Dict[str, Any]:
+    """
+    Load every JSON-backend full-index entry as `{"articles": {hash: entry}}`.
+
+    Reads all shards; meant for migration and tooling, not lookups.
+    """
+    return {"articles": dict(_full_index().items())}
 
 
 def _url_hash(url: str) -> str:
     return hashlib.sha256(url.encode("utf-8")).hexdigest()
 
 
+@contextmanager
+def full_index_batch():
+    """
+    Defer full-index and search-index writes made inside the block and
+    commit them once.
+
+    Lookups inside the block see the pending entries. Nested blocks join
+    the outermost one.
+    """
+    global _full_index_pending, _search_pending
+    with _full_index_lock:
+        outermost = _full_index_pending is None
+        if outermost:
+            _full_index_pending = {}
+            _search_pending = []
+    try:
+        yield
+    finally:
+        if outermost:
+            with _full_index_lock:
+                pending, _full_index_pending = _full_index_pending, None
+                search_docs, _search_pending = _search_pending, None
+            if pending:
+                _write_full_index_entries(pending)
+            if search_docs:
+                _write_search_docs(search_docs)
+
+
+def _write_full_index_entries(entries: Dict[str, Dict[str, str]]):
+    if get_storage_backend() == "sqlite":
+        db = open_state_db()
+        try:
+            db.index_full_articles(entries)
+        finally:
+            db.close()
+    else:
+        _full_index().update(entries)
+    update_catalog([
+        catalog.full_update(entry["url"], entry["date"], entry["path"]) for entry in entries.values() if entry.get("url")
+    ])
+
+
+def _get_full_index_entry(url_hash: str) -> Optional[Dict[str, str]]:
+    with _full_index_lock:
+        if _full_index_pending and url_hash in _full_index_pending:
+            return _full_index_pending[url_hash]
+    if get_storage_backend() == "sqlite":
+        db = open_state_db()
+        try:
+            return db.lookup_full_article(url_hash)
+        finally:
+            db.close()
+    return _full_index().get(url_hash)
+
+
 def lookup_full_article(url: str, date_str: Optional[str] = None) -> Optional[Path]:
     """
-    Lookup cached full article by URL from full_index.json.
+    Lookup cached full article by URL from the full-article index.
+
+    Entries whose file is gone are treated as misses; `gc_full_index`
+    removes them.
     """
-    index = load_full_index()
-    entry = index.get("articles", {}).get(_url_hash(url))
+    entry = _get_full_index_entry(_url_hash(url))
     if not entry:
         return None
 
@@ -144,52 +517,330 @@ def lookup_full_article(url: str, date_str: Optional[str] = None) -> Optional[Pa
         return None
 
     path = Path(path_str)
-    if path.exists():
-        return path
-
-    # Stale index entry, cleanup lazily.
-    index["articles"].pop(_url_hash(url), None)
-    save_full_index(index)
-    return None
+    return path if path.exists() else None
 
 
 def index_full_article(url: str, date_str: str, path: Path):
     """
     Update full article index entry for a URL.
+
+    Inside `full_index_batch()` the write is deferred to the end of the block.
     """
-    index = load_full_index()
-    index.setdefault("articles", {})
-    index["articles"][_url_hash(url)] = {
+    entry = {
         "url": url,
         "date": date_str,
         "path": str(path),
         "updated_at": datetime.now(timezone.utc).isoformat(),
     }
-    save_full_index(index)
+    with _full_index_lock:
+        if _full_index_pending is not None:
+            _full_index_pending[_url_hash(url)] = entry
+            return
+    _write_full_index_entries({_url_hash(url): entry})
 
 
-def get_seen_urls(state: Dict, feed_url: str) -> set:
-    """Get set of already-seen article URLs for a feed."""
-    feed_state = _ensure_feed_state(state, feed_url)
-    return set(feed_state.get("seen_urls", []))
+def _catalog() -> ShardedIndex:
+    """The JSON-backend article catalog (sharded under catalog/)."""
+    root = get_catalog_dir()
+    index = _CATALOGS.get(root)
+    if index is None:
+        index = _CATALOGS[root] = ShardedIndex(root)
+    return index
 
 
-def mark_seen(state: Dict, feed_url: str, article_urls: List[str]):
-    """Mark article URLs as seen for a feed. Preserves order of URLs."""
-    feed_state = _ensure_feed_state(state, feed_url)
+def update_catalog(updates: List[Dict[str, Any]]):
+    """
+    Merge partial catalog entries (see `catalog.merge`) into the catalog.
+
+    Each affected shard, or the whole batch on SQLite, is written once.
+    """
+    by_key: Dict[str, List[Dict[str, Any]]] = {}
+    for update in updates:
+        by_key.setdefault(catalog.catalog_key(update["url"]), []).append(update)
+    if not by_key:
+        return
+
+    def merged(current: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        for key, key_updates in by_key.items():
+            entry = current.get(key)
+            for update in key_updates:
+                entry = catalog.merge(entry, update)
+            entries[key] = entry
+        return entries
+
+    if get_storage_backend() == "sqlite":
+        db = open_state_db()
+        try:
+            db.put_catalog(merged(db.get_catalog(by_key)))
+        finally:
+            db.close()
+    else:
+        index = _catalog()
+        index.update(merged({key: index.get(key) for key in by_key}))
+
+
+def lookup_article(url: str) -> Optional[Dict[str, Any]]:
+    """Catalog entry for an article URL (any tracking/trailing-slash variant), or None."""
+    key = catalog.catalog_key(url)
+    if get_storage_backend() == "sqlite":
+        db = open_state_db()
+        try:
+            return db.get_catalog([key]).get(key)
+        finally:
+            db.close()
+    return _catalog().get(key)
+
+
+def find_digest_article(url: str, date_str: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    An article's digest record, read at its catalogued byte offset.
+
+    Uses `date_str` if the article was logged that day, else its newest
+    day. Returns the record plus its `"date"`, or None.
+    """
+    entry = lookup_article(url)
+    day = catalog.latest_day(entry, date_str) if entry else None
+    if not day:
+        return None
+    record = DigestLog(get_rss_dir() / day).record_at(entry["days"][day])
+    if not record or catalog.catalog_key(record["article"].get("link", "")) != catalog.catalog_key(url):
+        return None
+    return dict(record, date=day)
+
+
+def find_full_article(url: str, date_str: Optional[str] = None) -> Optional[Path]:
+    """
+    Cached full article for a URL saved on any day (or on `date_str`).
+
+    Matches through the catalog's normalized key first, then the exact URL
+    in the full-article index for caches written before the catalog.
+    """
+    entry = lookup_article(url)
+    full = (entry or {}).get("full") or {}
+    if full.get("path") and (not date_str or full.get("date") == date_str):
+        path = Path(full["path"])
+        if path.exists():
+            return path
+    return lookup_full_article(url, date_str=date_str)
+
+
+def _full_index_entries() -> List[Dict[str, str]]:
+    if get_storage_backend() == "sqlite":
+        db = open_state_db()
+        try:
+            return list(db.full_articles())
+        finally:
+            db.close()
+    return [entry for _url_hash, entry in _full_index().items() if isinstance(entry, dict)]
+
+
+def _date_dirs() -> Iterator[Path]:
+    for path in sorted(get_rss_dir().iterdir()):
+        if path.is_dir() and re.fullmatch(r"\d{4}-\d{2}-\d{2}", path.name):
+            yield path
+
+
+def rebuild_catalog() -> Dict[str, int]:
+    """
+    Rebuild the catalog from every day's digest and the full-article index.
+
+    Backfills data written before the catalog existed; legacy digest.json
+    days are converted to logs on the way. Returns `{"days", "articles"}`.
+    """
+    updates: List[Dict[str, Any]] = []
+    days = 0
+    for date_dir in _date_dirs():
+        log = DigestLog(date_dir)
+        _import_legacy_digest(date_dir, log)
+        if not log.exists():
+            continue
+        days += 1
+        for offset, record in log.entries():
+            if record["article"].get("link"):
+                updates.append(catalog.digest_update(
+                    date_dir.name, offset, record.get("feed", ""), record.get("feed_url", ""), record["article"]
+                ))
+
+    if get_storage_backend() == "sqlite":
+        db = open_state_db()
+        try:
+            db.clear_catalog()
+        finally:
+            db.close()
+    else:
+        index = _catalog()
+        index.delete([key for key, _entry in index.items()])
+    updates.extend(
+        catalog.full_update(entry["url"], entry.get("date", ""), entry.get("path", ""))
+        for entry in _full_index_entries()
+        if entry.get("url")
+    )
+    update_catalog(updates)
+    return {"days": days, "articles": len({catalog.catalog_key(update["url"]) for update in updates})}
+
+
+def open_search_index() -> search_index.SearchIndex:
+    return search_index.SearchIndex(get_search_db_path())
+
+
+def _index_for_search(docs: List[Dict[str, str]]):
+    """Add documents to the search index (deferred inside `full_index_batch()`)."""
+    if not docs or not search_index.fts5_available():
+        return
+    with _full_index_lock:
+        if _search_pending is not None:
+            _search_pending.extend(docs)
+            return
+    _write_search_docs(docs)
+
+
+def _write_search_docs(docs: List[Dict[str, str]]):
+    index = open_search_index()
+    try:
+        index.add(docs)
+    finally:
+        index.close()
+
+
+def _digest_search_doc(date_str: str, record: Dict) -> Dict[str, str]:
+    article = record["article"]
+    return search_index.doc(
+        "digest",
+        catalog.catalog_key(article["link"]),
+        date=date_str,
+        feed=record.get("feed", ""),
+        title=article.get("title", ""),
+        url=article["link"],
+        text=clean_summary(article.get("summary", "")),
+    )
+
+
+def _read_saved_article(path: Path) -> Optional[Dict[str, str]]:
+    """Title, feed and text of a file written by `save_full_article`."""
+    try:
+        md = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    header, _sep, text = md.partition("\n---\n\n")
+    feed = re.search(r"^- \*\*来源\*\*: (.*)$", header, re.M)
+    return {
+        "title": header.split("\n", 1)[0].removeprefix("# ").strip(),
+        "feed": feed.group(1).strip() if feed else "",
+        "text": text,
+    }
 
-    seen_list = feed_state.get("seen_urls", [])
-    seen_set = set(seen_list)
 
-    for url in article_urls:
-        if url and url not in seen_set:
-            seen_list.append(url)
-            seen_set.add(url)
+def search_articles(query: str, **filters) -> List[Dict[str, Any]]:
+    """Run a full-text query (see `SearchIndex.search` for filters and result fields)."""
+    if not get_search_db_path().exists():
+        return []
+    index = open_search_index()
+    try:
+        return index.search(query, **filters)
+    finally:
+        index.close()
 
-    if len(seen_list) > 500:
-        seen_list = seen_list[-500:]
 
-    feed_state["seen_urls"] = seen_list
+def rebuild_search_index() -> Dict[str, int]:
+    """
+    Re-index every day's digest and every cached full article.
+
+    Backfills data written before the search index existed. Returns
+    `{"documents": n}`.
+    """
+    docs = []
+    for date_dir in _date_dirs():
+        for record in DigestLog(date_dir).records():
+            if record["article"].get("link"):
+                docs.append(_digest_search_doc(date_dir.name, record))
+
+    for entry in _full_index_entries():
+        saved = _read_saved_article(Path(entry.get("path") or ""))
+        if entry.get("url") and saved:
+            docs.append(search_index.doc(
+                "full", catalog.catalog_key(entry["url"]), date=entry.get("date", ""), url=entry["url"], **saved
+            ))
+
+    index = open_search_index()
+    try:
+        index.clear()
+        return {"documents": index.add(docs)}
+    finally:
+        index.close()
+
+
+def gc_full_index() -> Dict[str, int]:
+    """
+    Remove full-index entries whose cached file no longer exists.
+
+    Stale entries are deleted in bulk (one write per affected shard, or one
+    transaction). Returns `{"checked": n, "removed": n}`.
+    """
+    if get_storage_backend() == "sqlite":
+        db = open_state_db()
+        try:
+            entries = list(db.full_index_paths())
+            stale = [url_hash for url_hash, path in entries if not path or not Path(path).exists()]
+            db.delete_full_articles(stale)
+        finally:
+            db.close()
+    else:
+        index = _full_index()
+        entries = [(url_hash, (entry or {}).get("path")) for url_hash, entry in index.items()]
+        stale = [url_hash for url_hash, path in entries if not path or not Path(path).exists()]
+        index.delete(stale)
+    return {"checked": len(entries), "removed": len(stale)}
+
+
+def migrate_to_sqlite() -> Dict[str, int]:
+    """
+    One-shot migration of state.json (+ journal), the full-article index and
+    the article catalog into state.db.
+
+    The JSON files are renamed to `*.migrated` afterwards, which also makes
+    state.db the active backend. Returns the migrated counts.
+
+    Raises:
+        FileExistsError: state.db already exists.
+    """
+    db_path = get_state_db_path()
+    if db_path.exists():
+        raise FileExistsError(str(db_path))
+
+    state = load_json_state()
+    articles = load_full_index().get("articles", {})
+    entries = dict(_catalog().items())
+    db = sqlite_store.StateDB(db_path)
+    try:
+        db.write_feeds((url, *_db_row(feed_state)) for url, feed_state in state["feeds"].items())
+        db.index_full_articles(articles)
+        db.put_catalog(entries)
+    finally:
+        db.close()
+
+    for path in (get_state_path(), get_state_journal_path(), get_full_index_dir(), get_catalog_dir()):
+        if path.exists():
+            path.rename(path.with_name(path.name + ".migrated"))
+    return {"feeds": len(state["feeds"]), "articles": len(articles)}
+
+
+def get_seen_urls(state: Dict, feed_url: str) -> SeenSet:
+    """
+    Get the feed's already-seen article URLs.
+
+    Returns the live `SeenSet` (supports `url in seen`), not a copy.
+    """
+    feed_state = _ensure_feed_state(state, feed_url)
+    return feed_state["seen"]
+
+
+def mark_seen(state: Dict, feed_url: str, article_urls: List[str]):
+    """Mark article URLs as seen for a feed. Keeps the newest MAX_SEEN_URLS in order."""
+    feed_state = _changed_feed_state(state, feed_url)
+    added = feed_state["seen"].add(article_urls, limit=MAX_SEEN_URLS)
+    if added and isinstance(state, JournaledState):
+        state.pending[feed_url].extend(added)
     feed_state["last_fetch"] = datetime.now(timezone.utc).isoformat()
 
 
@@ -206,6 +857,47 @@ def get_feed_conditional_headers(state: Dict, feed_url: str) -> Dict[str, str]:
     return headers
 
 
+def get_feed_digests(state: Dict, feed_url: str) -> Dict[str, str]:
+    """Get the digests of the last parsed body and its entry-link list."""
+    feed_state = _ensure_feed_state(state, feed_url)
+    return {
+        "body_digest": feed_state.get("body_digest") or "",
+        "links_digest": feed_state.get("links_digest") or "",
+    }
+
+
+def update_feed_digests(
+    state: Dict,
+    feed_url: str,
+    *,
+    body_digest: Optional[str] = None,
+    links_digest: Optional[str] = None,
+):
+    """Persist content digests used to short-circuit unchanged feeds."""
+    feed_state = _changed_feed_state(state, feed_url)
+    if body_digest is not None:
+        feed_state["body_digest"] = body_digest
+    if links_digest is not None:
+        feed_state["links_digest"] = links_digest
+
+
+def get_feed_hub(state: Dict, feed_url: str) -> Optional[Tuple[str, str]]:
+    """The feed's advertised WebSub `(hub, topic)`, or None."""
+    feed_state = state.get("feeds", {}).get(feed_url) or {}
+    hub = feed_state.get("websub_hub") or ""
+    return (hub, feed_state.get("websub_topic") or feed_url) if hub else None
+
+
+def update_feed_hub(state: Dict, feed_url: str, hub: str, topic: str):
+    """Remember the WebSub hub a feed advertises (an empty hub clears it)."""
+    feed_state = _ensure_feed_state(state, feed_url)
+    if feed_state.get("websub_hub") == hub and feed_state.get("websub_topic") == topic:
+        return
+    feed_state = _changed_feed_state(state, feed_url)
+    feed_state["websub_hub"] = hub
+    feed_state["websub_topic"] = topic
+
+
 def update_feed_fetch_meta(
     state: Dict,
     feed_url: str,
@@ -218,7 +910,7 @@ def update_feed_fetch_meta(
     """
     Update feed fetch metadata fields persisted in state.json.
     """
-    feed_state = _ensure_feed_state(state, feed_url)
+    feed_state = _changed_feed_state(state, feed_url)
     if etag is not None:
         feed_state["etag"] = etag
     if last_modified is not None:
@@ -229,6 +921,138 @@ def update_feed_fetch_meta(
 
     failures = int(feed_state.get("consecutive_failures", 0))
     feed_state["consecutive_failures"] = failures + 1 if is_error else 0
+    if not is_error:
+        feed_state["quarantine_until"] = None
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def is_feed_due(state: Dict, feed_url: str, now: Optional[datetime] = None) -> bool:
+    """
+    Check whether a feed's learned next-due time has arrived.
+
+    Feeds without schedule metadata are always due.
+    """
+    feed_state = state.get("feeds", {}).get(feed_url) if isinstance(state.get("feeds"), Mapping) else None
+    if not feed_state:
+        return True
+    next_due = _parse_timestamp(feed_state.get("next_due"))
+    if next_due is None:
+        return True
+    now = now or datetime.now(timezone.utc)
+    return next_due <= now + timedelta(seconds=DUE_SLACK_SEC)
+
+
+def feed_next_due(state: Dict, feed_url: str) -> Optional[datetime]:
+    """
+    When the feed should be polled next: its learned next-due time, pushed
+    back to the end of a quarantine. None means it has no schedule yet.
+    """
+    feed_state = state.get("feeds", {}).get(feed_url) if isinstance(state.get("feeds"), Mapping) else None
+    if not feed_state:
+        return None
+    times = [
+        parsed
+        for parsed in (_parse_timestamp(feed_state.get("next_due")), _parse_timestamp(feed_state.get("quarantine_until")))
+        if parsed is not None
+    ]
+    return max(times) if times else None
+
+
+def schedule_next_fetch(
+    state: Dict,
+    feed_url: str,
+    *,
+    new_count: int,
+    min_interval_sec: int,
+    max_interval_sec: int,
+    hint_sec: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Learn from one successful poll and persist the feed's next-due time.
+
+    `hint_sec` is the publisher's refresh hint; None keeps the last known one.
+    Returns the chosen polling interval in seconds.
+    """
+    feed_state = _changed_feed_state(state, feed_url)
+    now = now or datetime.now(timezone.utc)
+
+    if hint_sec is not None:
+        feed_state["poll_hint_sec"] = int(hint_sec)
+
+    if new_count > 0:
+        last_new = _parse_timestamp(feed_state.get("last_new_at"))
+        since_last = (now - last_new).total_seconds() if last_new else None
+        feed_state["update_gap_ema"] = polling.update_gap_ema(feed_state.get("update_gap_ema"), since_last, new_count)
+        feed_state["last_new_at"] = now.isoformat()
+
+    interval = polling.next_interval(
+        previous_interval=feed_state.get("poll_interval_sec") or None,
+        gap_ema=feed_state.get("update_gap_ema"),
+        new_count=new_count,
+        hint_sec=int(feed_state.get("poll_hint_sec") or 0),
+        min_interval_sec=min_interval_sec,
+        max_interval_sec=max_interval_sec,
+    )
+    feed_state["poll_interval_sec"] = interval
+    feed_state["next_due"] = (now + timedelta(seconds=interval)).isoformat()
+    return interval
+
+
+def trip_feed_breaker(
+    state: Dict,
+    feed_url: str,
+    *,
+    threshold: int,
+    base_cooldown_sec: int,
+    max_cooldown_sec: int,
+    now: Optional[datetime] = None,
+) -> Optional[datetime]:
+    """
+    Quarantine a failing feed once `consecutive_failures` reaches `threshold`.
+
+    The cooldown doubles with every further failure (including failed
+    probes). Returns the quarantine end, or None if the breaker stays closed.
+    """
+    feed_state = _changed_feed_state(state, feed_url)
+    cooldown = polling.breaker_cooldown(
+        int(feed_state.get("consecutive_failures", 0)),
+        threshold=threshold,
+        base_cooldown_sec=base_cooldown_sec,
+        max_cooldown_sec=max_cooldown_sec,
+    )
+    if not cooldown:
+        return None
+    until = (now or datetime.now(timezone.utc)) + timedelta(seconds=cooldown)
+    feed_state["quarantine_until"] = until.isoformat()
+    return until
+
+
+def feed_breaker_state(state: Dict, feed_url: str, now: Optional[datetime] = None) -> str:
+    """
+    Return "closed" (healthy), "open" (quarantined) or "half_open" (cooldown
+    over, next fetch is a probe).
+    """
+    feed_state = state.get("feeds", {}).get(feed_url) if isinstance(state.get("feeds"), Mapping) else None
+    if not feed_state:
+        return "closed"
+    until = _parse_timestamp(feed_state.get("quarantine_until"))
+    if until is None:
+        return "closed"
+    if until > (now or datetime.now(timezone.utc)):
+        return "open"
+    return "half_open"
 
 
 def slugify(text: str, max_len: int = 60) -> str:
@@ -272,7 +1096,7 @@ def is_full_article_cached(date_str: str, feed_title: str, article_title: str) -
 
 
 def save_full_article(date_str: str, feed_title: str, article: Dict, content: str):
-    """Save full article content as markdown and index it."""
+    """Save full article content as markdown and index it for lookup and search."""
     path = article_file_path(date_str, feed_title, article.get("title", "untitled"))
     md = f"# {article.get('title', 'Untitled')}\n\n"
     md += f"- **来源**: {feed_title}\n"
@@ -288,110 +1112,231 @@ def save_full_article(date_str: str, feed_title: str, article: Dict, content: st
     article_url = article.get("link", "")
     if article_url:
         index_full_article(article_url, date_str, path)
+        _index_for_search([search_index.doc(
+            "full",
+            catalog.catalog_key(article_url),
+            date=date_str,
+            feed=feed_title,
+            title=article.get("title", ""),
+            url=article_url,
+            text=content,
+        )])
 
     return path
 
 
 def save_digest(date_str: str, articles_by_feed: Dict[str, Dict]) -> Path:
     """
-    Save daily digest markdown. Merges with existing digest if present.
+    Append the articles not yet in the day's digest to its log.
+
+    Only the new articles are written; dedupe reads the day's small link
+    index rather than the digest itself. Raw `content` bodies go to the
+    day's compressed body pack and records keep a `content_ref` (see
+    `load_article_content`). New records are added to the article catalog
+    with their byte offsets. `digest.md` is rendered lazily by
+    `read_digest`. Returns the log path.
     """
     date_dir = get_date_dir(date_str)
-    digest_path = date_dir / "digest.md"
-
-    existing = load_digest_data(date_str)
+    log = DigestLog(date_dir)
+    _import_legacy_digest(date_dir, log)
 
+    seen = log.keys()
+    records, keys = [], []
     for feed_title, feed_data in articles_by_feed.items():
-        if feed_title in existing:
-            existing_links = {a.get("link") for a in existing[feed_title]["articles"]}
-            for article in feed_data["articles"]:
-                if article.get("link") not in existing_links:
-                    existing[feed_title]["articles"].append(article)
-        else:
-            existing[feed_title] = feed_data
-
-    total_articles = sum(len(v["articles"]) for v in existing.values())
-
-    md = f"# RSS 日报 — {date_str}\n\n"
-
-    if total_articles == 0:
-        md += "*今日无新文章。*\n"
-    else:
-        for feed_title, feed_data in existing.items():
-            articles = feed_data["articles"]
-            if not articles:
+        for article in feed_data["articles"]:
+            key = digest_log.record_key(feed_title, article.get("link"))
+            if key in seen:
                 continue
+            seen.add(key)
+            keys.append(key)
+            records.append({"feed": feed_title, "feed_url": feed_data.get("feed_url", ""), "article": article})
+    _append_and_catalog(date_str, log, _pack_bodies(date_dir, records), keys)
+    return log.path
+
+
+def _append_and_catalog(date_str: str, log: DigestLog, records: List[Dict], keys: List[int]):
+    """Append records to the log, then add them to the catalog and the search index."""
+    offsets = log.append(records, keys)
+    linked = [(offset, record) for offset, record in zip(offsets, records) if record["article"].get("link")]
+    update_catalog([
+        catalog.digest_update(date_str, offset, record["feed"], record["feed_url"], record["article"])
+        for offset, record in linked
+    ])
+    _index_for_search([_digest_search_doc(date_str, record) for _offset, record in linked])
+
+
+def _pack_bodies(date_dir: Path, records: List[Dict]) -> List[Dict]:
+    """Move article `content` into the body pack, leaving a `content_ref`."""
+    with_content = [record for record in records if record["article"].get("content")]
+    refs = BodyPack(date_dir).put_many([record["article"]["content"] for record in with_content])
+    for record, ref in zip(with_content, refs):
+        article = {key: value for key, value in record["article"].items() if key != "content"}
+        article["content_ref"] = ref
+        record["article"] = article
+    return records
+
+
+def load_article_content(date_str: str, article: Dict) -> str:
+    """
+    Raw feed-supplied body of a digest article.
 
-            md += f"## {feed_title}\n\n"
-            for i, article in enumerate(articles, 1):
-                title = article.get("title", "Untitled")
-                link = article.get("link", "")
-                published = article.get("published", "")[:10] if article.get("published") else ""
-                summary = clean_summary(article.get("summary", ""))
-
-                md += f"{i}. **{title}**\n"
-                if published:
-                    md += f"   📅 {published}"
-                if link:
-                    md += f" | 🔗 [{shorten_url(link)}]({link})"
-                md += "\n"
-                if summary:
-                    short = summary[:400] + ("..." if len(summary) > 400 else "")
-                    md += f"   > {short}\n"
-                md += "\n"
-
-        md += "---\n"
-        feed_count = sum(1 for v in existing.values() if v["articles"])
-        md += f"*共抓取 {feed_count} 个源，{total_articles} 篇新文章*\n"
-
-    with open(digest_path, "w", encoding="utf-8") as f:
-        f.write(md)
+    Digest records point into the day's body pack; bodies are decompressed
+    only when asked for. Older digests stored `content` inline.
+    """
+    if "content_ref" in article:
+        return body_pack.read_body(get_rss_dir() / date_str, article["content_ref"])
+    return article.get("content", "")
+
+
+def _import_legacy_digest(date_dir: Path, log: DigestLog):
+    """Convert a day's digest.json into the log before appending to it."""
+    legacy_path = date_dir / "digest.json"
+    if log.exists() or not legacy_path.exists():
+        return
+    legacy = _load_legacy_digest(legacy_path)
+    records = [
+        {"feed": feed_title, "feed_url": feed_data.get("feed_url", ""), "article": article}
+        for feed_title, feed_data in legacy.items()
+        for article in feed_data.get("articles", [])
+    ]
+    keys = [digest_log.record_key(r["feed"], r["article"].get("link")) for r in records]
+    _append_and_catalog(date_dir.name, log, _pack_bodies(date_dir, records), keys)
+    legacy_path.replace(legacy_path.with_name("digest.json.migrated"))
+
+
+def _load_legacy_digest(path: Path) -> Dict[str, Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _digest_from_records(records) -> Dict[str, Dict]:
+    data: Dict[str, Dict] = {}
+    seen = set()
+    for record in records:
+        feed_title = record.get("feed", "")
+        article = record["article"]
+        # A crash between log and index writes can leave a duplicate.
+        key = (feed_title, article.get("link"))
+        if key in seen:
+            continue
+        seen.add(key)
+        feed = data.setdefault(feed_title, {"feed_url": record.get("feed_url", ""), "articles": []})
+        feed["articles"].append(article)
+    return data
 
-    _save_digest_data(date_str, existing)
 
-    return digest_path
+def load_digest_data(date_str: str) -> Dict[str, Dict]:
+    """Load a day's digest as {feed title: {"feed_url", "articles"}}, in first-seen order."""
+    date_dir = get_rss_dir() / date_str
+    log = DigestLog(date_dir)
+    if log.exists():
+        return _digest_from_records(log.records())
+    return _load_legacy_digest(date_dir / "digest.json")
 
 
-def _save_digest_data(date_str: str, articles_by_feed: Dict[str, Dict]):
-    """Save structured digest data as JSON for future merging."""
-    date_dir = get_date_dir(date_str)
-    data_path = date_dir / "digest.json"
+def render_digest(date_str: str, articles_by_feed: Dict[str, Dict]) -> str:
+    """Render a day's digest as markdown."""
+    total_articles = sum(len(v["articles"]) for v in articles_by_feed.values())
+    parts = [f"# RSS 日报 — {date_str}\n\n"]
+
+    if total_articles == 0:
+        parts.append("*今日无新文章。*\n")
+        return "".join(parts)
 
-    data = {}
     for feed_title, feed_data in articles_by_feed.items():
-        data[feed_title] = {
-            "feed_url": feed_data.get("feed_url", ""),
-            "articles": feed_data["articles"],
-        }
+        articles = feed_data["articles"]
+        if not articles:
+            continue
+
+        parts.append(f"## {feed_title}\n\n")
+        for i, article in enumerate(articles, 1):
+            title = article.get("title", "Untitled")
+            link = article.get("link", "")
+            published = article.get("published", "")[:10] if article.get("published") else ""
+            summary = clean_summary(article.get("summary", ""))
+
+            parts.append(f"{i}. **{title}**\n")
+            if published:
+                parts.append(f"   📅 {published}")
+            if link:
+                parts.append(f" | 🔗 [{shorten_url(link)}]({link})")
+            parts.append("\n")
+            if summary:
+                short = summary[:400] + ("..." if len(summary) > 400 else "")
+                parts.append(f"   > {short}\n")
+            parts.append("\n")
+
+    parts.append("---\n")
+    feed_count = sum(1 for v in articles_by_feed.values() if v["articles"])
+    parts.append(f"*共抓取 {feed_count} 个源，{total_articles} 篇新文章*\n")
+    return "".join(parts)
 
-    with open(data_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
 
+def read_digest(date_str: Optional[str] = None) -> Optional[str]:
+    """
+    Return a day's digest markdown, or None.
 
-def load_digest_data(date_str: str) -> Dict[str, Dict]:
-    """Load structured digest data from JSON for merging."""
+    digest.md is a render cache keyed by a hash of the log in digest.md.key;
+    it is re-rendered only after the log has changed. Days written before
+    the log existed keep their static digest.md.
+    """
+    if not date_str:
+        date_str = datetime.now().strftime("%Y-%m-%d")
     date_dir = get_rss_dir() / date_str
-    data_path = date_dir / "digest.json"
+    digest_path = date_dir / "digest.md"
+    log = DigestLog(date_dir)
+    try:
+        stat = log.path.stat()
+        log_key = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        log_key = None
+    rendered = _DIGEST_RENDERS.get(log.path)
+    if log_key is not None and rendered is not None and rendered[0] == log_key:
+        return rendered[1]
+    raw = log.read_bytes()
+    if not raw:
+        if digest_path.exists():
+            with open(digest_path, "r", encoding="utf-8") as f:
+                return f.read()
+        return None
 
-    if data_path.exists():
+    key = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    key_path = date_dir / "digest.md.key"
+    md = None
+    try:
+        if key_path.read_text(encoding="utf-8").strip() == key:
+            with open(digest_path, "r", encoding="utf-8") as f:
+                md = f.read()
+    except OSError:
+        pass
+
+    if md is None:
+        md = render_digest(date_str, _digest_from_records(log.records(raw)))
         try:
-            with open(data_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, KeyError):
-            pass
-
-    return {}
-
-
-def read_digest(date_str: Optional[str] = None) -> Optional[str]:
-    """Read a digest file, return content or None."""
-    if not date_str:
-        date_str = datetime.now().strftime("%Y-%m-%d")
-    digest_path = get_rss_dir() / date_str / "digest.md"
-    if digest_path.exists():
-        with open(digest_path, "r", encoding="utf-8") as f:
-            return f.read()
-    return None
+            _write_text_atomic(digest_path, md)
+            _write_text_atomic(key_path, key + "\n")
+        except OSError:
+            pass  # Serving the render matters more than caching it.
+    if log_key is not None:
+        _DIGEST_RENDERS[log.path] = (log_key, md)
+    return md
+
+
+def _write_text_atomic(path: Path, text: str):
+    # Per thread as well: `serve` renders digests on concurrent requests.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        tmp_path.replace(path)
+    except Exception:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
 
 
 def clean_summary(text: str) -> str:
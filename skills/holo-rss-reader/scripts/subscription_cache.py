@@ -0,0 +1,161 @@
+"""
+On-disk cache of subscription lists (Gist API responses and OPML URLs).
+
+Every `fetch`, `list` and `import` needs the subscription list, which
+rarely changes, while the GitHub API allows 60 unauthenticated requests an
+hour. Each source gets a small JSON manifest holding the already-parsed
+feed list and the response validators. Within the freshness TTL the
+manifest is used without any request. After that the source is revalidated
+with If-None-Match / If-Modified-Since, so an unchanged list costs one 304
+and no parsing. When the source cannot be reached, the last manifest is
+still used and the error is reported alongside it.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import http_client
+
+
+MANIFEST_VERSION = 1
+
+# (feeds, error_kind, error_message), as returned by the `gist` importers.
+ImportResult = Tuple[List[Dict], Optional[str], Optional[str]]
+
+# Parsed manifests by path, keyed by the file's (size, mtime), so `serve`
+# re-reads one only after it was rewritten.
+_LOADED: Dict[Path, Tuple[Tuple[int, int], Optional["Manifest"]]] = {}
+_loaded_lock = threading.Lock()
+
+
+@dataclass
+class Manifest:
+    source: str
+    feeds: List[Dict] = field(default_factory=list)
+    etag: str = ""
+    last_modified: str = ""
+    # When the source last answered (200 or 304), as a Unix timestamp.
+    checked_at: float = 0.0
+
+
+def manifest_path(cache_dir: Path, source: str) -> Path:
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+    return Path(cache_dir) / f"{digest}.json"
+
+
+def load(cache_dir: Path, source: str) -> Optional[Manifest]:
+    """The cached manifest for `source`, or None if missing or unreadable."""
+    path = manifest_path(cache_dir, source)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    key = (stat.st_size, stat.st_mtime_ns)
+    with _loaded_lock:
+        cached = _LOADED.get(path)
+        if cached is None or cached[0] != key:
+            cached = _LOADED[path] = (key, _read(path, source))
+    manifest = cached[1]
+    # `retrieve` updates `checked_at`; hand out a copy of the cached one.
+    return replace(manifest, feeds=list(manifest.feeds)) if manifest is not None else None
+
+
+def _read(path: Path, source: str) -> Optional[Manifest]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION or data.get("source") != source:
+        return None
+    feeds = data.get("feeds")
+    if not isinstance(feeds, list) or not feeds:
+        return None
+    return Manifest(
+        source=source,
+        feeds=feeds,
+        etag=str(data.get("etag") or ""),
+        last_modified=str(data.get("last_modified") or ""),
+        checked_at=float(data.get("checked_at") or 0.0),
+    )
+
+
+def save(cache_dir: Path, manifest: Manifest):
+    """Write a manifest atomically; failures only cost a refetch next time."""
+    path = manifest_path(cache_dir, manifest.source)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, **asdict(manifest)}, f, ensure_ascii=False)
+        tmp_path.replace(path)
+    except OSError:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def conditional_headers(manifest: Optional[Manifest]) -> Dict[str, str]:
+    headers = {}
+    if manifest is not None and manifest.etag:
+        headers["If-None-Match"] = manifest.etag
+    if manifest is not None and manifest.last_modified:
+        headers["If-Modified-Since"] = manifest.last_modified
+    return headers
+
+
+def retrieve(
+    source: str,
+    *,
+    cache_dir: Path,
+    ttl_sec: int,
+    fetch: Callable[[Dict[str, str]], http_client.HTTPResult],
+    parse: Callable[[str], ImportResult],
+    clock: Callable[[], float] = time.time,
+) -> ImportResult:
+    """
+    Return the feed list for `source` through its manifest.
+
+    `fetch(headers)` performs the (conditional) request and `parse(text)`
+    turns a 200 body into feeds. A manifest younger than `ttl_sec` is used
+    as is; `ttl_sec` = 0 always revalidates.
+    """
+    now = clock()
+    manifest = load(cache_dir, source)
+    if manifest is not None and 0 <= now - manifest.checked_at < ttl_sec:
+        return manifest.feeds, None, None
+
+    result = fetch(conditional_headers(manifest))
+    if result.ok and result.status_code == 304 and manifest is not None:
+        manifest.checked_at = now
+        save(cache_dir, manifest)
+        return manifest.feeds, None, None
+
+    if not result.ok:
+        feeds, error_kind, error_message = [], result.error_kind or "network", result.error or "Unknown error"
+    elif result.status_code == 304:
+        # Validators we did not send; nothing to reuse.
+        feeds, error_kind, error_message = [], "network", "Unexpected 304 without a cached list"
+    else:
+        feeds, error_kind, error_message = parse(result.text)
+
+    if feeds:
+        save(
+            cache_dir,
+            Manifest(
+                source=source,
+                feeds=feeds,
+                etag=result.headers.get("etag", ""),
+                last_modified=result.headers.get("last-modified", ""),
+                checked_at=now,
+            ),
+        )
+        return feeds, None, None
+    if manifest is not None:
+        checked = time.strftime("%Y-%m-%d %H:%M", time.localtime(manifest.checked_at))
+        return manifest.feeds, error_kind, f"{error_message} (using the list cached at {checked})"
+    return [], error_kind, error_message
@@ -1,14 +1,23 @@
 """
-URL validation helpers.
+URL validation and normalization helpers.
 """
 import ipaddress
+import re
 from typing import List, Optional, Tuple
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 
 
 MAX_URL_LENGTH = 2048
 ALLOWED_SCHEMES = {"http", "https"}
 
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track the click, never select the article.
+_TRACKING_PARAM = re.compile(
+    r"^(utm_[a-z_]+|fbclid|gclid|dclid|msclkid|yclid|igshid|mc_cid|mc_eid|_hsenc|_hsmi|mkt_tok|ref_src)$",
+    re.I,
+)
+
 
 def _is_ip_address(host: str) -> Tuple[bool, Optional[object]]:
     try:
@@ -88,3 +97,36 @@ def validate_url(
 
     return None
 
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL, used as a lookup key.
+
+    Lower-cases scheme and host, drops userinfo, default ports, the fragment,
+    tracking parameters and a trailing slash, and sorts the query. Returns
+    the stripped input unchanged if it is not an absolute URL.
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if not scheme or not host:
+        return url
+    if ":" in host:
+        host = f"[{host}]"
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAM.match(key)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
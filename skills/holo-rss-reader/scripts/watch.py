@@ -0,0 +1,249 @@
+"""
+Continuous polling for `watch` mode.
+
+Instead of fetching every feed in one burst from cron, `Watcher` keeps a
+heap of per-feed next-due times (the adaptive schedule and quarantine
+ends persisted by `store`). Each feed is handed to the per-host scheduler
+and a bounded thread pool when it comes due, and goes back on the heap at
+its freshly learned next-due time. Feeds already overdue at start-up are
+staggered over a spread window so they do not all start at once.
+
+Feeds whose WebSub hub pushes their updates (see `websub`) are kept off
+the heap until their lease ends; pushed bodies are handed in through
+`deliver()` and processed on the driving thread.
+"""
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import host_scheduler
+import pipeline
+import store
+
+
+# Longest single sleep, so feed-list refreshes and checkpoints keep running.
+MAX_WAIT_SEC = 30.0
+
+# While fetches run, completions are polled this often so `stop()` is noticed.
+STOP_CHECK_SEC = 1.0
+
+# Recent start lags kept for the summary percentiles.
+LAG_SAMPLES = 1024
+
+
+class Watcher:
+    """
+    Poll a changing set of feeds, each when it comes due.
+
+    Drive it from one thread with `run_until_stopped()` (or `step()`);
+    `on_result` runs on that thread with the same result dicts `fetch`
+    reports (marked `pushed` for content a hub delivered).
+    """
+
+    def __init__(
+        self,
+        run: pipeline.FetchRun,
+        *,
+        workers: int,
+        session,
+        on_result: Callable[[Dict], None],
+        per_host_limit: int = 4,
+        per_host_interval_sec: float = 0.0,
+        retry_interval_sec: float = 900.0,
+        push_until: Optional[Callable[[str], Optional[float]]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.run = run
+        self.workers = max(1, int(workers))
+        self.session = session
+        self.on_result = on_result
+        # Used when a feed has no future due time after a poll (schedule
+        # disabled, or an error that did not trip the breaker).
+        self.retry_interval_sec = retry_interval_sec
+        # Feed URL -> end of a push lease during which it is not polled.
+        self._push_until = push_until
+        self._clock = clock
+        self._hosts = host_scheduler.HostScheduler(
+            [], per_host_limit=per_host_limit, min_interval_sec=per_host_interval_sec
+        )
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._feeds: Dict[str, Dict] = {}
+        # (due, seq, url); an entry is live only while `_due[url]` still matches.
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, float] = {}
+        self._seq = itertools.count()
+        # Feeds handed to the host scheduler or the pool, with their due time.
+        self._active: Dict[str, float] = {}
+        self._in_flight: Dict[Future, Dict] = {}
+        self._stop = threading.Event()
+        # Set by `stop()` and `deliver()` to cut an idle wait short.
+        self._wake = threading.Event()
+        self._pushed: "queue.SimpleQueue[Tuple[str, str]]" = queue.SimpleQueue()
+
+        self.polls = 0
+        self.pushes = 0
+        self.peak_in_flight = 0
+        # Seconds between a feed coming due and its fetch starting.
+        self.start_lags: Deque[float] = deque(maxlen=LAG_SAMPLES)
+
+    @property
+    def scheduled(self) -> int:
+        return len(self._due)
+
+    def next_due(self, feed_url: str) -> Optional[float]:
+        return self._due.get(feed_url)
+
+    def _push(self, feed_url: str, due: float):
+        self._due[feed_url] = due
+        heapq.heappush(self._heap, (due, next(self._seq), feed_url))
+
+    def _stored_due(self, feed_url: str) -> float:
+        with self.run.state_lock:
+            due = store.feed_next_due(self.run.state, feed_url)
+        due_ts = due.timestamp() if due is not None else 0.0
+        pushed_until = self._push_until(feed_url) if self._push_until is not None else None
+        return max(due_ts, pushed_until or 0.0)
+
+    def set_feeds(self, feeds: List[Dict], *, spread_sec: float = 0.0):
+        """
+        Start polling feeds not seen before and stop polling missing ones.
+
+        New feeds whose due time has passed are staggered evenly over
+        `spread_sec` instead of all starting now.
+        """
+        now = self._clock()
+        current = {feed["url"]: feed for feed in feeds}
+        for feed_url in list(self._feeds):
+            if feed_url not in current:
+                del self._feeds[feed_url]
+                self._due.pop(feed_url, None)
+
+        overdue = []
+        for feed_url, feed_info in current.items():
+            known = feed_url in self._feeds
+            self._feeds[feed_url] = feed_info
+            if known or feed_url in self._active:
+                continue
+            due = self._stored_due(feed_url)
+            if due <= now:
+                overdue.append(feed_url)
+            else:
+                self._push(feed_url, due)
+        step = spread_sec / len(overdue) if overdue else 0.0
+        for i, feed_url in enumerate(overdue):
+            self._push(feed_url, now + i * step)
+
+    def _release_due(self, now: float):
+        while self._heap and self._heap[0][0] <= now:
+            due, _seq, feed_url = heapq.heappop(self._heap)
+            if self._due.get(feed_url) != due:
+                continue
+            stored = self._stored_due(feed_url)
+            if stored > now:
+                # Pushed to (or renewed its lease) since it was queued.
+                self._push(feed_url, stored)
+                continue
+            del self._due[feed_url]
+            self._active[feed_url] = due
+            self._hosts.add(self._feeds[feed_url])
+
+    def _dispatch(self, now: float):
+        while len(self._in_flight) < self.workers:
+            feed_info = self._hosts.pop_ready()
+            if feed_info is None:
+                break
+            feed_url = feed_info["url"]
+            with self.run.state_lock:
+                if store.feed_breaker_state(self.run.state, feed_url) == "half_open":
+                    self.run.probe_urls.add(feed_url)
+            self.start_lags.append(max(0.0, now - self._active[feed_url]))
+            future = self._pool.submit(pipeline.process_feed, self.run, feed_info, self.session)
+            self._in_flight[future] = feed_info
+        self.peak_in_flight = max(self.peak_in_flight, len(self._in_flight))
+
+    def deliver(self, feed_url: str, text: str):
+        """Queue a pushed feed body; safe to call from any thread."""
+        self._pushed.put((feed_url, text))
+        self._wake.set()
+
+    def _process_pushed(self):
+        while True:
+            try:
+                feed_url, text = self._pushed.get_nowait()
+            except queue.Empty:
+                return
+            feed_info = self._feeds.get(feed_url)
+            if feed_info is None:
+                continue
+            self.pushes += 1
+            result = pipeline.apply_pushed_content(self.run, feed_info, text)
+            result["pushed"] = True
+            self.on_result(result)
+
+    def _finish(self, future: Future):
+        feed_info = self._in_flight.pop(future)
+        feed_url = feed_info["url"]
+        result = future.result()
+        self._hosts.release(feed_info, throttle_sec=result.get("throttle_sec", 0.0))
+        self._active.pop(feed_url, None)
+        self.run.probe_urls.discard(feed_url)
+        self.polls += 1
+        if feed_url in self._feeds:
+            now = self._clock()
+            due = self._stored_due(feed_url)
+            self._push(feed_url, due if due > now else now + self.retry_interval_sec)
+        self.on_result(result)
+
+    def step(self, max_wait_sec: float = MAX_WAIT_SEC) -> int:
+        """
+        Start every fetch that is due, then wait up to `max_wait_sec` (less
+        if something comes due sooner) and report finished fetches.
+        Returns how many finished.
+        """
+        self._process_pushed()
+        now = self._clock()
+        self._release_due(now)
+        self._dispatch(now)
+
+        delays = [max_wait_sec]
+        if self._heap:
+            delays.append(self._heap[0][0] - now)
+        if self._hosts.pending and len(self._in_flight) < self.workers:
+            host_delay = self._hosts.next_delay()
+            if host_delay is not None:
+                delays.append(host_delay)
+        timeout = max(0.0, min(delays))
+
+        if not self._in_flight:
+            self._wake.wait(timeout)
+            self._wake.clear()
+            return 0
+        done, _pending = wait(self._in_flight, timeout=min(timeout, STOP_CHECK_SEC), return_when=FIRST_COMPLETED)
+        for future in done:
+            self._finish(future)
+        return len(done)
+
+    def run_until_stopped(self, *, between_steps: Optional[Callable[[], None]] = None):
+        """Keep stepping until `stop()`; `between_steps` runs after every step."""
+        while not self._stop.is_set():
+            self.step()
+            if between_steps is not None:
+                between_steps()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def close(self):
+        """Wait for fetches already running and report them; start no new ones."""
+        self._stop.set()
+        while self._in_flight:
+            done, _pending = wait(self._in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._finish(future)
+        self._pool.shutdown(wait=True)
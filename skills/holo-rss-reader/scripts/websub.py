@@ -0,0 +1,329 @@
+"""
+WebSub (PubSubHubbub) push subscriptions for `watch` mode.
+
+Feeds that advertise `<link rel="hub">` can push new entries instead of
+being polled. `discover` reads the hub and topic from a parsed feed,
+`Subscriber` sends (and renews) subscription requests and answers the
+hub's intent verification, and `CallbackServer` is the HTTP endpoint hubs
+talk to. Content the hub pushes is handed to `deliver(feed_url, text)`,
+which `watch` routes through the same parse → dedupe → digest path as a
+polled response.
+
+Leases live in memory only: after a restart every feed is polled again
+until its hub has re-verified a fresh subscription.
+"""
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import http_client
+import url_validator
+
+
+# Lease asked for when the config does not say otherwise.
+DEFAULT_LEASE_SEC = 24 * 3600
+
+# Renew a lease once less than this fraction of it is left.
+RENEW_FRACTION = 0.1
+
+# Wait this long before asking a hub again after a failed or unverified request.
+RETRY_SEC = 15 * 60
+
+# Largest pushed body accepted.
+MAX_PUSH_BYTES = 2 * 1024 * 1024
+
+SIGNATURE_ALGORITHMS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+
+def discover(feed_meta: Optional[Mapping]) -> Optional[Tuple[str, str]]:
+    """
+    Return `(hub_url, topic_url)` advertised by a parsed feed, or None.
+
+    The topic is the feed's `rel="self"` link, which is what hubs know it
+    by; it is empty when the feed has none, and `store.get_feed_hub` then
+    falls back to the URL the feed is fetched from.
+    """
+    hub = topic = ""
+    for link in (feed_meta or {}).get("links") or []:
+        rel = str(link.get("rel") or "").strip().lower()
+        href = str(link.get("href") or "").strip()
+        if not href.lower().startswith(("http://", "https://")):
+            continue
+        if rel == "hub" and not hub:
+            hub = href
+        elif rel == "self" and not topic:
+            topic = href
+    if not hub:
+        return None
+    return hub, topic
+
+
+def validate_hub(hub: str, topic: str, **security_opts) -> Optional[str]:
+    """
+    Why `hub`/`topic` may not be used, or None.
+
+    Both come from feed content, and `request` POSTs to the hub, so they
+    pass the same `security.mode`/`allowlist` checks as feed URLs.
+    """
+    for label, url in (("hub", hub), ("topic", topic)):
+        if label == "topic" and not url:
+            continue
+        error = url_validator.validate_url(url, **security_opts)
+        if error:
+            return f"{label} {url}: {error}"
+    return None
+
+
+def sign(secret: str, body: bytes, algorithm: str = "sha256") -> str:
+    """`X-Hub-Signature` value for `body`, as a hub computes it."""
+    digest = hmac.new(secret.encode("utf-8"), body, SIGNATURE_ALGORITHMS[algorithm]).hexdigest()
+    return f"{algorithm}={digest}"
+
+
+def verify_signature(secret: str, body: bytes, header: Optional[str]) -> bool:
+    algorithm, _sep, received = (header or "").strip().partition("=")
+    if algorithm.lower() not in SIGNATURE_ALGORITHMS or not received:
+        return False
+    return hmac.compare_digest(sign(secret, body, algorithm.lower()), f"{algorithm.lower()}={received.lower()}")
+
+
+@dataclass
+class Subscription:
+    feed_url: str
+    hub: str
+    topic: str
+    # Path segment of the callback URL; identifies the subscription.
+    token: str
+    secret: str
+    # new, pending (request accepted, awaiting verification), active, denied or failed
+    status: str = "new"
+    lease_until: float = 0.0
+    requested_at: float = 0.0
+    error: str = ""
+
+
+class Subscriber:
+    """
+    Subscription bookkeeping shared by `watch` and the callback server.
+
+    All methods are thread-safe; hub requests are sent without holding the
+    lock because hubs may verify intent before answering them.
+    """
+
+    def __init__(
+        self,
+        callback_url: str,
+        *,
+        deliver: Callable[[str, str], None],
+        session=None,
+        lease_sec: int = DEFAULT_LEASE_SEC,
+        timeout: Tuple[int, int] = (5, 10),
+        max_push_bytes: int = MAX_PUSH_BYTES,
+        security_opts: Optional[Mapping] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.callback_url = callback_url.rstrip("/")
+        self.deliver = deliver
+        self.session = session
+        self.lease_sec = lease_sec
+        self.timeout = timeout
+        self.max_push_bytes = max_push_bytes
+        self.security_opts = dict(security_opts or {})
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._by_feed: Dict[str, Subscription] = {}
+        self._by_token: Dict[str, Subscription] = {}
+        self.pushes = 0
+        self.rejected = 0
+
+    def track(self, feed_url: str, hub: str, topic: str) -> bool:
+        """
+        Subscribe `feed_url` through `hub` on the next `maintain()`.
+
+        Returns False, and forgets the feed, if the hub or topic fails the
+        security checks; the feed is then polled as usual.
+        """
+        if validate_hub(hub, topic, **self.security_opts):
+            self.forget(feed_url)
+            return False
+        with self._lock:
+            current = self._by_feed.get(feed_url)
+            if current is not None and (current.hub, current.topic) == (hub, topic):
+                return True
+            if current is not None:
+                del self._by_token[current.token]
+            sub = Subscription(
+                feed_url=feed_url, hub=hub, topic=topic, token=secrets.token_urlsafe(16), secret=secrets.token_hex(20)
+            )
+            self._by_feed[feed_url] = sub
+            self._by_token[sub.token] = sub
+        return True
+
+    def forget(self, feed_url: str):
+        """Stop accepting pushes for a feed; its lease lapses at the hub."""
+        with self._lock:
+            sub = self._by_feed.pop(feed_url, None)
+            if sub is not None:
+                del self._by_token[sub.token]
+
+    def subscription(self, feed_url: str) -> Optional[Subscription]:
+        with self._lock:
+            return self._by_feed.get(feed_url)
+
+    def push_until(self, feed_url: str) -> Optional[float]:
+        """End of the feed's verified lease, or None while it must be polled."""
+        with self._lock:
+            sub = self._by_feed.get(feed_url)
+            if sub is None or sub.status != "active" or sub.lease_until <= self._clock():
+                return None
+            return sub.lease_until
+
+    @property
+    def active_count(self) -> int:
+        now = self._clock()
+        with self._lock:
+            return sum(1 for sub in self._by_feed.values() if sub.status == "active" and sub.lease_until > now)
+
+    def callback_for(self, sub: Subscription) -> str:
+        return f"{self.callback_url}/{sub.token}"
+
+    def _needs_request(self, sub: Subscription, now: float) -> bool:
+        if sub.status == "new":
+            return True
+        if sub.status == "active":
+            margin = self.lease_sec * RENEW_FRACTION
+            return sub.lease_until - now <= margin and now - sub.requested_at >= min(RETRY_SEC, margin)
+        return now - sub.requested_at >= RETRY_SEC
+
+    def maintain(self) -> int:
+        """Send subscribe requests that are due (new, expiring, or retrying). Returns how many were sent."""
+        now = self._clock()
+        with self._lock:
+            due = [sub for sub in self._by_feed.values() if self._needs_request(sub, now)]
+            for sub in due:
+                sub.requested_at = now
+        for sub in due:
+            self.request(sub)
+        return len(due)
+
+    def request(self, sub: Subscription) -> http_client.HTTPResult:
+        """Ask the hub to (re)subscribe; the lease starts once it verifies intent."""
+        form = {
+            "hub.mode": "subscribe",
+            "hub.topic": sub.topic,
+            "hub.callback": self.callback_for(sub),
+            "hub.lease_seconds": str(self.lease_sec),
+            "hub.secret": sub.secret,
+        }
+        result = http_client.post_form(sub.hub, form, session=self.session, timeout=self.timeout)
+        with self._lock:
+            if result.ok:
+                # Verification may already have arrived while the hub answered.
+                if sub.status != "active":
+                    sub.status = "pending"
+                sub.error = ""
+            else:
+                if sub.status != "active":
+                    sub.status = "failed"
+                sub.error = result.error or "subscription request failed"
+        return result
+
+    def verify(self, token: str, params: Mapping[str, str]) -> Tuple[int, str]:
+        """Answer a hub's verification of intent (GET on the callback)."""
+        mode = params.get("hub.mode", "")
+        with self._lock:
+            sub = self._by_token.get(token)
+            if sub is None or params.get("hub.topic") != sub.topic:
+                return 404, ""
+            if mode == "denied":
+                sub.status = "denied"
+                sub.lease_until = 0.0
+                sub.error = params.get("hub.reason", "")
+                return 200, ""
+            challenge = params.get("hub.challenge", "")
+            if mode != "subscribe" or not challenge:
+                # Only subscriptions are requested; refuse anything else.
+                return 404, ""
+            try:
+                lease_sec = int(params.get("hub.lease_seconds") or self.lease_sec)
+            except ValueError:
+                lease_sec = self.lease_sec
+            sub.status = "active"
+            sub.lease_until = self._clock() + max(1, lease_sec)
+            sub.error = ""
+            return 200, challenge
+
+    def receive(self, token: str, body: bytes, headers: Mapping[str, str]) -> int:
+        """Accept pushed content (POST on the callback); returns the HTTP status."""
+        with self._lock:
+            sub = self._by_token.get(token)
+            if sub is None or sub.status not in ("active", "pending"):
+                return 410 if sub is not None else 404
+            feed_url, secret = sub.feed_url, sub.secret
+        if not verify_signature(secret, body, headers.get("X-Hub-Signature")):
+            # The spec asks for a 2xx anyway, so a forger learns nothing.
+            with self._lock:
+                self.rejected += 1
+            return 202
+        content_type = headers.get("Content-Type") or ""
+        charset = content_type.partition("charset=")[2].split(";")[0].strip(" \"'") or None
+        self.deliver(feed_url, http_client.decode_body(body, charset))
+        with self._lock:
+            self.pushes += 1
+        return 202
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    server_version = "HoloRSSWebSub/1.0"
+
+    def _token(self) -> str:
+        return urlsplit(self.path).path.rstrip("/").rpartition("/")[2]
+
+    def _reply(self, status: int, body: str = ""):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        params = {key: values[0] for key, values in query.items()}
+        self._reply(*self.server.subscriber.verify(self._token(), params))
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > self.server.subscriber.max_push_bytes:
+            self._reply(413)
+            return
+        body = self.rfile.read(length)
+        self._reply(self.server.subscriber.receive(self._token(), body, self.headers))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CallbackServer(ThreadingHTTPServer):
+    """HTTP endpoint for hub verifications and content pushes."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], subscriber: Subscriber):
+        self.subscriber = subscriber
+        super().__init__(address, _CallbackHandler)
+
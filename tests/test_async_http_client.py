@@ -0,0 +1,168 @@
+﻿"""
+Tests for the asyncio HTTP client used by the async fetch engine.
+"""
+import asyncio
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import async_http_client
+import http_client
+
+
+RSS_BODY = (Path(__file__).parent.parent / "fixtures" / "sample_rss.xml").read_bytes()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def log_message(self, *_args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if "Transfer-Encoding" not in (headers or {}):
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        _Handler.hits[self.path] = _Handler.hits.get(self.path, 0) + 1
+        if self.path == "/feed.xml":
+            self._send(200, RSS_BODY, {"Content-Type": "application/rss+xml; charset=utf-8", "ETag": '"v1"'})
+        elif self.path == "/conditional.xml":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, headers={"ETag": '"v1"'})
+            else:
+                self._send(200, RSS_BODY, {"ETag": '"v1"'})
+        elif self.path == "/gzip.xml":
+            self._send(200, gzip.compress(RSS_BODY), {"Content-Encoding": "gzip"})
+        elif self.path == "/chunked.xml":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(RSS_BODY), 100):
+                chunk = RSS_BODY[start:start + 100]
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path.startswith("/echo/"):
+            self._send(200, self.path.encode("ascii"), {"Content-Type": "text/plain; charset=utf-8"})
+        elif self.path == "/redirect-cjk":
+            # Raw UTF-8 bytes on the wire, as some servers send them.
+            self._send(302, headers={"Location": "/echo/新闻?q=订阅".encode("utf-8").decode("latin-1")})
+        elif self.path == "/redirect":
+            self._send(302, headers={"Location": "/feed.xml"})
+        elif self.path == "/flaky":
+            self._send(503 if _Handler.hits[self.path] == 1 else 200, b"ok")
+        elif self.path == "/error":
+            self._send(500, b"boom")
+        elif self.path == "/latin1":
+            self._send(200, "café".encode("latin-1"), {"Content-Type": "text/plain; charset=iso-8859-1"})
+        else:
+            self._send(404)
+
+
+@pytest.fixture
+def server():
+    _Handler.hits = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _fetch(url, **kwargs):
+    return asyncio.run(async_http_client.fetch_text(url, timeout=(2, 2), **kwargs))
+
+
+def test_fetch_text_reads_body_and_lowercases_headers(server):
+    result = _fetch(f"{server}/feed.xml")
+
+    assert result.ok is True
+    assert result.status_code == 200
+    assert result.headers["etag"] == '"v1"'
+    assert result.text == RSS_BODY.decode("utf-8")
+
+
+def test_fetch_text_handles_gzip_chunked_and_redirect(server):
+    for path in ("/gzip.xml", "/chunked.xml", "/redirect"):
+        result = _fetch(f"{server}{path}")
+        assert result.ok is True, path
+        assert "<rss" in result.text, path
+
+
+def test_fetch_text_returns_304_for_conditional_request(server):
+    result = _fetch(f"{server}/conditional.xml", headers={"If-None-Match": '"v1"'})
+
+    assert result.ok is True
+    assert result.status_code == 304
+    assert result.text == ""
+
+
+def test_fetch_text_retries_server_errors(server):
+    result = _fetch(f"{server}/flaky", retries=1)
+    assert result.ok is True
+    assert _Handler.hits["/flaky"] == 2
+
+    result = _fetch(f"{server}/error", retries=0)
+    assert result.ok is False
+    assert result.error == "HTTP 500"
+    assert result.error_kind == "network"
+
+
+def test_fetch_text_enforces_max_bytes(server):
+    result = _fetch(f"{server}/feed.xml", max_bytes=64)
+
+    assert result.ok is False
+    assert "exceeds max size" in result.error
+
+
+def test_fetch_text_uses_header_charset(server):
+    result = _fetch(f"{server}/latin1")
+    assert result.text == "café"
+
+
+def test_fetch_text_reports_connection_errors():
+    result = _fetch("http://127.0.0.1:9/unreachable", retries=0)
+
+    assert result.ok is False
+    assert result.error.startswith("Network error:")
+    assert result.error_kind == "network"
+
+
+def test_non_ascii_urls_are_sent_like_the_threaded_client(server):
+    url = f"{server}/echo/新闻/第一篇?q=订阅&x=%E2%9C%93"
+    session = http_client.build_session(retries=0)
+    try:
+        threaded = http_client.fetch_text(url, session=session, timeout=(2, 2))
+    finally:
+        session.close()
+    result = _fetch(url)
+
+    assert result.ok is True
+    assert result.text == threaded.text
+    assert result.text == "/echo/%E6%96%B0%E9%97%BB/%E7%AC%AC%E4%B8%80%E7%AF%87?q=%E8%AE%A2%E9%98%85&x=%E2%9C%93"
+
+    redirected = _fetch(f"{server}/redirect-cjk")
+    assert redirected.text == "/echo/%E6%96%B0%E9%97%BB?q=%E8%AE%A2%E9%98%85"
+
+
+def test_idn_hosts_are_punycoded():
+    assert async_http_client._ascii_host("例え.jp") == "xn--r8jz45g.jp"
+    assert async_http_client._ascii_host("example.com") == "example.com"
+    with pytest.raises(ValueError):
+        async_http_client._ascii_host("é" * 64 + ".com")
@@ -0,0 +1,116 @@
+﻿"""
+Tests for the per-feed failure circuit breaker.
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import config
+import exit_codes
+import main
+import polling
+import store
+
+
+BREAKER = {"threshold": 3, "base_cooldown_sec": 3600, "max_cooldown_sec": 4 * 3600}
+NOW = datetime(2026, 3, 8, 12, 0, 0, tzinfo=timezone.utc)
+URL = "https://broken.example.com/feed.xml"
+
+
+def _fail(state, url, now=NOW):
+    store.update_feed_fetch_meta(state, url, status="error", is_error=True)
+    return store.trip_feed_breaker(state, url, now=now, **BREAKER)
+
+
+def test_breaker_cooldown_grows_exponentially_and_caps():
+    assert polling.breaker_cooldown(2, threshold=3, base_cooldown_sec=60, max_cooldown_sec=600) == 0
+    assert polling.breaker_cooldown(3, threshold=3, base_cooldown_sec=60, max_cooldown_sec=600) == 60
+    assert polling.breaker_cooldown(4, threshold=3, base_cooldown_sec=60, max_cooldown_sec=600) == 120
+    assert polling.breaker_cooldown(50, threshold=3, base_cooldown_sec=60, max_cooldown_sec=600) == 600
+
+
+def test_breaker_opens_half_opens_and_closes_on_success():
+    state = {"feeds": {}}
+    assert _fail(state, URL) is None
+    assert _fail(state, URL) is None
+    until = _fail(state, URL)
+    assert until == NOW + timedelta(hours=1)
+
+    assert store.feed_breaker_state(state, URL, now=NOW) == "open"
+    assert store.feed_breaker_state(state, URL, now=NOW + timedelta(minutes=61)) == "half_open"
+
+    # A failed probe re-opens with a doubled cooldown.
+    assert _fail(state, URL) == NOW + timedelta(hours=2)
+
+    store.update_feed_fetch_meta(state, URL, status="ok")
+    assert store.feed_breaker_state(state, URL, now=NOW) == "closed"
+    assert state["feeds"][URL]["consecutive_failures"] == 0
+
+
+def test_breaker_settings_from_config():
+    cfg = config.normalize_config({"breaker": {"threshold": 0, "base_cooldown_min": 30, "max_cooldown_min": 10}})
+    assert cfg["breaker"]["threshold"] == 1
+    assert cfg["breaker"]["max_cooldown_min"] == 30
+    assert polling.breaker_settings(cfg) == {"threshold": 1, "base_cooldown_sec": 1800, "max_cooldown_sec": 1800}
+    assert polling.breaker_settings(config.normalize_config({"breaker": {"enabled": False}})) is None
+
+
+def test_cmd_fetch_skips_quarantined_and_probes_expired(monkeypatch, capsys):
+    cfg = config.normalize_config({"breaker": {"threshold": 1}})
+    feeds = [
+        {"title": "open", "url": "https://open.example.com/feed.xml"},
+        {"title": "probe", "url": "https://probe.example.org/feed.xml"},
+    ]
+    state = {"feeds": {}}
+    now = datetime.now(timezone.utc)
+    for _ in range(BREAKER["threshold"]):
+        _fail(state, feeds[0]["url"], now=now)
+        _fail(state, feeds[1]["url"], now=now - timedelta(days=1))
+
+    calls = {}
+
+    def fake_fetch(url, **kwargs):
+        calls[url] = kwargs
+        return None, "boom", SimpleNamespace(status_code=500, etag="", last_modified="", error_kind="network")
+
+    monkeypatch.setattr(main.feeds_mod, "collect_all_feeds_detailed", lambda *_a, **_k: (feeds, None, None))
+    monkeypatch.setattr(main.fetcher, "fetch_feed_detailed", fake_fetch)
+    monkeypatch.setattr(main.store, "load_state", lambda: state)
+    monkeypatch.setattr(main.store, "save_state", lambda _state: None)
+
+    assert main.cmd_fetch("", 10, 2, cfg, object()) == exit_codes.OK
+    out = capsys.readouterr().out
+    assert list(calls) == [feeds[1]["url"]]
+    probe = calls[feeds[1]["url"]]
+    assert probe["retries"] == 0
+    assert probe["read_timeout_sec"] <= polling.PROBE_READ_TIMEOUT_SEC
+    assert "quarantined=1" in out
+    assert store.feed_breaker_state(state, feeds[1]["url"]) == "open"
+
+    calls.clear()
+    assert main.cmd_fetch("", 10, 2, cfg, object(), force=True) == exit_codes.OK
+    assert sorted(calls) == sorted(f["url"] for f in feeds)
+    assert all(kwargs["retries"] == cfg["network"]["retries"] for kwargs in calls.values())
+
+
+def test_cmd_feeds_health_lists_failing_feeds(monkeypatch, capsys):
+    state = {"feeds": {}}
+    for _ in range(3):
+        _fail(state, URL, now=datetime.now(timezone.utc))
+    store.update_feed_fetch_meta(state, "https://ok.example.com/feed.xml", status="ok")
+
+    monkeypatch.setattr(main.store, "load_state", lambda: state)
+    monkeypatch.setattr(main.feeds_mod, "load_local_feeds", lambda: [{"title": "Broken", "url": URL}])
+
+    assert main.cmd_feeds_health() == exit_codes.OK
+    out = capsys.readouterr().out
+    assert "tracked=2 healthy=1 quarantined=1" in out
+    assert "Broken" in out
+    assert "failures=3" in out
+    assert "ok.example.com" not in out
+
+    assert main.cmd_feeds_health(show_all=True) == exit_codes.OK
+    assert "ok.example.com" in capsys.readouterr().out
@@ -0,0 +1,127 @@
+﻿"""
+Tests for the global article catalog and the commands that resolve articles through it.
+"""
+from pathlib import Path
+import json
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import exit_codes
+import full_article
+import main
+import store
+import url_validator
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        "https://blog.example.com/posts/1",
+        "HTTPS://Blog.Example.COM:443/posts/1/",
+        "https://blog.example.com/posts/1?utm_source=rss&utm_medium=feed#comments",
+        "https://user@blog.example.com/posts/1?fbclid=abc",
+    ],
+)
+def test_normalize_url_collapses_variants(variant):
+    assert url_validator.normalize_url(variant) == "https://blog.example.com/posts/1"
+
+
+def test_normalize_url_keeps_meaningful_differences():
+    assert url_validator.normalize_url("https://e.com/p?b=2&a=1") == "https://e.com/p?a=1&b=2"
+    assert url_validator.normalize_url("http://e.com:8080/") == "http://e.com:8080/"
+    assert url_validator.normalize_url("https://e.com/p?id=1") != url_validator.normalize_url("https://e.com/p?id=2")
+    assert url_validator.normalize_url("not a url") == "not a url"
+
+
+def _save(date_str, links, feed="Blog", **extra):
+    articles = [{"title": f"Post {link}", "link": f"https://blog.example.com/{link}", **extra} for link in links]
+    store.save_digest(date_str, {feed: {"feed_url": "https://blog.example.com/feed", "articles": articles}})
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_catalog_tracks_days_offsets_and_full_path(monkeypatch, tmp_path, backend):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("RSS_STORAGE_BACKEND", backend)
+
+    _save("2026-04-18", ["a", "b"])
+    _save("2026-04-19", ["c", "b"], content="<p>Feed copy</p>")
+
+    entry = store.lookup_article("https://Blog.example.com/b/?utm_campaign=x")
+    assert entry["feed"] == "Blog" and entry["title"] == "Post b"
+    assert list(entry["days"]) == ["2026-04-18", "2026-04-19"]
+
+    # Offsets point at the article's own line in each day's log.
+    for date_str, offset in entry["days"].items():
+        with open(tmp_path / date_str / "digest.ndjson", "rb") as f:
+            f.seek(offset)
+            assert json.loads(f.readline())["article"]["link"] == "https://blog.example.com/b"
+
+    record = store.find_digest_article("https://blog.example.com/b")
+    assert record["date"] == "2026-04-19"
+    assert store.load_article_content(record["date"], record["article"]) == "<p>Feed copy</p>"
+    assert store.find_digest_article("https://blog.example.com/b", "2026-04-18")["date"] == "2026-04-18"
+    assert store.find_digest_article("https://blog.example.com/missing") is None
+
+    path = store.save_full_article("2026-04-19", "Blog", {"title": "Post b", "link": "https://blog.example.com/b"}, "x")
+    assert store.lookup_article("https://blog.example.com/b")["full"] == {"date": "2026-04-19", "path": str(path)}
+    assert store.find_full_article("https://blog.example.com/b/#top") == path
+    assert store.find_full_article("https://blog.example.com/b", date_str="2026-04-18") is None
+
+
+def test_fallback_reads_one_record_instead_of_scanning_the_day(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    _save("2026-04-18", ["walled"], feed="WeChat", content="<p>From the feed</p>")
+    monkeypatch.setattr(store, "load_digest_data", lambda *_a: pytest.fail("scanned the digest"))
+
+    batch = full_article.FullBatch(date_str="2026-04-20", net={}, max_bytes=0)
+    assert batch.fallback_content("https://blog.example.com/walled?utm_source=x") == (
+        "From the feed", "WeChat", "Post walled"
+    )
+
+
+def test_rebuild_backfills_legacy_days_and_full_index(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    day = tmp_path / "2026-03-01"
+    day.mkdir()
+    legacy = {"Old": {"feed_url": "https://old.example.com/feed", "articles": [
+        {"title": "Legacy", "link": "https://old.example.com/1"},
+    ]}}
+    (day / "digest.json").write_text(json.dumps(legacy), encoding="utf-8")
+    article = tmp_path / "legacy.md"
+    article.write_text("# Legacy", encoding="utf-8")
+    store._full_index().update({store._url_hash("https://old.example.com/1"): {
+        "url": "https://old.example.com/1", "date": "2026-03-01", "path": str(article), "updated_at": "",
+    }})
+    assert store.lookup_article("https://old.example.com/1") is None
+
+    assert main.cmd_storage_reindex() == exit_codes.OK
+    assert "1 articles from 1 days" in capsys.readouterr().out
+    entry = store.lookup_article("https://old.example.com/1")
+    assert entry["feed"] == "Old" and list(entry["days"]) == ["2026-03-01"]
+    assert entry["full"]["path"] == str(article)
+    assert (day / "digest.json.migrated").exists()
+
+
+def test_lookup_history_and_full_resolve_without_a_date(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    _save("2026-04-18", ["a"])
+    path = store.save_full_article("2026-04-18", "Blog", {"title": "Post a", "link": "https://blog.example.com/a"}, "x")
+    capsys.readouterr()
+
+    assert main.cmd_lookup("https://blog.example.com/a/") == exit_codes.OK
+    out = capsys.readouterr().out
+    assert "📰 Post a" in out and "日报: 2026-04-18" in out and f"全文: {path}" in out
+
+    assert main.cmd_history("https://blog.example.com/a") == exit_codes.OK
+    out = capsys.readouterr().out
+    assert "收录于 2026-04-18" in out and "# RSS 日报 — 2026-04-18" in out
+
+    cfg = main.config_mod.normalize_config({})
+    assert main.cmd_full("https://blog.example.com/a?utm_source=x", None, cfg, session=None) == exit_codes.OK
+    assert f"全文已缓存: {path}" in capsys.readouterr().out
+
+    assert main.cmd_lookup("https://blog.example.com/unknown") == exit_codes.OK
+    assert "没有该文章的记录" in capsys.readouterr().out
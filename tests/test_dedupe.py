@@ -0,0 +1,227 @@
+﻿"""
+Tests for cross-feed near-duplicate detection.
+"""
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import config
+import dedupe
+import exit_codes
+import full_article
+import main
+import pipeline
+import store
+
+
+STORY = {
+    "title": "OpenAI releases GPT-6 with native video understanding",
+    "link": "https://openai.example.com/blog/gpt-6",
+    "summary": "<p>The new model plans over long horizons, calls tools in parallel and "
+               "understands hour-long videos. It is available to API customers today.</p>",
+}
+
+
+def test_simhash_keeps_rewordings_close_and_distinct_stories_apart():
+    repost = {
+        "title": "OpenAI releases GPT-6 with native video understanding!",
+        "link": "https://aggregator.example.com/item/991",
+        "summary": "The new model plans over long horizons, calls tools in parallel and "
+                   "understands hour-long videos. It is available to API customers today. Read more…",
+    }
+    other = {
+        "title": "Rust 2026 edition stabilizes async closures",
+        "link": "https://blog.example.com/rust",
+        "summary": "The edition also changes how temporaries in tail expressions are dropped.",
+    }
+    _, original, title = dedupe.article_fingerprints(STORY)
+    _, near, repost_title = dedupe.article_fingerprints(repost)
+    _, far, _ = dedupe.article_fingerprints(other)
+    assert dedupe.hamming(original, near) <= 6 and title == repost_title
+    assert dedupe.hamming(original, far) > 12
+
+    assert dedupe.simhash("too short") == 0
+    assert dedupe.simhash("多模态智能体发布") != 0
+
+
+def test_band_lookup_finds_every_hash_within_the_distance():
+    rng = random.Random(7)
+    index = dedupe.DedupeIndex(max_distance=4)
+    stored = [rng.getrandbits(64) | 1 for _ in range(2000)]
+    for i, sim in enumerate(stored):
+        index._insert((i, sim, 1, 2, index.today))
+
+    for sim in stored[:200]:
+        flipped = sim
+        for bit in rng.sample(range(64), rng.randint(0, 4)):
+            flipped ^= 1 << bit
+        assert index._is_duplicate(-1, flipped, 1, 3)
+        # Same feed, or different numbers in the title: never a copy.
+        assert not index._is_duplicate(-1, flipped, 1, 2)
+        assert not index._is_duplicate(-1, flipped, 9, 3)
+    for _ in range(200):
+        probe = rng.getrandbits(64) | 1
+        expected = any(dedupe.hamming(probe, sim) <= 4 for sim in stored)
+        assert index._is_duplicate(-1, probe, 1, 3) == expected
+
+
+def _meta():
+    return SimpleNamespace(status_code=200, etag="", last_modified="", error_kind=None, body_digest=None)
+
+
+def test_copies_from_other_feeds_are_left_out_of_the_digest_but_marked_seen():
+    run = pipeline.FetchRun(state={"feeds": {}}, limit=10, net_opts={}, security_opts={})
+    run.dedupe_index = dedupe.DedupeIndex()
+    first_feed = {"title": "OpenAI", "url": "https://openai.example.com/feed"}
+    second_feed = {"title": "Aggregator", "url": "https://aggregator.example.com/feed"}
+    tracked = dict(STORY, link=STORY["link"] + "/?utm_source=aggregator")
+    fresh = {"title": "Unrelated", "link": "https://aggregator.example.com/other", "summary": ""}
+
+    first = pipeline.apply_parsed_outcome(run, first_feed, {"articles": [STORY], "hint_sec": 0}, None, _meta())
+    assert first["new_count"] == 1 and first["dup_count"] == 0
+
+    second = pipeline.apply_parsed_outcome(
+        run, second_feed, {"articles": [tracked, fresh], "hint_sec": 0}, None, _meta()
+    )
+    assert second["new_count"] == 1 and second["dup_count"] == 1
+    assert run.articles_by_feed["Aggregator"]["articles"] == [fresh]
+    seen = store.get_seen_urls(run.state, second_feed["url"])
+    assert fresh["link"] in seen and tracked["link"] in seen
+
+    # Once the index has forgotten the story, the copy must not come back as new.
+    run.dedupe_index = dedupe.DedupeIndex(today=date.today() + timedelta(days=30))
+    run.articles_by_feed.clear()
+    again = pipeline.apply_parsed_outcome(run, second_feed, {"articles": [tracked], "hint_sec": 0}, None, _meta())
+    assert again["new_count"] == 0 and again["dup_count"] == 0 and again["skip_count"] == 1
+    assert "Aggregator" not in run.articles_by_feed
+
+
+def test_reworded_titles_and_url_variants_from_other_feeds_are_copies():
+    index = dedupe.DedupeIndex()
+    assert index.filter([STORY], "https://openai.example.com/feed") == ([STORY], 0)
+
+    reworded = dict(STORY, title="OpenAI launches GPT-6 with native video understanding",
+                    link="https://news.example.com/ai/gpt-6-launch")
+    www_http = dict(STORY, title="GPT-6", link="http://www.openai.example.com/blog/gpt-6/")
+    other_version = dict(STORY, title="OpenAI launches GPT-7 with native video understanding",
+                         link="https://news.example.com/ai/gpt-7-launch")
+    assert index.filter([reworded, www_http, other_version], "https://news.example.com/feed") == ([other_version], 2)
+    assert dedupe.url_key(www_http["link"]) == dedupe.url_key(STORY["link"])
+
+
+def test_templated_series_posts_are_not_merged():
+    def series(feed, title, summary, count):
+        return [
+            {
+                "title": title.format(n=n),
+                "link": f"https://{feed}/posts/{n}",
+                "summary": summary.format(n=n),
+            }
+            for n in range(540, 540 + count)
+        ]
+
+    twir = series(
+        "this-week-in-rust.example",
+        "This Week in Rust {n}",
+        "Hello and welcome to another issue of This Week in Rust! Rust is a programming language "
+        "empowering everyone to build reliable and efficient software. This is issue {n}.",
+        5,
+    )
+    releases = series(
+        "foo.example",
+        "foo v1.{n} released",
+        "We are happy to announce foo v1.{n}. See the changelog for the full list of changes.",
+        5,
+    )
+    run = pipeline.FetchRun(state={"feeds": {}}, limit=10, net_opts={}, security_opts={})
+    run.dedupe_index = dedupe.DedupeIndex()
+    feed = {"title": "TWiR", "url": "https://this-week-in-rust.example/feed"}
+
+    # One feed, one post per fetch: never compared with its own history.
+    for post in twir:
+        result = pipeline.apply_parsed_outcome(run, feed, {"articles": [post], "hint_sec": 0}, None, _meta())
+        assert result["new_count"] == 1 and result["dup_count"] == 0
+    assert run.dedupe_index.filter(releases, "https://foo.example/feed") == (releases, 0)
+
+    # Another feed carrying the next issues: the issue numbers differ, so nothing merges.
+    mirror = series(
+        "mirror.example",
+        "This Week in Rust {n}",
+        "Hello and welcome to another issue of This Week in Rust! Rust is a programming language "
+        "empowering everyone to build reliable and efficient software. This is issue {n}.",
+        10,
+    )[5:]
+    assert run.dedupe_index.filter(mirror, "https://mirror.example/feed") == (mirror, 0)
+    # ...while a verbatim repost of an issue the first feed delivered does.
+    repost = dict(twir[0], link="https://mirror.example/reposts/540")
+    assert run.dedupe_index.filter([repost], "https://mirror.example/feed") == ([], 1)
+
+
+def test_index_round_trips_and_expires_old_days(tmp_path):
+    path = tmp_path / "dedupe.idx"
+    today = date(2026, 4, 20)
+    old = dedupe.DedupeIndex(today=today - timedelta(days=7))
+    old.filter([{"title": "Old", "link": "https://e.com/old"}], "https://e.com/feed")
+    old.save(path)
+
+    index = dedupe.DedupeIndex.load(path, today=today - timedelta(days=1))
+    index.filter([STORY], "https://openai.example.com/feed")
+    index.save(path)
+    assert path.stat().st_size == len(dedupe._MAGIC) + 2 * dedupe._RECORD_BYTES
+
+    reloaded = dedupe.DedupeIndex.load(path, today=today, window_days=7)
+    assert len(reloaded) == 1
+    assert reloaded.filter([dict(STORY, link=STORY["link"] + "#top")], "https://mirror.example/feed") == ([], 1)
+    assert reloaded.filter([{"title": "Old", "link": "https://e.com/old"}], "https://mirror.example/feed")[1] == 0
+    reloaded.save(path)
+    # The expired record is gone once the file is rewritten.
+    assert path.stat().st_size == len(dedupe._MAGIC) + 2 * dedupe._RECORD_BYTES
+
+
+def test_index_in_the_old_layout_is_replaced(tmp_path):
+    path = tmp_path / "dedupe.idx"
+    path.write_bytes(b"\x01" * 40)
+    index = dedupe.DedupeIndex.load(path)
+    assert len(index) == 0
+    index.save(path)
+    assert path.read_bytes() == dedupe._MAGIC
+
+
+def test_digest_links_list_url_variants_once(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    store.save_digest("2026-04-20", {
+        "A": {"feed_url": "https://a.example.com/feed", "articles": [{"title": "x", "link": "https://e.com/p"}]},
+        "B": {"feed_url": "https://b.example.com/feed", "articles": [{"title": "x", "link": "https://E.com/p/?utm_source=b"}]},
+    })
+    assert full_article.digest_links("2026-04-20") == [{"url": "https://e.com/p", "feed_title": "A"}]
+
+
+def test_dedupe_config_is_clamped():
+    cfg = config.normalize_config({"dedupe": {"enabled": 0, "window_days": 0, "max_distance": 99}})
+    assert cfg["dedupe"] == {"enabled": False, "window_days": 1, "max_distance": 12}
+    assert config.normalize_config({})["dedupe"] == {"enabled": True, "window_days": 7, "max_distance": 6}
+
+
+def test_unreadable_index_stops_fetch_before_pools_start(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    feeds = [{"title": "Blog", "url": "https://blog.example.com/feed"}]
+    monkeypatch.setattr(main.feeds_mod, "collect_all_feeds_detailed", lambda *_a, **_k: (feeds, None, None))
+    started = []
+    monkeypatch.setattr(main.pipeline, "start_parse_pool", lambda size: started.append("parse_pool"))
+    monkeypatch.setattr(main.full_article, "Prefetcher", lambda *_a, **_k: started.append("prefetcher"))
+
+    def unreadable(_cfg):
+        raise PermissionError("dedupe.idx")
+
+    monkeypatch.setattr(main, "_load_dedupe_index", unreadable)
+    code = main.cmd_fetch(
+        "", 10, 2, config.normalize_config({}), object(), force=True, parse_processes=4, prefetch_full=True,
+    )
+
+    assert code == exit_codes.STORAGE_ERROR
+    assert "dedupe index" in capsys.readouterr().out
+    assert started == []
@@ -0,0 +1,118 @@
+﻿"""
+Tests for the append-only digest log and the lazily rendered digest.md.
+"""
+from pathlib import Path
+import json
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import store
+
+
+def _articles(start, stop):
+    return [
+        {"title": f"Post {i}", "link": f"https://blog.example.com/{i}", "published": "2026-04-20", "summary": "s"}
+        for i in range(start, stop)
+    ]
+
+
+def _save(articles, feed="Blog"):
+    return store.save_digest("2026-04-20", {feed: {"feed_url": "https://blog.example.com/feed", "articles": articles}})
+
+
+def test_saves_append_only_new_articles(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+
+    log_path = _save(_articles(0, 3))
+    first = log_path.read_bytes()
+    _save(_articles(1, 5))
+    _save(_articles(0, 2), feed="Mirror")
+
+    data = log_path.read_bytes()
+    assert data.startswith(first)
+    assert len(data.splitlines()) == 7
+    assert (log_path.parent / "digest.links").stat().st_size == 7 * 8
+
+    digest = store.load_digest_data("2026-04-20")
+    assert list(digest) == ["Blog", "Mirror"]
+    assert [a["title"] for a in digest["Blog"]["articles"]] == [f"Post {i}" for i in range(5)]
+    assert digest["Blog"]["feed_url"] == "https://blog.example.com/feed"
+
+
+def test_torn_lines_and_missing_link_index_recover(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+
+    log_path = _save(_articles(0, 2))
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write('{"feed": "Blog", "art')
+    (log_path.parent / "digest.links").unlink()
+
+    _save(_articles(1, 3))
+    assert [a["title"] for a in store.load_digest_data("2026-04-20")["Blog"]["articles"]] == ["Post 0", "Post 1", "Post 2"]
+
+
+def test_markdown_is_rendered_on_read_and_cached_until_the_log_changes(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    renders = []
+    original = store.render_digest
+
+    def counting_render(date_str, data):
+        renders.append(sum(len(feed["articles"]) for feed in data.values()))
+        return original(date_str, data)
+
+    monkeypatch.setattr(store, "render_digest", counting_render)
+
+    _save(_articles(0, 2))
+    assert renders == []
+    first = store.read_digest("2026-04-20")
+    assert store.read_digest("2026-04-20") == first
+    assert renders == [2]
+    assert "1. **Post 0**" in first and "共抓取 1 个源，2 篇新文章" in first
+
+    _save(_articles(2, 3))
+    assert "3. **Post 2**" in store.read_digest("2026-04-20")
+    assert renders == [2, 3]
+
+
+def test_legacy_digest_json_is_read_and_converted_on_append(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    day = tmp_path / "2026-04-20"
+    day.mkdir()
+    legacy = {"Blog": {"feed_url": "https://blog.example.com/feed", "articles": _articles(0, 2)}}
+    (day / "digest.json").write_text(json.dumps(legacy), encoding="utf-8")
+    (day / "digest.md").write_text("# old render\n", encoding="utf-8")
+
+    assert store.load_digest_data("2026-04-20") == legacy
+    assert store.read_digest("2026-04-20") == "# old render\n"
+
+    _save(_articles(1, 3))
+    assert not (day / "digest.json").exists() and (day / "digest.json.migrated").exists()
+    assert [a["title"] for a in store.load_digest_data("2026-04-20")["Blog"]["articles"]] == ["Post 0", "Post 1", "Post 2"]
+    assert "3. **Post 2**" in store.read_digest("2026-04-20")
+
+
+def test_article_bodies_live_in_a_compressed_pack(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    body = "<p>" + "A long feed-supplied article body. " * 400 + "</p>"
+    articles = [{**article, "content": body} for article in _articles(0, 3)]
+    articles[2]["content"] = "<p>different</p>"
+
+    log_path = _save(articles)
+    _save([{**_articles(5, 6)[0], "content": body}], feed="Mirror")
+
+    assert "feed-supplied" not in log_path.read_text(encoding="utf-8")
+    pack = log_path.parent / "bodies.pack"
+    assert pack.stat().st_size < len(body) // 10
+
+    digest = store.load_digest_data("2026-04-20")
+    first, second, third = digest["Blog"]["articles"]
+    mirrored = digest["Mirror"]["articles"][0]
+    assert "content" not in first
+    assert first["content_ref"] == second["content_ref"] == mirrored["content_ref"]
+    assert store.load_article_content("2026-04-20", first) == body
+    assert store.load_article_content("2026-04-20", third) == "<p>different</p>"
+    assert store.load_article_content("2026-04-20", {"content": "<p>inline</p>"}) == "<p>inline</p>"
+
+    pack.write_bytes(b"\0" * pack.stat().st_size)
+    assert store.load_article_content("2026-04-20", first) == ""
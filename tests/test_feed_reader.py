@@ -0,0 +1,105 @@
+﻿"""
+Tests for the early-exit streaming feed reader.
+"""
+from pathlib import Path
+import sys
+
+import feedparser
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import feed_reader
+import fetcher
+import parser as article_parser
+
+
+RSS_TEXT = (Path(__file__).parent.parent / "fixtures" / "sample_rss.xml").read_text(encoding="utf-8")
+
+
+def _archive_feed(count, poison_after=None):
+    items = []
+    for i in range(count):
+        if poison_after is not None and i == poison_after:
+            # Unescaped markup only feedparser copes with; never reached on early exit.
+            items.append("<item><title>bad</title><description><p>oops</p></description></item>")
+        items.append(
+            f"<item><title>Post {i}</title><link>https://blog.example.com/{i}</link>"
+            f"<pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate>"
+            f"<description>summary {i}</description></item>"
+        )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Blog</title><ttl>30</ttl>{"".join(items)}</channel></rss>'
+
+
+def test_reader_matches_feedparser_articles():
+    streamed = feed_reader.read_feed(RSS_TEXT)
+    parsed = feedparser.parse(RSS_TEXT)
+
+    assert streamed.complete is True
+    assert streamed.feed["title"] == "Test RSS Feed"
+    assert article_parser.parse_articles(streamed.entries, limit=10) == article_parser.parse_articles(
+        parsed.entries, limit=10
+    )
+
+
+def test_reader_stops_at_limit_without_reading_the_rest():
+    streamed = feed_reader.read_feed(_archive_feed(5000, poison_after=10), limit=3)
+
+    assert streamed.complete is False
+    assert [e["link"] for e in streamed.entries] == [f"https://blog.example.com/{i}" for i in range(3)]
+    assert streamed.feed["ttl"] == "30"
+
+
+def test_reader_stops_after_a_run_of_seen_links():
+    seen = {f"https://blog.example.com/{i}" for i in range(0, 5000)} - {"https://blog.example.com/1"}
+    seen.add("https://blog.example.com/0")
+    streamed = feed_reader.read_feed(_archive_feed(5000, poison_after=100), seen_links=seen)
+
+    # Entry 0 is seen (pinned), 1 is new, then three seen entries in a row end the read.
+    assert streamed.complete is False
+    assert len(streamed.entries) == 2 + feed_reader.SEEN_STREAK_TO_STOP
+
+
+def test_reader_reads_atom_entries():
+    atom = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom Blog</title>
+  <link rel="alternate" href="https://atom.example.com/"/>
+  <entry>
+    <title type="html">A &amp;lt;b&amp;gt; post</title>
+    <link rel="self" href="https://atom.example.com/1.atom"/>
+    <link rel="alternate" href="https://atom.example.com/1"/>
+    <id>tag:atom.example.com,2024:1</id>
+    <updated>2024-01-02T00:00:00Z</updated>
+    <summary>Short</summary>
+    <content type="html">&lt;p&gt;Body&lt;/p&gt;&lt;script&gt;x()&lt;/script&gt;</content>
+  </entry>
+</feed>"""
+    streamed = feed_reader.read_feed(atom, limit=5)
+
+    assert streamed.feed["link"] == "https://atom.example.com/"
+    entry = streamed.entries[0]
+    assert entry["link"] == "https://atom.example.com/1"
+    assert entry["updated"] == "2024-01-02T00:00:00Z"
+    assert entry["content"] == [{"value": "<p>Body</p>"}]
+    assert article_parser.parse_articles(streamed.entries) == article_parser.parse_articles(
+        feedparser.parse(atom).entries
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '<rss version="0.91"><channel><item><title>x</title></item></channel></rss>',
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"></rdf:RDF>',
+        "<rss version='2.0'><channel><item><title>broken</item></channel></rss>",
+        "<rss version='2.0'><channel><item><link>/relative</link></item></channel></rss>",
+        '<!DOCTYPE rss [<!ENTITY e "x">]><rss version="2.0"><channel><title>&e;</title></channel></rss>',
+    ],
+)
+def test_unusual_feeds_fall_back_to_feedparser(text):
+    with pytest.raises(feed_reader.UnsupportedFeed):
+        feed_reader.read_feed(text, limit=5)
+
+    feed, _error = fetcher.parse_feed_text(text, limit=5)
+    assert not isinstance(feed, feed_reader.StreamedFeed)
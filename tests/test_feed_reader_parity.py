@@ -0,0 +1,94 @@
+﻿"""
+Parity corpus and throughput benchmark for the fast feed parse path.
+"""
+from pathlib import Path
+import sys
+import time
+
+import feedparser
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import feed_reader
+import fetcher
+import parser as article_parser
+import polling
+
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+CORPUS = sorted((FIXTURES / "feeds").glob("*.xml")) + [FIXTURES / "sample_rss.xml"]
+FAST_PATH = {"atom_html.xml", "rss_cjk_content.xml", "rss_guid_permalink.xml", "sample_rss.xml"}
+
+
+def _articles(feed):
+    articles = article_parser.parse_articles(feed.entries, limit=100)
+    # Content HTML is not sanitized attribute-by-attribute on the fast path;
+    # compare what consumers actually use.
+    return [{**a, "content": article_parser.strip_html(a["content"])} for a in articles]
+
+
+def _feed_fields(feed):
+    return {
+        **{key: feed.feed.get(key, "") for key in ("title", "link", "description", "language")},
+        "hint_sec": polling.hint_seconds(feed.feed),
+    }
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda p: p.name)
+def test_fast_path_matches_feedparser(path):
+    text = path.read_text(encoding="utf-8")
+    feed, error = fetcher.parse_feed_text(text)
+    reference = feedparser.parse(text)
+
+    assert error is None
+    assert isinstance(feed, feed_reader.StreamedFeed) == (path.name in FAST_PATH)
+    assert _articles(feed) == _articles(reference)
+    assert _feed_fields(feed) == _feed_fields(reference)
+
+
+def test_fast_path_drops_script_and_style_blocks():
+    feed = feed_reader.read_feed((FIXTURES / "feeds" / "rss_cjk_content.xml").read_text(encoding="utf-8"))
+    content = feed.entries[0].content[0].value
+    assert "<script" not in content
+    assert "_hmt" not in content
+    assert feed.entries[0].title.startswith("OpenAI")
+
+
+def _synthetic_feed(items):
+    summary = "<p>" + "lorem ipsum dolor sit amet " * 10 + "</p>"
+    content = '<p>paragraph <a href="https://x">link</a></p>' * 20
+    body = "".join(
+        f"<item><title>Post {i} &amp; notes</title><link>https://bench.example.com/{i}</link>"
+        f"<pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate>"
+        f"<description><![CDATA[{summary}]]></description>"
+        f"<content:encoded><![CDATA[{content}]]></content:encoded>"
+        "</item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        f"<channel><title>Bench</title>{body}</channel></rss>"
+    )
+
+
+def test_fast_path_parse_throughput(capsys):
+    text = _synthetic_feed(300)
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+
+    start = time.perf_counter()
+    fast = feed_reader.read_feed(text)
+    fast_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    slow = feedparser.parse(text)
+    slow_sec = time.perf_counter() - start
+
+    with capsys.disabled():
+        print(
+            f"\nparse throughput: fast={megabytes / fast_sec:.1f} MB/s ({fast_sec / megabytes * 1000:.1f} ms/MB) "
+            f"feedparser={megabytes / slow_sec:.1f} MB/s ({slow_sec / megabytes * 1000:.1f} ms/MB)"
+        )
+
+    assert len(fast.entries) == len(slow.entries) == 300
+    assert fast_sec * 5 < slow_sec
@@ -5,16 +5,15 @@ from pathlib import Path
 import sys
 from types import SimpleNamespace
 
-import pytest
-
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
 
 import exit_codes
 import main
 
 
-@pytest.mark.usefixtures("tmp_path")
-def test_cmd_fetch_prints_success_error_ratio_and_returns_ok(monkeypatch, capsys):
+def test_cmd_fetch_prints_success_error_ratio_and_returns_ok(monkeypatch, capsys, tmp_path):
+    # State and digests are stubbed below; the dedupe index still lands in the data dir.
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
     cfg = {
         "network": {
             "connect_timeout_sec": 5,
@@ -35,3 +35,26 @@ def test_fetch_feed_returns_not_modified_meta_on_304():
     assert meta.etag == "abc123"
     assert meta.last_modified == "Sat, 07 Mar 2026 12:00:00 GMT"
 
+
+
+@responses.activate
+def test_fetch_feed_skips_parsing_when_body_digest_matches(monkeypatch):
+    rss_content = (Path(__file__).parent.parent / "fixtures" / "sample_rss.xml").read_text(encoding="utf-8")
+    responses.add(responses.GET, "https://example.com/feed.xml", body=rss_content, status=200)
+    responses.add(responses.GET, "https://example.com/feed.xml", body=rss_content, status=200)
+
+    feed, error, meta = fetcher.fetch_feed_detailed("https://example.com/feed.xml")
+    assert error is None
+    assert len(feed.entries) > 0
+    assert meta.body_digest
+    assert meta.unchanged is False
+
+    def fail_parse(*_args, **_kwargs):
+        raise AssertionError("unchanged body must not be parsed")
+
+    monkeypatch.setattr(fetcher, "parse_feed_text", fail_parse)
+    feed, error, second = fetcher.fetch_feed_detailed("https://example.com/feed.xml", previous_digest=meta.body_digest)
+    assert error is None
+    assert second.unchanged is True
+    assert second.status_code == 200
+    assert len(feed.entries) == 0
@@ -0,0 +1,236 @@
+﻿"""
+Tests for batch full-article fetching (`full --from-digest` / `--urls-file`)
+and the `fetch --prefetch-full` stage.
+"""
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import re
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import config
+import exit_codes
+import full_article
+import main
+import store
+
+
+class _ArticleHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def log_message(self, *_args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active -= 1
+
+        if self.path.startswith("/blocked"):
+            status, body = 403, b"forbidden"
+        elif self.path.startswith("/feed-"):
+            status, body = 200, _feed_body(f"http://{self.headers['Host']}", self.path[len("/feed-"):-len(".xml")])
+        else:
+            name = self.path.strip("/")
+            body = (
+                f"<html><head><title>Post {name}</title><script>x()</script></head>"
+                f"<body><nav>menu</nav><article><p>Body of {name}</p></article></body></html>"
+            ).encode("utf-8")
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _feed_body(base_url, name):
+    items = "".join(
+        f"<item><title>{name} {i}</title><link>{base_url}/{name}-{i}</link><description>s</description></item>"
+        for i in range(3)
+    )
+    items += (
+        f"<item><title>{name} walled</title><link>{base_url}/blocked-{name}</link>"
+        f"<content:encoded><![CDATA[<p>Feed copy of {name}</p>]]></content:encoded></item>"
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        f"<channel><title>{name}</title><link>{base_url}/</link>{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+@pytest.fixture
+def article_server():
+    _ArticleHandler.peak = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ArticleHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _write_digest(date_str, base_url, count):
+    articles = [{"title": f"Post {i}", "link": f"{base_url}/p{i}", "summary": "s"} for i in range(count)]
+    articles.append(
+        {"title": "Walled", "link": f"{base_url}/blocked", "content": "<p>From the feed</p>", "summary": "s"}
+    )
+    store.save_digest(date_str, {"Blog": {"feed_url": f"{base_url}/feed.xml", "articles": articles}})
+
+
+def _run_batch(monkeypatch, capsys, items, date_str, **kwargs):
+    cfg = config.normalize_config({"network": {"retries": 0}, "fetch": {"per_host_interval_ms": 0}})
+    session = main.http_client.build_session(retries=0)
+    try:
+        code = main.cmd_full_batch(items, date_str, cfg, session, **kwargs)
+    finally:
+        session.close()
+    return code, capsys.readouterr().out
+
+
+def test_from_digest_fetches_concurrently_and_commits_index_once(monkeypatch, capsys, tmp_path, article_server):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    _write_digest("2026-04-19", article_server, 8)
+    commits = []
+    original = store._write_full_index_entries
+
+    def counting_commit(entries):
+        commits.append(len(entries))
+        original(entries)
+
+    monkeypatch.setattr(store, "_write_full_index_entries", counting_commit)
+
+    items = full_article.digest_links("2026-04-19")
+    code, out = _run_batch(monkeypatch, capsys, items, "2026-04-19", workers=4, per_host_limit=2, extract_processes=1)
+
+    assert code == exit_codes.OK
+    assert "total=9 saved=8 fallback=1 cached=0 failed=0" in out
+    assert commits == [9]
+    assert _ArticleHandler.peak == 2
+
+    saved = store.lookup_full_article(f"{article_server}/p3", date_str="2026-04-19")
+    text = saved.read_text(encoding="utf-8")
+    assert "Body of p3" in text and "menu" not in text and "x()" not in text
+    assert "From the feed" in store.lookup_full_article(f"{article_server}/blocked").read_text(encoding="utf-8")
+
+    code, out = _run_batch(monkeypatch, capsys, items, "2026-04-19", workers=4, extract_processes=1)
+    assert "total=9 saved=0 fallback=0 cached=9 failed=0" in out
+    assert commits == [9]
+
+
+def test_extraction_pool_matches_inline(monkeypatch, capsys, tmp_path, article_server):
+    items = [{"url": f"{article_server}/q{i}", "feed_title": ""} for i in range(4)]
+
+    outputs = {}
+    for processes in (1, 2):
+        monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path / str(processes)))
+        code, out = _run_batch(monkeypatch, capsys, items, "2026-04-19", extract_processes=processes)
+        assert code == exit_codes.OK
+        outputs[processes] = sorted(
+            p.read_text(encoding="utf-8").split("---", 1)[1] for p in store.get_article_dir("2026-04-19").iterdir()
+        )
+    assert "Extracting articles in 2 processes" in out
+    assert outputs[1] == outputs[2]
+
+
+def test_urls_file_reports_failures(monkeypatch, capsys, tmp_path, article_server):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    urls = tmp_path / "urls.txt"
+    urls.write_text(
+        f"# reading list\n{article_server}/blocked\n\nftp://nope.example.com/x  # bad scheme\n", encoding="utf-8"
+    )
+
+    items = full_article.read_urls_file(str(urls))
+    assert [item["url"] for item in items] == [f"{article_server}/blocked", "ftp://nope.example.com/x"]
+
+    code, out = _run_batch(monkeypatch, capsys, items, None, extract_processes=1)
+    assert code == exit_codes.NETWORK_ERROR
+    assert "failed=2" in out
+    assert re.search(r"❌ .*/blocked", out)
+
+
+def test_full_cli_requires_exactly_one_mode(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "cmd_full_batch", lambda items, date_str, *_a, **_k: calls.append((items, date_str)) or 0)
+    monkeypatch.setattr(main.full_article, "digest_links", lambda date_str: [{"url": "https://a", "feed_title": "A"}])
+    parser = main.build_parser()
+
+    args = parser.parse_args(["full", "--from-digest", "2026-04-19"])
+    assert main._dispatch_full(parser, args, {}, object()) == 0
+    assert calls == [([{"url": "https://a", "feed_title": "A"}], "2026-04-19")]
+
+    args = parser.parse_args(["full", "https://a", "--urls-file", "x.txt"])
+    with pytest.raises(SystemExit):
+        main._dispatch_full(parser, args, {}, object())
+
+
+def _run_prefetch(monkeypatch, capsys, base_url, engine, prefetch_filter=None):
+    monkeypatch.delenv("HTTP_PROXY", raising=False)
+    monkeypatch.delenv("http_proxy", raising=False)
+    feeds = [
+        {"title": "News", "url": f"{base_url}/feed-news.xml", "tags": ["World"]},
+        {"title": "Blog", "url": f"{base_url}/feed-blog.xml"},
+    ]
+    monkeypatch.setattr(main.feeds_mod, "collect_all_feeds_detailed", lambda *_a, **_k: (feeds, None, None))
+
+    cfg = config.normalize_config({"network": {"retries": 0}, "fetch": {"per_host_interval_ms": 0}})
+    session = main.http_client.build_session(retries=0)
+    try:
+        code = main.cmd_fetch(
+            "", 10, 4, cfg, session, engine=engine, concurrency=8, force=True, parse_processes=1,
+            prefetch_full=True, prefetch_filter=prefetch_filter,
+        )
+    finally:
+        session.close()
+    assert code == exit_codes.OK
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_fetch_prefetches_full_articles_of_new_links(monkeypatch, capsys, tmp_path, article_server, engine):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    commits = []
+    original = store._write_full_index_entries
+
+    def counting_commit(entries):
+        commits.append(len(entries))
+        original(entries)
+
+    monkeypatch.setattr(store, "_write_full_index_entries", counting_commit)
+
+    out = _run_prefetch(monkeypatch, capsys, article_server, engine)
+    assert "📄 prefetch: queued=8 saved=6 fallback=2 cached=0 failed=0" in out
+    assert commits == [8]
+
+    saved = store.lookup_full_article(f"{article_server}/news-1")
+    assert "Body of news-1" in saved.read_text(encoding="utf-8")
+    assert "Feed copy of blog" in store.lookup_full_article(f"{article_server}/blocked-blog").read_text(encoding="utf-8")
+    assert {item["url"] for item in full_article.digest_links(datetime.now().strftime("%Y-%m-%d"))} == {
+        f"{article_server}/{name}" for name in ["news-0", "news-1", "news-2", "blocked-news",
+                                                "blog-0", "blog-1", "blog-2", "blocked-blog"]
+    }
+
+
+def test_prefetch_filter_matches_tags_and_titles(monkeypatch, capsys, tmp_path, article_server):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+
+    out = _run_prefetch(monkeypatch, capsys, article_server, "threads", prefetch_filter=["world"])
+    assert "Prefetching full articles from 1 feeds" in out
+    assert "queued=4 saved=3 fallback=1" in out
+    assert store.lookup_full_article(f"{article_server}/news-0") is not None
+    assert store.lookup_full_article(f"{article_server}/blog-0") is None
@@ -65,6 +65,24 @@ class TestParseOpml:
         assert feeds[1]["title"] == "Tech Blog"
         assert feeds[1]["url"] == "https://tech.example.com/rss"
     
+    def test_parse_opml_folders_and_categories_become_tags(self):
+        """Enclosing folder outlines and `category` attributes are kept as tags."""
+        opml_content = """<?xml version="1.0"?>
+<opml version="2.0">
+  <body>
+    <outline text="Tech">
+      <outline text="AI">
+        <outline text="A" xmlUrl="https://a.example.com/feed" category="ml,Tech"/>
+      </outline>
+    </outline>
+    <outline text="B" xmlUrl="https://b.example.com/feed"/>
+  </body>
+</opml>"""
+        feeds = gist.parse_opml(opml_content)
+        assert [feed["url"] for feed in feeds] == ["https://a.example.com/feed", "https://b.example.com/feed"]
+        assert feeds[0]["tags"] == ["Tech", "AI", "ml"]
+        assert "tags" not in feeds[1]
+
     def test_parse_opml_empty_body(self):
         """Test parsing OPML with empty body."""
         opml_content = """<?xml version="1.0"?>
@@ -0,0 +1,138 @@
+﻿"""
+Tests for per-host politeness scheduling.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import host_scheduler
+import pipeline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _feeds(spec):
+    return [{"title": url, "url": url} for url in spec]
+
+
+def test_host_key_groups_subdomains_and_keeps_ips():
+    assert host_scheduler.host_key("https://foo.substack.com/feed") == "substack.com"
+    assert host_scheduler.host_key("https://bar.substack.com/feed") == "substack.com"
+    assert host_scheduler.host_key("https://news.bbc.co.uk/rss") == "bbc.co.uk"
+    assert host_scheduler.host_key("http://127.0.0.1:8080/x") == "127.0.0.1"
+    assert host_scheduler.host_key("https://example.com/") == "example.com"
+
+
+def test_scheduler_caps_per_host_and_fills_with_other_hosts():
+    clock = FakeClock()
+    feeds = _feeds([f"https://a.example.com/{i}" for i in range(4)] + ["https://other.org/1", "https://third.net/1"])
+    scheduler = host_scheduler.HostScheduler(feeds, per_host_limit=2, clock=clock)
+
+    started = []
+    while True:
+        item = scheduler.pop_ready()
+        if item is None:
+            break
+        started.append(item["url"])
+
+    assert sum(1 for url in started if "example.com" in url) == 2
+    assert "https://other.org/1" in started
+    assert "https://third.net/1" in started
+    assert scheduler.pending == 2
+    assert scheduler.next_delay() is None
+
+    scheduler.release(feeds[0])
+    assert scheduler.pop_ready()["url"] == "https://a.example.com/2"
+
+
+def test_scheduler_enforces_min_interval_and_throttle():
+    clock = FakeClock()
+    feeds = _feeds(["https://example.com/1", "https://example.com/2", "https://example.com/3"])
+    scheduler = host_scheduler.HostScheduler(feeds, per_host_limit=5, min_interval_sec=1.0, clock=clock)
+
+    first = scheduler.pop_ready()
+    assert first is not None
+    assert scheduler.pop_ready() is None
+    assert scheduler.next_delay() == 1.0
+
+    clock.now = 1.0
+    second = scheduler.pop_ready()
+    assert second is not None
+
+    scheduler.release(second, throttle_sec=30)
+    clock.now = 2.0
+    assert scheduler.pop_ready() is None
+    assert scheduler.next_delay() == 29.0
+
+    clock.now = 31.0
+    assert scheduler.pop_ready()["url"] == "https://example.com/3"
+    assert scheduler.pending == 0
+
+
+def test_retry_after_and_throttle_delay():
+    now = datetime(2026, 3, 8, 12, 0, 0, tzinfo=timezone.utc)
+    assert host_scheduler.parse_retry_after("120") == 120.0
+    assert host_scheduler.parse_retry_after("Sun, 08 Mar 2026 12:01:00 GMT", now=now) == 60.0
+    assert host_scheduler.parse_retry_after("soon") is None
+
+    assert host_scheduler.throttle_delay(429, None) == host_scheduler.DEFAULT_THROTTLE_SEC
+    assert host_scheduler.throttle_delay(429, 10_000) == host_scheduler.MAX_THROTTLE_SEC
+    assert host_scheduler.throttle_delay(503, 5) == 5
+    assert host_scheduler.throttle_delay(503, None) == 0.0
+    assert host_scheduler.throttle_delay(500, None) == 0.0
+
+
+def test_run_threaded_respects_per_host_limit(monkeypatch):
+    feeds = _feeds([f"https://busy.example.com/{i}" for i in range(8)] + [f"https://calm{i}.org/" for i in range(4)])
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+
+    def fake_process_feed(_run, feed_info, _session):
+        host = host_scheduler.host_key(feed_info["url"])
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.01)
+        with lock:
+            active[host] -= 1
+        return {"title": feed_info["title"], "status": "ok", "new_count": 0, "skip_count": 0}
+
+    monkeypatch.setattr(pipeline, "process_feed", fake_process_feed)
+
+    results = []
+    pipeline.run_threaded(
+        None,
+        feeds,
+        workers=6,
+        session=None,
+        on_result=results.append,
+        per_host_limit=2,
+    )
+
+    assert len(results) == len(feeds)
+    assert peak["example.com"] == 2
+
+
+def test_run_threaded_treats_zero_workers_as_one():
+    results = []
+    host_scheduler.run_threaded(
+        ["https://a.example.com/", "https://b.example.org/"],
+        lambda url: {"url": url},
+        workers=0,
+        on_result=results.append,
+        per_host_limit=1,
+        key=host_scheduler.host_key,
+    )
+
+    assert sorted(result["url"] for result in results) == ["https://a.example.com/", "https://b.example.org/"]
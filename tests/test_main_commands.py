@@ -1,5 +1,4 @@
 ﻿from pathlib import Path
-import builtins
 import sys
 from types import SimpleNamespace
 
@@ -142,7 +141,7 @@ def test_cmd_full_paths(monkeypatch, capsys):
     assert main.cmd_full("https://example.com/a", "2026-03-08", CFG, object()) == exit_codes.NETWORK_ERROR
 
 
-def test_cmd_full_success_without_bs4(monkeypatch, capsys):
+def test_cmd_full_success_without_lxml(monkeypatch, capsys):
     monkeypatch.setattr(main.url_validator, "validate_url", lambda *_a, **_k: None)
     monkeypatch.setattr(main.store, "lookup_full_article", lambda *_a, **_k: None)
     monkeypatch.setattr(
@@ -155,21 +154,16 @@ def test_cmd_full_success_without_bs4(monkeypatch, capsys):
         ),
     )
     monkeypatch.setattr(main.store, "slugify", lambda text: "slugged-title")
-    monkeypatch.setattr(main.store, "save_full_article", lambda *_a, **_k: Path("/tmp/full.md"))
-
-    orig_import = builtins.__import__
-
-    def fake_import(name, *args, **kwargs):
-        if name == "bs4":
-            raise ImportError("no bs4")
-        return orig_import(name, *args, **kwargs)
+    saved = []
+    monkeypatch.setattr(main.store, "save_full_article", lambda *a, **_k: saved.append(a) or Path("/tmp/full.md"))
+    monkeypatch.setattr(main.full_article.extractor, "etree", None)
 
-    monkeypatch.setattr(builtins, "__import__", fake_import)
     assert main.cmd_full("https://example.com/a", "2026-03-08", CFG, object()) == exit_codes.OK
     assert "全文已保存" in capsys.readouterr().out
+    assert saved[0][2]["title"] == "Hello" and saved[0][3] == "Hi\n\nBody"
 
 
-def test_cmd_full_save_storage_error_with_bs4(monkeypatch):
+def test_cmd_full_save_storage_error(monkeypatch):
     monkeypatch.setattr(main.url_validator, "validate_url", lambda *_a, **_k: None)
     monkeypatch.setattr(main.store, "lookup_full_article", lambda *_a, **_k: None)
     monkeypatch.setattr(
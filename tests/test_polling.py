@@ -0,0 +1,110 @@
+﻿"""
+Tests for the adaptive per-feed polling schedule.
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import config
+import exit_codes
+import main
+import polling
+import store
+
+
+SCHEDULE = {"min_interval_sec": 900, "max_interval_sec": 86400}
+NOW = datetime(2026, 3, 8, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_parse_max_age_and_hint_seconds():
+    assert polling.parse_max_age("public, max-age=600") == 600
+    assert polling.parse_max_age("no-cache, max-age=600") is None
+    assert polling.parse_max_age(None) is None
+
+    assert polling.hint_seconds({"ttl": "60"}) == 3600
+    assert polling.hint_seconds({"sy_updateperiod": "daily", "sy_updatefrequency": "4"}) == 21600
+    assert polling.hint_seconds({"ttl": "bogus"}, max_age=120) == 120
+    assert polling.hint_seconds(None) == 0
+
+
+def test_next_interval_backs_off_when_quiet_and_honors_bounds():
+    first = polling.next_interval(
+        previous_interval=None, gap_ema=None, new_count=0, hint_sec=0, min_interval_sec=900, max_interval_sec=86400
+    )
+    assert first == 900
+
+    quiet = polling.next_interval(
+        previous_interval=first, gap_ema=None, new_count=0, hint_sec=0, min_interval_sec=900, max_interval_sec=86400
+    )
+    assert quiet == 1350
+
+    busy = polling.next_interval(
+        previous_interval=quiet, gap_ema=3600, new_count=2, hint_sec=0, min_interval_sec=900, max_interval_sec=86400
+    )
+    assert busy == 1800
+
+    hinted = polling.next_interval(
+        previous_interval=None, gap_ema=600, new_count=1, hint_sec=7200, min_interval_sec=900, max_interval_sec=86400
+    )
+    assert hinted == 7200
+
+    capped = polling.next_interval(
+        previous_interval=80000, gap_ema=None, new_count=0, hint_sec=0, min_interval_sec=900, max_interval_sec=86400
+    )
+    assert capped == 86400
+
+
+def test_schedule_next_fetch_learns_update_rate():
+    state = {"feeds": {}}
+    url = "https://example.com/feed.xml"
+    assert store.is_feed_due(state, url, now=NOW) is True
+
+    store.schedule_next_fetch(state, url, new_count=3, now=NOW, **SCHEDULE)
+    assert store.is_feed_due(state, url, now=NOW) is False
+
+    later = NOW + timedelta(hours=4)
+    interval = store.schedule_next_fetch(state, url, new_count=2, hint_sec=0, now=later, **SCHEDULE)
+    feed_state = state["feeds"][url]
+    assert feed_state["update_gap_ema"] == 7200
+    assert interval == 3600
+    assert store.is_feed_due(state, url, now=later + timedelta(minutes=59)) is True
+    assert store.is_feed_due(state, url, now=later + timedelta(minutes=30)) is False
+
+    quiet = store.schedule_next_fetch(state, url, new_count=0, now=later + timedelta(hours=1), **SCHEDULE)
+    assert quiet == 5400
+
+
+def test_cmd_fetch_skips_feeds_not_due_unless_forced(monkeypatch, capsys):
+    cfg = config.normalize_config({})
+    feeds = [
+        {"title": "due", "url": "https://example.com/due.xml"},
+        {"title": "later", "url": "https://example.com/later.xml"},
+    ]
+    state = {"feeds": {}}
+    store.schedule_next_fetch(state, "https://example.com/later.xml", new_count=0, **SCHEDULE)
+
+    fetched = []
+
+    def fake_fetch(url, **_kwargs):
+        fetched.append(url)
+        return SimpleNamespace(entries=[]), None, SimpleNamespace(status_code=304, etag="", last_modified="", error_kind=None)
+
+    monkeypatch.setattr(main.feeds_mod, "collect_all_feeds_detailed", lambda *_a, **_k: (feeds, None, None))
+    monkeypatch.setattr(main.fetcher, "fetch_feed_detailed", fake_fetch)
+    monkeypatch.setattr(main.store, "load_state", lambda: state)
+    monkeypatch.setattr(main.store, "save_state", lambda _state: None)
+
+    assert main.cmd_fetch("", 10, 2, cfg, object()) == exit_codes.OK
+    out = capsys.readouterr().out
+    assert fetched == ["https://example.com/due.xml"]
+    assert "1 feeds not due yet" in out
+    assert "not_due=1" in out
+    assert "feed_success=1/1" in out
+
+    fetched.clear()
+    state["feeds"]["https://example.com/due.xml"]["next_due"] = None
+    assert main.cmd_fetch("", 10, 2, cfg, object(), force=True) == exit_codes.OK
+    assert sorted(fetched) == ["https://example.com/due.xml", "https://example.com/later.xml"]
@@ -0,0 +1,163 @@
+﻿"""
+Tests for the full-text search index and the `search` command.
+"""
+from pathlib import Path
+import statistics
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import exit_codes
+import main
+import search_index
+import store
+
+
+pytestmark = pytest.mark.skipif(not search_index.fts5_available(), reason="SQLite built without FTS5")
+
+
+def test_cjk_runs_are_split_into_bigrams():
+    assert search_index.tokenize("OpenAI 发布 GPT-6：多模态智能体") == (
+        "openai 发布 布 gpt 6 多模 模态 态智 智能 能体 体"
+    )
+    assert search_index.build_match('多模态 Agent* 猫 "x') == '"多模 模态" AND "agent"* AND "猫"* AND "x"'
+    assert search_index.build_match("  ：，") == ""
+
+
+def _save_digest(date_str, feed, articles):
+    store.save_digest(date_str, {feed: {"feed_url": f"https://{feed.lower()}.example.com/feed", "articles": articles}})
+
+
+def _seed():
+    _save_digest("2026-04-18", "Blog", [
+        {"title": "Rust 2026 edition", "link": "https://blog.example.com/rust", "summary": "<p>Async closures land.</p>"},
+        {"title": "Cooking", "link": "https://blog.example.com/cook", "summary": "A recipe that mentions rust stains."},
+    ])
+    _save_digest("2026-04-19", "新智元", [
+        {"title": "GPT-6 正式发布", "link": "https://mp.weixin.qq.com/s/gpt6", "summary": "支持原生视频理解与长程规划的多模态智能体"},
+        {"title": "小猫咪", "link": "https://mp.weixin.qq.com/s/cat", "summary": "一只猫"},
+    ])
+
+
+def test_save_digest_and_full_article_are_searchable(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    _seed()
+
+    hits = store.search_articles("rust")
+    # The title hit outranks the body hit.
+    assert [hit["url"] for hit in hits] == ["https://blog.example.com/rust", "https://blog.example.com/cook"]
+    assert hits[0]["feed"] == "Blog" and hits[0]["date"] == "2026-04-18"
+    assert "Async closures land." in hits[0]["snippet"]
+
+    assert [hit["title"] for hit in store.search_articles("多模态")] == ["GPT-6 正式发布"]
+    assert [hit["title"] for hit in store.search_articles("猫")] == ["小猫咪"]
+    assert store.search_articles("模多") == []
+    assert [hit["title"] for hit in store.search_articles("rust async")] == ["Rust 2026 edition"]
+    assert [hit["title"] for hit in store.search_articles("edit*")] == ["Rust 2026 edition"]
+
+    # The full text is indexed too, and collapses with the digest entry into one result.
+    store.save_full_article(
+        "2026-04-20", "新智元", {"title": "GPT-6 正式发布", "link": "https://mp.weixin.qq.com/s/gpt6"},
+        "在 AgentBench 上相较 GPT-5 提升 41%。",
+    )
+    hits = store.search_articles("agentbench")
+    assert [(hit["title"], hit["date"]) for hit in hits] == [("GPT-6 正式发布", "2026-04-20")]
+    assert len(store.search_articles("gpt")) == 1
+
+
+def test_date_and_feed_filters(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    _seed()
+    _save_digest("2026-04-20", "Other", [{"title": "Rust again", "link": "https://other.example.com/r", "summary": ""}])
+
+    def titles(**filters):
+        return sorted(hit["title"] for hit in store.search_articles("rust", **filters))
+
+    assert titles(since="2026-04-19") == ["Rust again"]
+    assert titles(until="2026-04-18") == ["Cooking", "Rust 2026 edition"]
+    assert titles(feed="oth") == ["Rust again"]
+    assert titles(feed="%") == []
+    assert len(store.search_articles("rust", limit=1)) == 1
+
+
+def test_batch_writes_search_index_once(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    adds = []
+    original = search_index.SearchIndex.add
+
+    def counting_add(self, docs):
+        docs = list(docs)
+        adds.append(len(docs))
+        return original(self, docs)
+
+    monkeypatch.setattr(search_index.SearchIndex, "add", counting_add)
+
+    with store.full_index_batch():
+        for i in range(5):
+            store.save_full_article("2026-04-19", "Blog", {"title": f"Post {i}", "link": f"https://b.example.com/{i}"}, "text")
+        assert adds == []
+    assert adds == [5]
+    assert len(store.search_articles("text")) == 5
+
+
+def test_reindex_backfills_existing_data(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    _seed()
+    store.save_full_article("2026-04-19", "Blog", {"title": "Deep dive", "link": "https://blog.example.com/deep"}, "zymurgy")
+    store.get_search_db_path().unlink()
+    assert store.search_articles("zymurgy") == []
+
+    assert main.cmd_storage_reindex() == exit_codes.OK
+    assert "Search index rebuilt: 5 documents" in capsys.readouterr().out
+    hits = store.search_articles("zymurgy")
+    assert [(hit["title"], hit["feed"]) for hit in hits] == [("Deep dive", "Blog")]
+    assert len(store.search_articles("多模态")) == 1
+
+
+def test_cmd_search_prints_results(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    _seed()
+    path = store.save_full_article("2026-04-19", "Blog", {"title": "Rust 2026 edition", "link": "https://blog.example.com/rust"}, "x")
+    capsys.readouterr()
+
+    assert main.cmd_search("rust", feed="blog", limit=1) == exit_codes.OK
+    out = capsys.readouterr().out
+    assert "1 条结果" in out and "1. **Rust 2026 edition**" in out and f"📄 {path}" in out
+
+    assert main.cmd_search("nothing-matches") == exit_codes.OK
+    assert "没有找到" in capsys.readouterr().out
+    assert main.cmd_search("rust", since="April") == exit_codes.PARAM_ERROR
+
+
+def test_queries_over_a_year_answer_in_milliseconds(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    words = ["agent", "rust", "latency", "kernel", "compiler", "模型", "推理", "芯片", "开源", "数据库"]
+    docs = []
+    for day in range(365):
+        date_str = f"2025-{day // 28 % 12 + 1:02d}-{day % 28 + 1:02d}"
+        for i in range(40):
+            n = day * 40 + i
+            docs.append(search_index.doc(
+                "digest", f"{n:064x}", date=date_str, feed=f"Feed {i % 25}", title=f"{words[n % 10]} story {n}",
+                url=f"https://e.com/{n}", text=" ".join(words[(n + k) % 10] for k in range(0, 60, 7)),
+            ))
+    index = store.open_search_index()
+    try:
+        index.add(docs)
+        timings = {}
+        for query in ("rust", "模型 推理", "kernel", "compil*"):
+            samples = []
+            for _ in range(5):
+                start = time.perf_counter()
+                assert len(index.search(query, since="2025-03-01", feed="Feed 1", limit=20)) == 20
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[query] = statistics.median(samples)
+    finally:
+        index.close()
+
+    with capsys.disabled():
+        print(f"\nsearch over {len(docs)} documents: " + ", ".join(f"{q}={ms:.1f}ms" for q, ms in timings.items()))
+    assert max(timings.values()) < 100
@@ -0,0 +1,66 @@
+﻿"""
+Tests for the fingerprinted per-feed seen set.
+"""
+from pathlib import Path
+import json
+import pickle
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import store
+from seen_set import FINGERPRINT_BYTES, SeenSet, fingerprint
+
+
+URLS = [f"https://blog.example.com/posts/2026/{i}-a-reasonably-long-article-slug" for i in range(500)]
+
+
+def test_membership_order_and_cap():
+    seen = SeenSet.from_urls(URLS[:3])
+    assert URLS[0] in seen and URLS[3] not in seen
+    assert fingerprint(URLS[1]) in seen
+    assert None not in seen
+
+    assert seen.add([URLS[1], URLS[3], URLS[3], ""], limit=3) == [fingerprint(URLS[3])]
+    assert list(seen) == [fingerprint(url) for url in URLS[1:4]]
+    assert URLS[0] not in seen
+
+
+def test_membership_ignores_unaligned_matches():
+    first, second = fingerprint(URLS[0]), fingerprint(URLS[1])
+    straddling = first.to_bytes(8, "little")[4:] + second.to_bytes(8, "little")[:4]
+    assert int.from_bytes(straddling, "little") not in SeenSet.from_urls(URLS[:2])
+
+
+def test_round_trips_through_base64_bytes_and_pickle():
+    seen = SeenSet.from_urls(URLS[:10])
+    assert SeenSet.from_b64(seen.to_b64()) == seen
+    assert SeenSet(seen.to_bytes() + b"\x01") == seen
+    assert pickle.loads(pickle.dumps(seen)) == seen
+    assert len(SeenSet.from_b64("not base64!")) == 0
+
+
+def test_legacy_seen_urls_are_converted_on_load(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    (tmp_path / "state.json").write_text(
+        json.dumps({"feeds": {"https://f": {"seen_urls": URLS[:2]}}}), encoding="utf-8"
+    )
+
+    state = store.load_state()
+    assert URLS[1] in store.get_seen_urls(state, "https://f")
+    store.save_state(state)
+
+    saved = json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))["feeds"]["https://f"]
+    assert "seen_urls" not in saved
+    assert len(saved["seen"]) == len(SeenSet.from_urls(URLS[:2]).to_b64())
+    assert URLS[0] in store.get_seen_urls(store.load_state(), "https://f")
+
+
+def test_seen_tracking_is_several_times_smaller_than_url_lists():
+    legacy = len(json.dumps(URLS, indent=2))
+    compact = len(json.dumps(SeenSet.from_urls(URLS).to_b64()))
+    assert len(SeenSet.from_urls(URLS).to_bytes()) == 500 * FINGERPRINT_BYTES
+    assert legacy / compact > 5
+
+    in_memory = sum(sys.getsizeof(url) for url in URLS) + sys.getsizeof(list(URLS))
+    assert in_memory / sys.getsizeof(SeenSet.from_urls(URLS).to_bytes()) > 5
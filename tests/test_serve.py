@@ -0,0 +1,236 @@
+﻿"""
+Tests for the `serve` daemon and the CLI's automatic forwarding to it.
+"""
+from pathlib import Path
+import os
+import shutil
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import daemon
+import exit_codes
+import main
+import store
+
+
+pytestmark = pytest.mark.skipif(not daemon.supported(), reason="no Unix domain sockets")
+
+
+@pytest.fixture
+def socket_path(monkeypatch):
+    # AF_UNIX paths are limited to ~100 bytes; pytest's tmp_path can be longer.
+    short_dir = tempfile.mkdtemp(prefix="rss-")
+    path = Path(short_dir) / "serve.sock"
+    monkeypatch.setenv("RSS_SERVE_SOCKET", str(path))
+    yield path
+    shutil.rmtree(short_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def serving(socket_path):
+    servers = []
+
+    def start(handler):
+        server = daemon.Server(socket_path, handler, log=open(os.devnull, "w"))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        servers.append((server, thread))
+        return server
+
+    yield start
+    for server, thread in servers:
+        server.shutdown()
+        server.server_close()
+        server.log.close()
+        thread.join()
+
+
+def test_cli_forwards_served_commands_to_the_daemon(monkeypatch, tmp_path, capsys, socket_path, serving):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    store.save_digest("2026-04-18", {"Blog": {"feed_url": "https://b.example.com/feed", "articles": [
+        {"title": "Rust 2026 edition", "link": "https://b.example.com/rust", "summary": "Async closures."},
+    ]}})
+    session = main.http_client.build_session(retries=0)
+    serving(main._serve_handler(session))
+
+    calls = []
+    real_call = daemon.call
+    monkeypatch.setattr(daemon, "call", lambda *a, **k: calls.append(a[1]) or real_call(*a, **k))
+    try:
+        monkeypatch.setattr(sys, "argv", ["rss", "history", "2026-04-18"])
+        assert main.main() == exit_codes.OK
+        assert "Rust 2026 edition" in capsys.readouterr().out
+
+        monkeypatch.setattr(sys, "argv", ["rss", "search", "rust", "--since", "April"])
+        assert main.main() == exit_codes.PARAM_ERROR
+        assert calls == [["history", "2026-04-18"], ["search", "rust", "--since", "April"]]
+
+        # Local-only commands never go through the daemon.
+        monkeypatch.setattr(sys, "argv", ["rss", "feeds", "health"])
+        assert main.main() == exit_codes.OK
+        assert len(calls) == 2
+
+        monkeypatch.setenv("RSS_NO_DAEMON", "1")
+        monkeypatch.setattr(sys, "argv", ["rss", "today"])
+        main.main()
+        assert len(calls) == 2
+    finally:
+        session.close()
+
+
+def test_daemon_replies_with_json_and_survives_bad_calls(socket_path, serving):
+    def handler(argv, cwd):
+        if argv == ["boom"]:
+            raise RuntimeError("kaput")
+        print(cwd)
+        return 7
+
+    serving(handler)
+    response = daemon.call(socket_path, ["anything"], cwd="/srv")
+    assert response["code"] == 7 and response["stdout"] == "/srv\n" and response["elapsed_ms"] >= 0
+
+    crashed = daemon.call(socket_path, ["boom"])
+    assert crashed["code"] == daemon.INTERNAL_ERROR and "kaput" in crashed["stderr"]
+    assert daemon.call(socket_path, ["anything"])["code"] == 7
+
+    with pytest.raises(FileExistsError):
+        daemon.Server(socket_path, handler)
+
+
+def test_daemon_refuses_commands_it_does_not_serve(socket_path, serving):
+    serving(main._serve_handler(session=None))
+    response = daemon.call(socket_path, ["wechat", "list"])
+    assert response["code"] == exit_codes.PARAM_ERROR and "not served" in response["stdout"]
+    assert daemon.call(socket_path, ["history", "--help"])["code"] == exit_codes.OK
+
+
+def test_stale_socket_falls_back_to_running_locally(monkeypatch, tmp_path, capsys, socket_path):
+    dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    dead.bind(str(socket_path))
+    dead.close()
+    assert socket_path.exists() and daemon.call(socket_path, ["today"]) is None
+
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(sys, "argv", ["rss", "today"])
+    assert main.main() == exit_codes.OK
+    assert "还没有日报" in capsys.readouterr().out
+
+    # A new daemon replaces the stale socket.
+    server = daemon.Server(socket_path, lambda argv, cwd: 0)
+    server.server_close()
+    assert not socket_path.exists()
+    assert not isinstance(sys.stdout, daemon._ThreadOutput)
+
+
+def test_calls_run_concurrently_with_separate_output(socket_path, serving):
+    release = threading.Event()
+
+    def handler(argv, cwd):
+        print(f"start {argv[0]}")
+        if argv[0] == "slow":
+            assert release.wait(5)
+        print(f"end {argv[0]}", file=sys.stderr)
+        return 0
+
+    serving(handler)
+    slow = {}
+    thread = threading.Thread(target=lambda: slow.update(daemon.call(socket_path, ["slow"])))
+    thread.start()
+    try:
+        # Answered while `slow` is still running.
+        fast = daemon.call(socket_path, ["fast"])
+        assert (fast["stdout"], fast["stderr"]) == ("start fast\n", "end fast\n")
+    finally:
+        release.set()
+        thread.join()
+    assert (slow["stdout"], slow["stderr"]) == ("start slow\n", "end slow\n")
+
+
+def test_watch_is_not_served_and_paths_are_the_clients(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path / "data"))
+    handle = main._serve_handler(session=None)
+    assert "watch" not in daemon.SERVED_COMMANDS
+    assert handle(["watch"], str(tmp_path)) == exit_codes.PARAM_ERROR
+
+    loaded = []
+    real_load = main.config_mod.load_config
+    monkeypatch.setattr(main.config_mod, "load_config", lambda path=None: loaded.append(path) or real_load(path))
+    (tmp_path / "cfg.json").write_text("{}", encoding="utf-8")
+    assert handle(["--config", "cfg.json", "today"], str(tmp_path)) == exit_codes.OK
+    assert handle(["--config", "cfg.json", "today"], str(tmp_path)) == exit_codes.OK
+    # Loaded once, from the client's directory, until the file changes.
+    assert loaded == [str(tmp_path / "cfg.json")]
+    os.utime(tmp_path / "cfg.json", ns=(0, 0))
+    handle(["--config", "cfg.json", "today"], str(tmp_path))
+    assert len(loaded) == 2
+
+
+def test_served_fetch_keeps_the_feed_list_and_dedupe_index_warm(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    feeds_path = main.feeds_mod.get_feeds_config_path()
+    main.feeds_mod.save_local_feeds([{"title": "Local", "url": "https://local.example.com/feed"}])
+    reads = []
+    real_read = main.feeds_mod.json.load
+    monkeypatch.setattr(main.feeds_mod.json, "load", lambda f: reads.append(f.name) or real_read(f))
+    polled = []
+    monkeypatch.setattr(
+        main.pipeline,
+        "run_threaded",
+        lambda run, feeds, **kw: polled.extend(feed["url"] for feed in feeds),
+    )
+    handle = main._serve_handler(session=None)
+    assert {"fetch", "full"} <= daemon.EXCLUSIVE_COMMANDS
+
+    assert handle(["fetch", "--gist", "", "--force"], str(tmp_path)) == exit_codes.OK
+    first_index = main._load_dedupe_index({})
+    assert handle(["fetch", "--gist", "", "--force"], str(tmp_path)) == exit_codes.OK
+    assert polled == ["https://local.example.com/feed"] * 2
+    assert reads.count(str(feeds_path)) == 1
+    assert main._load_dedupe_index({}) is first_index
+
+    main.feeds_mod.save_local_feeds([{"title": "Other", "url": "https://other.example.com/feed"}])
+    os.utime(feeds_path, ns=(0, 0))
+    assert handle(["fetch", "--gist", "", "--force"], str(tmp_path)) == exit_codes.OK
+    assert polled[-1] == "https://other.example.com/feed"
+    assert reads.count(str(feeds_path)) == 2
+
+
+def test_rendered_digest_is_reused_until_the_log_grows(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    feed = {"feed_url": "https://b.example.com/feed"}
+    store.save_digest("2026-04-18", {"Blog": dict(feed, articles=[{"title": "First", "link": "https://b.example.com/1"}])})
+    renders = []
+    real_render = store.render_digest
+    monkeypatch.setattr(store, "render_digest", lambda *a: renders.append(a[0]) or real_render(*a))
+    (tmp_path / "2026-04-18" / "digest.md.key").unlink(missing_ok=True)
+
+    assert "First" in store.read_digest("2026-04-18")
+    assert "First" in store.read_digest("2026-04-18")
+    assert len(renders) == 1
+
+    store.save_digest("2026-04-18", {"Blog": dict(feed, articles=[{"title": "Second", "link": "https://b.example.com/2"}])})
+    assert "Second" in store.read_digest("2026-04-18") and len(renders) == 2
+
+
+def test_warm_calls_answer_in_milliseconds(monkeypatch, tmp_path, capsys, socket_path, serving):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    store.save_digest("2026-04-18", {"Blog": {"feed_url": "https://b.example.com/feed", "articles": [
+        {"title": f"Post {i}", "link": f"https://b.example.com/{i}", "summary": "text"} for i in range(200)
+    ]}})
+    serving(main._serve_handler(session=None))
+
+    samples = []
+    for _ in range(10):
+        response = daemon.call(socket_path, ["history", "2026-04-18"])
+        assert response["code"] == exit_codes.OK and "Post 199" in response["stdout"]
+        samples.append(response["elapsed_ms"])
+    with capsys.disabled():
+        print(f"\nwarm daemon history call: median {statistics.median(samples):.1f} ms")
+    assert statistics.median(samples) < 50
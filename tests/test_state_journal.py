@@ -0,0 +1,80 @@
+﻿"""
+Tests for the append-only state journal.
+"""
+from pathlib import Path
+import json
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import store
+from seen_set import fingerprint
+
+
+def _big_state(tmp_path, feeds=300):
+    state = store.load_state()
+    for i in range(feeds):
+        store.mark_seen(state, f"https://feed{i}.example.com/rss", [f"https://feed{i}.example.com/{n}" for n in range(50)])
+    store.save_state(state)
+    return store.load_state()
+
+
+def test_checkpoint_appends_only_changed_feeds(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    state = _big_state(tmp_path)
+    snapshot = (tmp_path / "state.json").read_bytes()
+
+    store.update_feed_fetch_meta(state, "https://feed1.example.com/rss", status="ok", etag='"v2"')
+    store.mark_seen(state, "https://feed2.example.com/rss", ["https://feed2.example.com/new", "https://feed2.example.com/0"])
+    store.checkpoint_state(state)
+
+    assert (tmp_path / "state.json").read_bytes() == snapshot
+    records = [json.loads(line) for line in (tmp_path / "state.journal").read_text(encoding="utf-8").splitlines()]
+    assert [r["feed"] for r in records] == ["https://feed1.example.com/rss", "https://feed2.example.com/rss"]
+    assert records[0]["meta"]["etag"] == '"v2"'
+    assert records[1]["seen_add"] == [fingerprint("https://feed2.example.com/new")]
+    assert "seen" not in records[1]["meta"]
+    assert (tmp_path / "state.journal").stat().st_size < len(snapshot) / 50
+
+    # Nothing changed since: no new journal lines.
+    store.checkpoint_state(state)
+    assert len((tmp_path / "state.journal").read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_load_replays_journal_and_save_compacts(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    state = _big_state(tmp_path, feeds=5)
+
+    store.update_feed_fetch_meta(state, "https://new.example.com/rss", status="error", is_error=True)
+    store.mark_seen(state, "https://feed0.example.com/rss", ["https://feed0.example.com/fresh"])
+    store.checkpoint_state(state)
+    with open(tmp_path / "state.journal", "a", encoding="utf-8") as f:
+        f.write('{"feed": "https://torn')
+
+    replayed = store.load_state()
+    assert replayed == state
+    assert replayed["feeds"]["https://new.example.com/rss"]["consecutive_failures"] == 1
+    assert "https://feed0.example.com/fresh" in store.get_seen_urls(replayed, "https://feed0.example.com/rss")
+
+    store.save_state(replayed)
+    assert not (tmp_path / "state.journal").exists()
+    assert store.load_state() == state
+
+
+def test_checkpoint_compacts_large_journal_and_plain_dicts(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    state = store.load_state()
+    store.mark_seen(state, "https://a.example.com/rss", ["https://a.example.com/1"])
+    store.checkpoint_state(state)
+    assert (tmp_path / "state.journal").exists()
+
+    monkeypatch.setattr(store, "JOURNAL_COMPACT_BYTES", 0)
+    store.mark_seen(state, "https://a.example.com/rss", ["https://a.example.com/2"])
+    store.checkpoint_state(state)
+    assert not (tmp_path / "state.journal").exists()
+    assert store.load_state() == state
+
+    plain = {"feeds": {}}
+    store.mark_seen(plain, "https://b.example.com/rss", ["https://b.example.com/1"])
+    store.checkpoint_state(plain)
+    assert "https://b.example.com/rss" in json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))["feeds"]
@@ -0,0 +1,110 @@
+﻿"""
+Tests for the SQLite storage backend and the JSON migration.
+"""
+from pathlib import Path
+import sqlite3
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import exit_codes
+import main
+import store
+
+
+FEED = "https://blog.example.com/feed.xml"
+
+
+def _use_sqlite(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("RSS_STORAGE_BACKEND", "sqlite")
+
+
+def test_state_round_trips_through_sqlite(monkeypatch, tmp_path):
+    _use_sqlite(monkeypatch, tmp_path)
+    monkeypatch.setattr(store, "MAX_SEEN_URLS", 3)
+
+    state = store.load_state()
+    assert isinstance(state, store.SQLiteState)
+    store.update_feed_fetch_meta(state, FEED, status="ok", etag='"v1"')
+    store.mark_seen(state, FEED, [f"https://blog.example.com/{i}" for i in range(2)])
+    store.checkpoint_state(state)
+    store.mark_seen(state, FEED, [f"https://blog.example.com/{i}" for i in range(5)])
+    store.save_state(state)
+
+    reloaded = store.load_state()
+    assert FEED in reloaded["feeds"]
+    assert "https://other.example.com/rss" not in reloaded["feeds"]
+    assert reloaded["feeds"][FEED]["etag"] == '"v1"'
+    seen = store.get_seen_urls(reloaded, FEED)
+    assert [url in seen for url in (f"https://blog.example.com/{i}" for i in range(5))] == [False, False, True, True, True]
+    assert seen == state["feeds"][FEED]["seen"]
+    assert store.get_feed_conditional_headers(reloaded, FEED) == {"If-None-Match": '"v1"'}
+    assert dict(reloaded["feeds"]) == dict(state["feeds"])
+    assert not (tmp_path / "state.json").exists()
+
+
+def test_full_index_lookup_and_gc(monkeypatch, tmp_path):
+    _use_sqlite(monkeypatch, tmp_path)
+    article = tmp_path / "a.md"
+    article.write_text("# A", encoding="utf-8")
+
+    store.index_full_article("https://blog.example.com/a", "2026-04-19", article)
+    assert store.lookup_full_article("https://blog.example.com/a") == article
+    assert store.lookup_full_article("https://blog.example.com/a", date_str="2026-04-20") is None
+
+    article.unlink()
+    assert store.lookup_full_article("https://blog.example.com/a") is None
+    assert store.gc_full_index() == {"checked": 1, "removed": 1}
+    db = store.open_state_db()
+    assert db.lookup_full_article(store._url_hash("https://blog.example.com/a")) is None
+    db.close()
+    assert not (tmp_path / "full_index").exists()
+
+
+def test_readers_see_committed_state_while_a_writer_is_open(monkeypatch, tmp_path):
+    _use_sqlite(monkeypatch, tmp_path)
+    state = store.load_state()
+    store.update_feed_fetch_meta(state, FEED, status="ok", etag='"v1"')
+    store.checkpoint_state(state)
+
+    writer = sqlite3.connect(str(tmp_path / "state.db"))
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("DELETE FROM feeds")
+    try:
+        reader = store.load_state()
+        assert reader["feeds"][FEED]["etag"] == '"v1"'
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+def test_migrate_moves_json_state_and_index(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    monkeypatch.delenv("RSS_STORAGE_BACKEND", raising=False)
+    article = tmp_path / "a.md"
+    article.write_text("# A", encoding="utf-8")
+
+    state = store.load_state()
+    store.mark_seen(state, FEED, ["https://blog.example.com/1"])
+    store.save_state(state)
+    store.update_feed_fetch_meta(state, FEED, status="ok", etag='"v2"')
+    store.checkpoint_state(state)
+    store.index_full_article("https://blog.example.com/1", "2026-04-19", article)
+    assert store.get_storage_backend() == "json"
+
+    assert main.cmd_storage_migrate() == exit_codes.OK
+    assert "Migrated 1 feeds and 1 indexed articles" in capsys.readouterr().out
+    assert store.get_storage_backend() == "sqlite"
+    assert sorted(p.name for p in tmp_path.glob("*.migrated")) == [
+        "catalog.migrated",
+        "full_index.migrated",
+        "state.journal.migrated",
+        "state.json.migrated",
+    ]
+
+    migrated = store.load_state()
+    assert dict(migrated["feeds"]) == dict(state["feeds"])
+    assert store.lookup_full_article("https://blog.example.com/1") == article
+
+    assert main.cmd_storage_migrate() == exit_codes.STORAGE_ERROR
@@ -10,6 +10,7 @@ from unittest.mock import patch
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
 import store
+from seen_set import fingerprint
 
 
 class TestStoreURLOrder:
@@ -25,8 +26,8 @@ class TestStoreURLOrder:
             store.mark_seen(state, "http://feed1.com", [url])
         
         # Check order is preserved (not random set order)
-        saved_urls = state["feeds"]["http://feed1.com"]["seen_urls"]
-        assert saved_urls == urls, f"URL order should be preserved, got {saved_urls}"
+        saved = list(state["feeds"]["http://feed1.com"]["seen"])
+        assert saved == [fingerprint(url) for url in urls], "URL order should be preserved"
 
     def test_old_urls_preserved_when_truncating(self):
         """When truncating to 500, oldest URLs should be removed, not random."""
@@ -37,12 +38,12 @@ class TestStoreURLOrder:
         for url in urls:
             store.mark_seen(state, "http://feed1.com", [url])
         
-        saved_urls = state["feeds"]["http://feed1.com"]["seen_urls"]
+        saved = list(state["feeds"]["http://feed1.com"]["seen"])
         
         # Should keep the most recent 500, not random 500
-        assert len(saved_urls) == 500
-        assert saved_urls[0] == "http://example.com/100", "Oldest should be removed"
-        assert saved_urls[-1] == "http://example.com/599", "Newest should be kept"
+        assert len(saved) == 500
+        assert saved[0] == fingerprint("http://example.com/100"), "Oldest should be removed"
+        assert saved[-1] == fingerprint("http://example.com/599"), "Newest should be kept"
 
 
 class TestStoreJSONDecodeError:
@@ -2,10 +2,13 @@
 Tests for full article index behavior.
 """
 from pathlib import Path
+import json
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
 
+import exit_codes
+import main
 import store
 
 
@@ -39,7 +42,7 @@ def test_lookup_full_article_respects_date(monkeypatch, tmp_path):
     assert miss is None
 
 
-def test_lookup_full_article_cleans_stale_index(monkeypatch, tmp_path):
+def test_gc_removes_stale_index_entries(monkeypatch, tmp_path, capsys):
     monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
 
     article = {
@@ -52,9 +55,71 @@ def test_lookup_full_article_cleans_stale_index(monkeypatch, tmp_path):
 
     miss = store.lookup_full_article("https://example.com/a3", date_str="2026-03-07")
     assert miss is None
+    # Lookups never write; gc removes stale entries in bulk.
+    assert len(store.load_full_index()["articles"]) == 1
 
-    index = store.load_full_index()
-    # stale entry should be removed lazily
-    entries = index.get("articles", {})
-    assert len(entries) == 0
+    assert main.cmd_gc() == exit_codes.OK
+    assert "checked=1 removed=1" in capsys.readouterr().out
+    assert store.load_full_index()["articles"] == {}
+
+
+def _index_many(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"{i}.md"
+        path.write_text("x", encoding="utf-8")
+        paths.append(path)
+        store.index_full_article(f"https://example.com/many/{i}", "2026-03-07", path)
+    return paths
+
+
+def test_index_is_sharded_and_batch_writes_each_shard_once(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    writes = []
+    original_write = store.ShardedIndex._write
+
+    def counting_write(self, shard, data):
+        writes.append((self.root.name, shard))
+        original_write(self, shard, data)
+
+    monkeypatch.setattr(store.ShardedIndex, "_write", counting_write)
+
+    with store.full_index_batch():
+        paths = _index_many(tmp_path, 300)
+        assert writes == []
+        assert store.lookup_full_article("https://example.com/many/7") == paths[7]
+
+    assert len(writes) == len(set(writes))
+    for root in ("full_index", "catalog"):
+        assert len([shard for name, shard in writes if name == root]) == len(list((tmp_path / root).glob("*.json")))
+    shard = tmp_path / "full_index" / f"{store._url_hash('https://example.com/many/7')[:2]}.json"
+    assert store._url_hash("https://example.com/many/7") in json.loads(shard.read_text(encoding="utf-8"))
+    assert len(store.load_full_index()["articles"]) == 300
+
+    # A lookup reads one shard, not the whole index.
+    opened = []
+    real_open = open
+
+    def tracking_open(file, *args, **kwargs):
+        opened.append(Path(file))
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    store._FULL_INDEXES.clear()
+    assert store.lookup_full_article("https://example.com/many/42") == paths[42]
+    assert [p.parent.name for p in opened] == ["full_index"]
+
+
+def test_legacy_full_index_json_is_imported(monkeypatch, tmp_path):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    article = tmp_path / "old.md"
+    article.write_text("x", encoding="utf-8")
+    entry = {"url": "https://example.com/old", "date": "2026-01-01", "path": str(article), "updated_at": ""}
+    (tmp_path / "full_index.json").write_text(
+        json.dumps({"articles": {store._url_hash("https://example.com/old"): entry}}), encoding="utf-8"
+    )
+
+    assert store.lookup_full_article("https://example.com/old") == article
+    assert not (tmp_path / "full_index.json").exists()
+    assert (tmp_path / "full_index.json.migrated").exists()
 
@@ -28,7 +28,8 @@ def test_load_state_normalizes_existing_feed_state(monkeypatch, tmp_path):
 
     feed_state = state["feeds"]["https://f"]
     assert feed_state["etag"] == "abc"
-    assert feed_state["seen_urls"] == []
+    assert len(feed_state["seen"]) == 0
+    assert "seen_urls" not in feed_state
     assert feed_state["last_status"] == "never"
 
 
@@ -64,7 +65,7 @@ def test_load_full_index_invalid_returns_empty(monkeypatch, tmp_path):
 
 def test_seen_urls_and_conditional_headers_and_meta_updates():
     state = {"feeds": {}}
-    assert store.get_seen_urls(state, "https://feed") == set()
+    assert len(store.get_seen_urls(state, "https://feed")) == 0
     assert store.get_feed_conditional_headers(state, "https://feed") == {}
 
     store.mark_seen(state, "https://feed", ["a", "a", "b"])
@@ -123,12 +124,13 @@ def test_save_full_article_and_digest_round_trip(monkeypatch, tmp_path):
         },
     )
 
-    digest_text = digest_path.read_text(encoding="utf-8")
+    digest_text = store.read_digest("2026-03-08")
     digest_json = store.load_digest_data("2026-03-08")
+    assert digest_path.name == "digest.ndjson"
     assert "RSS 日报" in digest_text
     assert "Second" in digest_text
     assert len(digest_json["Example Feed"]["articles"]) == 2
-    assert store.read_digest("2026-03-08") == digest_text
+    assert (digest_path.parent / "digest.md").read_text(encoding="utf-8") == digest_text
 
 
 def test_read_digest_missing_and_text_helpers(monkeypatch, tmp_path):
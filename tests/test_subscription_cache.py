@@ -0,0 +1,160 @@
+﻿"""
+Tests for the cached, conditional retrieval of Gist/OPML subscription lists.
+"""
+import json
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import config
+import exit_codes
+import gist
+import http_client
+import main
+import subscription_cache
+
+
+GIST_URL = "https://gist.github.com/user/abc123"
+OPML = (
+    '<opml version="2.0"><body><outline text="Tech">'
+    '<outline text="Blog" xmlUrl="https://blog.example/feed" htmlUrl="https://blog.example/"/>'
+    "</outline></body></opml>"
+)
+GIST_JSON = json.dumps({"files": {"subs.opml": {"content": OPML}}})
+
+
+class FakeServer:
+    """Stands in for `http_client.fetch_text` with ETag/Last-Modified semantics."""
+
+    def __init__(self, body, etag='"v1"', last_modified="Sun, 08 Mar 2026 10:00:00 GMT"):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests = []
+        self.fail = False
+
+    def __call__(self, url, *, headers=None, **_kwargs):
+        headers = headers or {}
+        self.requests.append((url, headers))
+        if self.fail:
+            return http_client.HTTPResult(ok=False, error="HTTP 503", error_kind="network")
+        validators = {"etag": self.etag, "last-modified": self.last_modified}
+        if "If-None-Match" in headers:
+            not_modified = headers["If-None-Match"] == self.etag
+        else:
+            not_modified = headers.get("If-Modified-Since") == self.last_modified
+        if not_modified:
+            return http_client.HTTPResult(ok=True, status_code=304, headers=validators)
+        return http_client.HTTPResult(ok=True, status_code=200, text=self.body, headers=validators)
+
+
+def test_gist_list_is_served_from_the_manifest_then_revalidated(monkeypatch, tmp_path):
+    server = FakeServer(GIST_JSON)
+    monkeypatch.setattr(gist.http_client, "fetch_text", server)
+    parses = []
+    real_parse = gist.parse_opml
+    monkeypatch.setattr(gist, "parse_opml", lambda text: parses.append(text) or real_parse(text))
+    options = {"session": object(), "cache_dir": tmp_path}
+
+    feeds, kind, message = gist.import_gist_opml_detailed(GIST_URL, ttl_sec=3600, **options)
+    assert kind is None and message is None
+    assert feeds == [
+        {"title": "Blog", "url": "https://blog.example/feed", "html_url": "https://blog.example/", "tags": ["Tech"]}
+    ]
+    assert server.requests[0][0] == "https://api.github.com/gists/abc123"
+    assert server.requests[0][1]["Accept"] == gist.GITHUB_ACCEPT
+    assert "If-None-Match" not in server.requests[0][1]
+
+    # Fresh manifest: no request, no parsing.
+    assert gist.import_gist_opml_detailed(GIST_URL, ttl_sec=3600, **options)[0] == feeds
+    assert len(server.requests) == 1 and len(parses) == 1
+
+    # Past the TTL: one conditional request, answered with 304.
+    assert gist.import_gist_opml_detailed(GIST_URL, ttl_sec=0, **options)[0] == feeds
+    assert len(server.requests) == 2 and len(parses) == 1
+    assert server.requests[1][1]["If-None-Match"] == '"v1"'
+
+    # The list changed upstream.
+    server.etag = '"v2"'
+    server.body = GIST_JSON.replace("Blog", "Renamed blog")
+    assert gist.import_gist_opml_detailed(GIST_URL, ttl_sec=0, **options)[0][0]["title"] == "Renamed blog"
+    assert subscription_cache.load(tmp_path, "https://api.github.com/gists/abc123").etag == '"v2"'
+
+
+def test_unreachable_source_falls_back_to_the_cached_list(monkeypatch, tmp_path):
+    server = FakeServer(OPML, etag="")
+    monkeypatch.setattr(gist.http_client, "fetch_text", server)
+    url = "https://example.com/subs.opml"
+
+    feeds, _kind, _message = gist.import_opml_from_url_detailed(url, session=object(), cache_dir=tmp_path)
+    assert [feed["url"] for feed in feeds] == ["https://blog.example/feed"]
+    gist.import_opml_from_url_detailed(url, session=object(), cache_dir=tmp_path)
+    assert server.requests[1][1] == {"If-Modified-Since": "Sun, 08 Mar 2026 10:00:00 GMT"}
+
+    server.fail = True
+    stale, kind, message = gist.import_opml_from_url_detailed(url, session=object(), cache_dir=tmp_path)
+    assert stale == feeds and kind == "network" and "using the list cached at" in message
+
+    other, kind, message = gist.import_opml_from_url_detailed(
+        "https://example.com/other.opml", session=object(), cache_dir=tmp_path
+    )
+    assert other == [] and kind == "network" and message == "HTTP 503"
+
+
+def test_corrupt_or_foreign_manifests_are_ignored(tmp_path):
+    source = "https://example.com/subs.opml"
+    path = subscription_cache.manifest_path(tmp_path, source)
+    path.write_text("{not json", encoding="utf-8")
+    assert subscription_cache.load(tmp_path, source) is None
+
+    subscription_cache.save(tmp_path, subscription_cache.Manifest(source="https://elsewhere/", feeds=[{"url": "u"}]))
+    foreign = subscription_cache.manifest_path(tmp_path, "https://elsewhere/")
+    path.write_text(foreign.read_text(encoding="utf-8"), encoding="utf-8")
+    assert subscription_cache.load(tmp_path, source) is None
+    assert subscription_cache.load(tmp_path, "https://elsewhere/").feeds == [{"url": "u"}]
+
+
+def test_manifest_is_parsed_again_only_after_it_is_rewritten(monkeypatch, tmp_path):
+    source = "https://example.com/subs.opml"
+    subscription_cache.save(tmp_path, subscription_cache.Manifest(source=source, feeds=[{"url": "u"}], checked_at=1.0))
+    reads = []
+    real_read = subscription_cache._read
+    monkeypatch.setattr(subscription_cache, "_read", lambda *a: reads.append(a) or real_read(*a))
+
+    first = subscription_cache.load(tmp_path, source)
+    first.checked_at = 99.0
+    first.feeds.append({"url": "added"})
+    again = subscription_cache.load(tmp_path, source)
+    assert (again.checked_at, again.feeds) == (1.0, [{"url": "u"}])
+    assert len(reads) == 1
+
+    subscription_cache.save(tmp_path, subscription_cache.Manifest(source=source, feeds=[{"url": "v2"}], checked_at=2.0))
+    assert subscription_cache.load(tmp_path, source).feeds == [{"url": "v2"}]
+    assert len(reads) == 2
+
+
+def test_list_uses_the_configured_ttl_and_import_revalidates(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    server = FakeServer(GIST_JSON)
+    monkeypatch.setattr(gist.http_client, "fetch_text", server)
+    cfg = config.normalize_config({"subscriptions": {"ttl_min": 30}})
+
+    assert main.cmd_list_feeds(GIST_URL, cfg, object()) == exit_codes.OK
+    assert main.cmd_list_feeds(GIST_URL, cfg, object()) == exit_codes.OK
+    assert len(server.requests) == 1
+    assert list((tmp_path / "subscriptions").glob("*.json"))
+
+    monkeypatch.setattr(
+        main.fetcher,
+        "fetch_feed_detailed",
+        lambda *_a, **_k: (SimpleNamespace(entries=[]), None, SimpleNamespace(error_kind=None)),
+    )
+    assert main.cmd_import_gist(GIST_URL, 1, cfg, object()) == exit_codes.OK
+    assert len(server.requests) == 2 and "If-None-Match" in server.requests[1][1]
+
+    server.fail = True
+    assert main.cmd_list_feeds(GIST_URL, config.normalize_config({"subscriptions": {"ttl_min": 0}}), object()) == exit_codes.OK
+    out = capsys.readouterr().out
+    assert "⚠️  HTTP 503 (using the list cached at" in out and "1. Blog" in out
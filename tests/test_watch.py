@@ -0,0 +1,143 @@
+﻿"""
+Tests for `watch` mode: per-feed due times, staggered start-up and per-arrival digests.
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import config
+import exit_codes
+import main
+import pipeline
+import store
+import watch
+
+
+SCHEDULE = {"min_interval_sec": 900, "max_interval_sec": 86400}
+NET_OPTS = {"connect_timeout_sec": 1, "read_timeout_sec": 1, "max_bytes": 1024 * 1024, "retries": 0}
+# Distinct enough that cross-feed dedupe keeps them all.
+TITLES = [
+    "Rust 2026 edition ships async closures",
+    "Postgres adds incremental materialized views",
+    "A field guide to tuning garbage collectors",
+    "Why our team moved builds to remote caching",
+    "Notes from a week of profiling SQLite",
+    "Designing polite crawlers for tiny servers",
+]
+
+
+def _fake_fetch(calls, delay=0.0):
+    lock = threading.Lock()
+    running = [0]
+
+    def fake_fetch(url, **_kwargs):
+        with lock:
+            running[0] += 1
+            calls.append((url, time.time(), running[0]))
+            title = TITLES[(len(calls) - 1) % len(TITLES)]
+        time.sleep(delay)
+        with lock:
+            running[0] -= 1
+        entries = [{"title": title, "link": f"{url}/post-1", "published": "2026-03-08"}]
+        meta = SimpleNamespace(status_code=200, etag="", last_modified="", error_kind=None)
+        return SimpleNamespace(entries=entries), None, meta
+
+    return fake_fetch
+
+
+def _watcher(state, on_result=None, workers=2):
+    run = pipeline.FetchRun(state=state, limit=10, net_opts=NET_OPTS, security_opts={}, schedule=SCHEDULE)
+    return watch.Watcher(run, workers=workers, session=object(), on_result=on_result or (lambda _result: None))
+
+
+def test_feed_next_due_honours_quarantine():
+    state = {"feeds": {}}
+    assert store.feed_next_due(state, "https://e.com/feed") is None
+
+    store.schedule_next_fetch(state, "https://e.com/feed", new_count=0, **SCHEDULE)
+    next_due = store.feed_next_due(state, "https://e.com/feed")
+    assert next_due is not None and next_due > datetime.now(timezone.utc)
+
+    until = datetime.now(timezone.utc) + timedelta(days=1)
+    state["feeds"]["https://e.com/feed"]["quarantine_until"] = until.isoformat()
+    assert store.feed_next_due(state, "https://e.com/feed") == until
+
+
+def test_watcher_polls_each_feed_when_due(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pipeline.fetcher, "fetch_feed_detailed", _fake_fetch(calls))
+    soon = "https://c-notes.example/feed"
+    state = {"feeds": {soon: {"next_due": (datetime.now(timezone.utc) + timedelta(seconds=0.3)).isoformat()}}}
+    results = []
+    watcher = _watcher(state, on_result=results.append)
+    feeds = [
+        {"title": "A", "url": "https://a-blog.example/feed"},
+        {"title": "B", "url": "https://b-news.example/feed"},
+        {"title": "C", "url": soon},
+    ]
+    start = time.time()
+    # Two overdue feeds spread over 1.2 s: A now, B at +0.6 s; C is due at +0.3 s.
+    watcher.set_feeds(feeds, spread_sec=1.2)
+    try:
+        while watcher.polls < 3 and time.time() - start < 5:
+            watcher.step(max_wait_sec=0.05)
+    finally:
+        watcher.close()
+
+    assert [url for url, _ts, _running in calls] == [
+        "https://a-blog.example/feed", soon, "https://b-news.example/feed",
+    ]
+    assert calls[1][1] - start >= 0.25 and calls[2][1] - start >= 0.55
+    assert len(results) == 3 and all(result["new_count"] == 1 for result in results)
+    assert watcher.peak_in_flight <= 2
+    # Back on the heap at the schedule each poll just learned.
+    for feed in feeds:
+        assert watcher.next_due(feed["url"]) == store.feed_next_due(state, feed["url"]).timestamp()
+        assert watcher.next_due(feed["url"]) >= start + SCHEDULE["min_interval_sec"] - 1
+
+
+def test_watcher_drops_removed_feeds_and_bounds_concurrency(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pipeline.fetcher, "fetch_feed_detailed", _fake_fetch(calls, delay=0.05))
+    watcher = _watcher({"feeds": {}}, workers=2)
+    feeds = [{"title": f"F{i}", "url": f"https://host{i}.example/feed"} for i in range(6)]
+    watcher.set_feeds(feeds)
+    watcher.set_feeds(feeds[:5])
+    start = time.time()
+    try:
+        while watcher.polls < 5 and time.time() - start < 5:
+            watcher.step(max_wait_sec=0.05)
+    finally:
+        watcher.close()
+
+    assert sorted(url for url, _ts, _running in calls) == sorted(feed["url"] for feed in feeds[:5])
+    assert max(running for _url, _ts, running in calls) <= 2
+    assert watcher.peak_in_flight == 2
+    assert watcher.next_due(feeds[5]["url"]) is None and watcher.scheduled == 5
+
+
+def test_cmd_watch_appends_digest_as_feeds_arrive(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    cfg = config.normalize_config({})
+    feeds = [
+        {"title": "Alpha", "url": "https://a-blog.example/feed"},
+        {"title": "Beta", "url": "https://b-news.example/feed"},
+    ]
+    calls = []
+    monkeypatch.setattr(main.feeds_mod, "collect_all_feeds_detailed", lambda *_a, **_k: (feeds, None, None))
+    monkeypatch.setattr(main.fetcher, "fetch_feed_detailed", _fake_fetch(calls))
+
+    code = main.cmd_watch("", 10, 2, cfg, object(), spread_min=0, duration_min=0.01)
+
+    out = capsys.readouterr().out
+    assert code == exit_codes.OK
+    assert len(calls) == 2
+    assert "📊 watch: polls=2 new=2 duplicates=0 errors=0" in out
+    digest = store.load_digest_data(datetime.now().strftime("%Y-%m-%d"))
+    assert set(digest) == {"Alpha", "Beta"}
+    assert store.feed_next_due(store.load_state(), "https://a-blog.example/feed") is not None
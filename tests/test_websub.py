@@ -0,0 +1,265 @@
+﻿"""
+Tests for WebSub push subscriptions, against a local stand-in hub.
+"""
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlencode
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "holo-rss-reader" / "scripts"))
+
+import config
+import exit_codes
+import fetcher
+import main
+import pipeline
+import store
+import watch
+import websub
+
+
+FEED_URL = "https://blog.example/feed"
+TOPIC = "https://blog.example/feed.xml"
+
+
+def _rss(hub_url, items, version="2.0"):
+    entries = "".join(
+        f"<item><title>{title}</title><link>{link}</link><pubDate>Sun, 08 Mar 2026 10:00:00 GMT</pubDate></item>"
+        for title, link in items
+    )
+    return (
+        f'<?xml version="1.0" encoding="utf-8"?><rss version="{version}" xmlns:atom="http://www.w3.org/2005/Atom">'
+        f"<channel><title>Blog</title><link>https://blog.example/</link>"
+        f'<atom:link rel="hub" href="{hub_url}"/><atom:link rel="self" href="{TOPIC}"/>'
+        f"{entries}</channel></rss>"
+    )
+
+
+class StandInHub:
+    """Accepts subscriptions, verifies intent in the background and can publish."""
+
+    def __init__(self):
+        hub = self
+        self.subscriptions = {}
+        self.verified = threading.Event()
+        self.on_verified = None
+        # Talk to the callback directly even if a proxy is configured.
+        self.http = requests.Session()
+        self.http.trust_env = False
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                form = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+                self.send_response(202)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                threading.Thread(target=hub._verify, args=(form,), daemon=True).start()
+
+            def log_message(self, *_args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hub"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def _verify(self, form):
+        query = urlencode({
+            "hub.mode": form["hub.mode"],
+            "hub.topic": form["hub.topic"],
+            "hub.challenge": "c4ll3nge",
+            "hub.lease_seconds": "600",
+        })
+        response = self.http.get(f"{form['hub.callback']}?{query}", timeout=5)
+        if response.status_code == 200 and response.text == "c4ll3nge":
+            self.subscriptions[form["hub.topic"]] = form
+            self.verified.set()
+            if self.on_verified is not None:
+                self.on_verified()
+
+    def publish(self, topic, body, *, secret=None):
+        form = self.subscriptions[topic]
+        signature = websub.sign(secret or form["hub.secret"], body)
+        return self.http.post(
+            form["hub.callback"],
+            data=body,
+            headers={"Content-Type": "application/rss+xml; charset=utf-8", "X-Hub-Signature": signature},
+            timeout=5,
+        )
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.http.close()
+
+
+@pytest.fixture
+def hub():
+    stand_in = StandInHub()
+    yield stand_in
+    stand_in.close()
+
+
+@pytest.fixture
+def callback():
+    delivered = []
+    subscriber = websub.Subscriber("", deliver=lambda url, text: delivered.append((url, text)))
+    server = websub.CallbackServer(("127.0.0.1", 0), subscriber)
+    subscriber.callback_url = f"http://127.0.0.1:{server.server_port}/websub"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield subscriber, delivered
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_hub_links_are_detected_and_remembered():
+    streamed, error = fetcher.parse_feed_text(_rss("https://hub.example/", [("A", "https://blog.example/a")]))
+    assert error is None and websub.discover(streamed.feed) == ("https://hub.example/", TOPIC)
+
+    # RSS 0.91 goes through feedparser, which exposes the same `links`.
+    legacy, _error = fetcher.parse_feed_text(_rss("https://hub.example/", [], version="0.91"))
+    assert websub.discover(legacy.feed) == ("https://hub.example/", TOPIC)
+
+    atom = (
+        '<feed xmlns="http://www.w3.org/2005/Atom"><title>T</title>'
+        '<link rel="alternate" href="https://a.example/"/><link rel="hub" href="https://hub.example/"/></feed>'
+    )
+    parsed, _error = fetcher.parse_feed_text(atom)
+    assert parsed.feed["link"] == "https://a.example/"
+    assert websub.discover(parsed.feed) == ("https://hub.example/", "")
+    assert websub.discover({"links": [{"rel": "self", "href": TOPIC}]}) is None
+
+    run = pipeline.FetchRun(state={"feeds": {}}, limit=10, net_opts={}, security_opts={})
+    pipeline.apply_fetch_outcome(
+        run, {"title": "Blog", "url": FEED_URL}, streamed, None, fetcher.FeedFetchMeta(status_code=200)
+    )
+    assert store.get_feed_hub(run.state, FEED_URL) == ("https://hub.example/", TOPIC)
+    store.update_feed_hub(run.state, FEED_URL, "https://hub.example/", "")
+    assert store.get_feed_hub(run.state, FEED_URL) == ("https://hub.example/", FEED_URL)
+
+
+def test_private_network_hubs_are_refused_in_restricted_mode(monkeypatch):
+    restricted = {"security_mode": "restricted", "allowlist": []}
+    streamed, _error = fetcher.parse_feed_text(_rss("http://10.0.0.5/hub", [("A", "https://blog.example/a")]))
+    run = pipeline.FetchRun(state={"feeds": {}}, limit=10, net_opts={}, security_opts=restricted)
+    pipeline.apply_fetch_outcome(
+        run, {"title": "Blog", "url": FEED_URL}, streamed, None, fetcher.FeedFetchMeta(status_code=200)
+    )
+    assert store.get_feed_hub(run.state, FEED_URL) is None
+
+    posts = []
+    monkeypatch.setattr(websub.http_client, "post_form", lambda *a, **k: posts.append(a))
+    subscriber = websub.Subscriber("https://reader.example/websub", deliver=print, security_opts=restricted)
+    assert not subscriber.track(FEED_URL, "http://127.0.0.1:8080/hub", TOPIC)
+    assert not subscriber.track(FEED_URL, "https://hub.example/", "http://192.168.1.1/feed")
+    assert subscriber.subscription(FEED_URL) is None
+    assert subscriber.maintain() == 0 and posts == []
+    assert websub.validate_hub("https://hub.example/", TOPIC, **restricted) is None
+
+
+def test_subscription_is_verified_and_only_signed_pushes_are_delivered(hub, callback):
+    subscriber, delivered = callback
+    subscriber.track(FEED_URL, hub.url, TOPIC)
+    assert subscriber.maintain() == 1
+    assert hub.verified.wait(5)
+    assert subscriber.push_until(FEED_URL) > time.time() + 500
+    # Nothing is due again until the lease nears its end.
+    assert subscriber.maintain() == 0
+
+    body = _rss(hub.url, [("Pushed", "https://blog.example/pushed")]).encode()
+    assert hub.publish(TOPIC, body).status_code == 202
+    assert delivered == [(FEED_URL, body.decode())]
+
+    forged = hub.publish(TOPIC, body, secret="not-the-secret")
+    assert forged.status_code == 202 and len(delivered) == 1 and subscriber.rejected == 1
+
+    token = subscriber.subscription(FEED_URL).token
+    assert subscriber.verify(token, {"hub.mode": "subscribe", "hub.topic": "https://other/", "hub.challenge": "x"})[0] == 404
+    assert hub.http.post(f"{subscriber.callback_url}/unknown", data=body, timeout=5).status_code == 404
+
+    assert subscriber.verify(token, {"hub.mode": "denied", "hub.topic": TOPIC, "hub.reason": "no"}) == (200, "")
+    assert subscriber.push_until(FEED_URL) is None
+
+
+def test_failed_subscription_keeps_the_feed_polled(callback):
+    subscriber, _delivered = callback
+    subscriber.track(FEED_URL, "http://127.0.0.1:9/hub", TOPIC)
+    subscriber.maintain()
+    sub = subscriber.subscription(FEED_URL)
+    assert sub.status == "failed" and sub.error
+    assert subscriber.push_until(FEED_URL) is None and subscriber.maintain() == 0
+
+
+def test_watcher_skips_polls_while_a_push_lease_is_active(monkeypatch):
+    fetched = []
+
+    def fake_fetch(url, **_kwargs):
+        fetched.append(url)
+        return fetcher.parse_feed_text(_rss("https://hub.example/", []))[0], None, fetcher.FeedFetchMeta(status_code=200)
+
+    monkeypatch.setattr(pipeline.fetcher, "fetch_feed_detailed", fake_fetch)
+    lease_end = time.time() + 100
+    run = pipeline.FetchRun(state={"feeds": {}}, limit=10, net_opts={
+        "connect_timeout_sec": 1, "read_timeout_sec": 1, "max_bytes": 1024, "retries": 0,
+    }, security_opts={})
+    results = []
+    watcher = watch.Watcher(
+        run, workers=2, session=object(), on_result=results.append,
+        push_until=lambda url: lease_end if url == FEED_URL else None,
+    )
+    watcher.set_feeds([{"title": "Blog", "url": FEED_URL}, {"title": "Other", "url": "https://other.example/feed"}])
+    try:
+        watcher.step(max_wait_sec=0.2)
+        watcher.step(max_wait_sec=0.2)
+        watcher.deliver(FEED_URL, _rss("https://hub.example/", [("Pushed", "https://blog.example/pushed")]))
+        watcher.step(max_wait_sec=0)
+    finally:
+        watcher.close()
+
+    assert fetched == ["https://other.example/feed"]
+    assert watcher.next_due(FEED_URL) == lease_end
+    pushed = [result for result in results if result.get("pushed")]
+    assert len(pushed) == 1 and pushed[0]["new_count"] == 1 and watcher.pushes == 1
+
+
+def test_cmd_watch_subscribes_and_routes_pushes_into_the_digest(monkeypatch, tmp_path, capsys, hub):
+    monkeypatch.setenv("RSS_DATA_DIR", str(tmp_path))
+    cfg = config.normalize_config({"websub": {"enabled": True, "listen_port": 0}})
+    feeds = [{"title": "Blog", "url": FEED_URL}]
+    fetched = []
+
+    def fake_fetch(url, **_kwargs):
+        fetched.append(url)
+        feed, _error = fetcher.parse_feed_text(_rss(hub.url, [("Polled post", "https://blog.example/polled")]))
+        return feed, None, fetcher.FeedFetchMeta(status_code=200)
+
+    hub.on_verified = lambda: hub.publish(
+        TOPIC, _rss(hub.url, [("Pushed post about databases", "https://blog.example/pushed")]).encode()
+    )
+    monkeypatch.setattr(main.feeds_mod, "collect_all_feeds_detailed", lambda *_a, **_k: (feeds, None, None))
+    monkeypatch.setattr(main.fetcher, "fetch_feed_detailed", fake_fetch)
+    session = main.http_client.build_session(retries=0)
+    session.trust_env = False
+    try:
+        code = main.cmd_watch("", 10, 2, cfg, session, spread_min=0, duration_min=0.03)
+    finally:
+        session.close()
+
+    out = capsys.readouterr().out
+    assert code == exit_codes.OK
+    assert fetched == [FEED_URL]
+    assert "WebSub callback: http://127.0.0.1:" in out and "⚡" in out
+    assert "pushed=1" in out
+    digest = store.load_digest_data(datetime.now().strftime("%Y-%m-%d"))
+    links = [article["link"] for article in digest["Blog"]["articles"]]
+    assert "https://blog.example/polled" in links and "https://blog.example/pushed" in links